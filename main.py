@@ -1,13 +1,20 @@
 # main.py
 import streamlit as st
-from streamlit_option_menu import option_menu
 import datetime
-import pandas as pd
-import io # For CSV download buffer
+import logging
+
+# APP_PROFILE_IMPORTS=1 times every import from here on (-X importtime format on stderr, see utils/import_profiler.py)
+from utils import import_profiler
+if import_profiler.ENABLED:
+    import_profiler.install()
+
+from streamlit_option_menu import option_menu
+
+# Import utility modules. Pages (and their heavy dependencies: plotly, streamlit_lottie, ...) are imported in the
+# routing below, so a cold start only pays for the page being shown.
+from utils import style_utils, data_manager, helpers, lottie_store, perf
 
-# Import utility and page modules
-from utils import style_utils, data_manager, helpers
-from pages import dashboard_page, add_tool_page
+logger = logging.getLogger(__name__)
 
 # --- Application Configuration ---
 APP_NAME = "AI Marketing Arsenal"
@@ -22,42 +29,18 @@ st.set_page_config(
     initial_sidebar_state="collapsed" # Using top navbar, so sidebar can be collapsed
 )
 
+# Developer timing panel: add ?perf=1 to the URL (see utils/perf.py). Everything below is traced from here.
+show_perf_panel = perf.panel_requested()
+perf.start_run("run_app", enabled=show_perf_panel)
+
 # --- Load Custom CSS ---
 # This should be called early, after set_page_config
-style_utils.load_app_style()
-
-
-# --- Helper Function for CSV Download ---
-def get_csv_download_content():
-    """Prepares the DataFrame for CSV download."""
-    df = data_manager.load_data()
-    if df.empty:
-        return None, None # No data, no filename
-
-    df_download = df.copy()
-    
-    # Ensure Date_Time is string for CSV, and handle other potential type issues
-    if 'Date_Time' in df_download.columns and pd.api.types.is_datetime64_any_dtype(df_download['Date_Time']):
-        df_download['Date_Time'] = df_download['Date_Time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Ensure Subscription_Cost is a clean string
-    if 'Subscription_Cost' in df_download.columns:
-        df_download['Subscription_Cost'] = df_download['Subscription_Cost'].astype(str).replace('nan', '').replace('<NA>', '')
-
-    # Select and reorder columns for the download to match EXPECTED_COLUMNS for consistency
-    # Or define a specific set of columns you want in the downloaded file
-    cols_to_download = data_manager.EXPECTED_COLUMNS 
-    df_download = df_download.reindex(columns=cols_to_download, fill_value='')
+with perf.span("load_app_style"):
+    style_utils.load_app_style()
 
+# Start fetching any Lottie animations not stored yet into the runtime cache in the background (never blocks rendering)
+lottie_store.prefetch(helpers.LOTTIE_URLS)
 
-    csv_buffer = io.StringIO()
-    df_download.to_csv(csv_buffer, index=False, encoding='utf-8')
-    csv_content = csv_buffer.getvalue()
-    
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"ai_marketing_arsenal_data_{timestamp}.csv"
-    
-    return csv_content, filename
 
 # --- Main Application Logic ---
 def run_app():
@@ -101,8 +84,8 @@ def run_app():
     with nav_container:
         selected_page = option_menu(
             menu_title=None,  # No title for the menu bar itself
-            options=["🛡️ Dashboard", "➕ Add Tool", "📥 Download Data"],
-            icons=["shield-shaded", "plus-circle-dotted", "cloud-arrow-down"],  # Updated icons from Bootstrap Icons
+            options=["🛡️ Dashboard", "➕ Add Tool", "📦 Bulk Import", "📥 Download Data"],
+            icons=["shield-shaded", "plus-circle-dotted", "box-seam", "cloud-arrow-down"],  # Updated icons from Bootstrap Icons
             menu_icon="cast", # Optional: Main icon for the menu bar
             default_index=0,
             orientation="horizontal",
@@ -110,47 +93,81 @@ def run_app():
         )
     
     style_utils.styled_divider(height="1px", color="#e0e4e8", margin="0 0 1.5rem 0") # Divider below navbar
+    perf.annotate(page=selected_page)
 
     # --- Page Routing ---
     if selected_page == "🛡️ Dashboard":
+        from pages import dashboard_page
         dashboard_page.show_dashboard_page()
     elif selected_page == "➕ Add Tool":
+        from pages import add_tool_page
         add_tool_page.show_add_tool_page()
+    elif selected_page == "📦 Bulk Import":
+        from pages import bulk_import_page
+        bulk_import_page.show_bulk_import_page()
     elif selected_page == "📥 Download Data":
+        from utils import export
         style_utils.page_header(
             title="Download Toolkit Data",
-            subtitle="Get the latest snapshot of our AI Marketing Arsenal in CSV format.",
+            subtitle="Get the latest snapshot of our AI Marketing Arsenal as CSV, JSON Lines, Parquet or Excel.",
             icon="💾",
             animation_class="anim-slideInDown"
         )
         
         st.markdown("<div class='anim-fadeIn' style='text-align:center; margin-top: 2rem; padding: 0 2rem;'>", unsafe_allow_html=True)
-        st.write("Click the button below to download the complete AI tools database.")
-        
-        csv_data, file_name = get_csv_download_content()
-        
-        if csv_data and file_name:
+        st.write("Pick a format and what to include, then download.")
+
+        formats = export.available_formats()
+        dashboard_filters = st.session_state.get('dashboard_filters') or {}
+        has_filters = any(value is not None for value in dashboard_filters.values())
+        exp_col1, exp_col2 = st.columns(2)
+        with exp_col1:
+            selected_format = st.selectbox("Format", options=formats, format_func=lambda fmt: export.EXPORT_FORMATS[fmt][0],
+                                           key="download_format_select")
+        with exp_col2:
+            scope = st.radio("Include", options=["Full dataset", "Current dashboard view"], horizontal=True,
+                             key="download_scope_radio", disabled=not has_filters,
+                             help="The dashboard view uses the search and filters last set on the Dashboard.")
+
+        use_view = has_filters and scope == "Current dashboard view"
+        with perf.span("export"):
+            export_data = export.get_export(selected_format, dashboard_filters if use_view else None)
+        total_tools = data_manager.get_dashboard_summary()["total"]
+
+        if export_data and total_tools:
             st.download_button(
-                label="⬇️ Download AI Tools CSV",
-                data=csv_data,
-                file_name=file_name,
-                mime="text/csv",
+                label=f"⬇️ Download {export.EXPORT_FORMATS[selected_format][0]}",
+                data=export_data,
+                file_name=export.export_file_name(selected_format, "view" if use_view else "all"),
+                mime=export.EXPORT_FORMATS[selected_format][2],
                 key="download_main_csv_button",
-                help="Downloads the entire dataset as a CSV file.",
+                help="Downloads the entire dataset." if not use_view else "Downloads the tools matching your dashboard filters.",
                 use_container_width=False, # Let button size naturally or style via CSS
                 type="primary" # Use Streamlit's primary button styling
             )
-        elif csv_data is None and file_name is None: # Explicitly check for no data case
+        elif not total_tools: # Explicitly check for no data case
              style_utils.empty_state_message(
                 message="The AI Arsenal is currently empty. There's no data to download yet.",
                 lottie_url=helpers.LOTTIE_EMPTY_STATE_URL, # Or a specific "no data" Lottie
                 height=180
             )
-        else: # Error case from get_csv_download_content (should be rare)
+        else: # Export failed (should be rare)
             st.error("Could not prepare data for download. Please try again later.")
             
         st.markdown("</div>", unsafe_allow_html=True)
 
+        # --- Dedupe Report ---
+        style_utils.styled_divider(margin="2.5rem 0 1.5rem 0")
+        style_utils.section_title("Possible Duplicates", icon="🧬", alignment="left")
+        st.caption("Pairs of tools whose names or link domains are nearly identical (typos, spacing, punctuation).")
+        if st.button("🔍 Run dedupe report", key="run_dedupe_report_button"):
+            with st.spinner("Comparing every tool against the arsenal..."):
+                dedupe_df = data_manager.get_dedupe_report()
+            if dedupe_df.empty:
+                st.success("No likely duplicates found. ✨")
+            else:
+                st.dataframe(dedupe_df, use_container_width=True, hide_index=True)
+
     # --- Footer ---
     style_utils.styled_divider(margin="3rem 0 1.5rem 0")
     st.markdown(
@@ -163,5 +180,25 @@ def run_app():
         """, unsafe_allow_html=True
     )
 
+    if import_profiler.ENABLED:
+        log_new_imports()
+
+def log_new_imports():
+    """Logs what this run imported for the first time (the cold start or a first page visit) against the budget."""
+    timings = import_profiler.take_new_timings()
+    if not timings:
+        return
+    total_ms = sum(cumulative for _, _, cumulative in timings) * 1000
+    slowest = ", ".join(f"{name} {cumulative * 1000:.0f} ms" for name, _, cumulative in timings[:5])
+    if total_ms > import_profiler.IMPORT_BUDGET_MS:
+        logger.warning("Imports took %.0f ms (budget %.0f ms); slowest: %s", total_ms, import_profiler.IMPORT_BUDGET_MS, slowest)
+    else:
+        logger.info("Imports took %.0f ms (budget %.0f ms); slowest: %s", total_ms, import_profiler.IMPORT_BUDGET_MS, slowest)
+
 if __name__ == "__main__":
-    run_app()
\ No newline at end of file
+    try:
+        run_app()
+    finally:
+        perf_report = perf.finish_run()
+    if show_perf_panel and perf_report:
+        perf.show_panel(perf_report)
\ No newline at end of file
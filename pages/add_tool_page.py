@@ -1,9 +1,47 @@
 # pages/add_tool_page.py
 import streamlit as st
-import time
-from utils import data_manager, helpers, style_utils # Ensure all are imported
-from streamlit_lottie import st_lottie # For displaying Lottie animations
+from utils import data_manager, helpers, style_utils, write_queue, perf # Ensure all are imported
 
+SUBMIT_STATUS_POLL_SECONDS = 0.5 # How often queued submissions are re-checked while the page is open
+# st.fragment (1.37+) or its experimental predecessor (1.33+); older Streamlit reports queued submissions on the next rerun
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def _polled(func):
+    return _fragment(run_every=SUBMIT_STATUS_POLL_SECONDS)(func) if _fragment else func
+
+@_polled
+def show_queued_submissions():
+    """A note per submission still waiting for its batch. Where fragments are supported this part of the page re-checks
+    them every SUBMIT_STATUS_POLL_SECONDS and reruns the whole page (which reports the outcome) once any has finished."""
+    tickets = st.session_state.get('add_tool_tickets') or []
+    if any(ticket.done for ticket in tickets):
+        st.rerun()
+    for ticket in tickets:
+        st.info(f"⏳ '{ticket.entry['name']}' is queued for the database (ticket #{ticket.id}). It will show up on the dashboard in a moment.")
+
+def show_submission_status():
+    """Reports this session's submissions: the outcome of finished ones (once), a note for queued ones."""
+    tickets = st.session_state.get('add_tool_tickets') or []
+    finished = [ticket for ticket in tickets if ticket.done] # One snapshot: a ticket may finish while we render
+    for ticket in finished:
+        name = ticket.entry['name']
+        if ticket.status == "added":
+            st.success(f"🌠 Success! '{name}' has been successfully added to our AI toolkit (#{ticket.serial_number}).")
+            if helpers.LOTTIE_SUCCESS_URL:
+                lottie_json = helpers.load_lottie_url(helpers.LOTTIE_SUCCESS_URL)
+                if lottie_json:
+                    from streamlit_lottie import st_lottie # Imported on use: ~200 ms on the first import
+                    st_lottie(lottie_json, height=120, loop=False, key=f"add_tool_success_lottie_{ticket.id}", speed=1)
+            st.balloons()
+        elif ticket.status == "duplicate":
+            st.error(f"⚠️ {ticket.message}")
+        else:
+            st.error(f"🔥 Houston, we have a problem! Failed to save '{name}'. {ticket.message}")
+    st.session_state['add_tool_tickets'] = [ticket for ticket in tickets if ticket not in finished]
+    if st.session_state['add_tool_tickets']:
+        show_queued_submissions()
+
+@perf.traced("page: add tool")
 def show_add_tool_page():
     """Displays the Add New Tool page."""
     
@@ -58,7 +96,7 @@ def show_add_tool_page():
             )
             
             subscription_cost_input = ""
-            if pricing_type in ["Paid", "Freemium", "Usage-based"]: # Only show cost if relevant
+            if pricing_type in helpers.PRICING_TYPES_WITH_COST: # Only show cost if relevant
                 subscription_cost_input = st.text_input(
                     "Subscription Cost / Details*", 
                     placeholder="e.g., $20/month, $0.01/token, See website", 
@@ -112,41 +150,39 @@ def show_add_tool_page():
                     st.error(f"⚠️ {error_msg}")
             else:
                 # Check for duplicates before adding (more user-friendly)
-                current_df = data_manager.load_data()
-                if not current_df[current_df['Name'].str.lower() == tool_name.strip().lower()].empty:
+                duplicate = data_manager.find_duplicate(tool_name, tool_link)
+                near_matches = [] if duplicate else data_manager.find_near_duplicates(tool_name, tool_link)
+                submission_key = (tool_name.strip(), tool_link.strip())
+                if duplicate and duplicate[0] == 'Name':
                     st.error(f"⚠️ A tool with the name '{tool_name.strip()}' already exists.")
-                elif not current_df[current_df['Link'].str.lower() == tool_link.strip().lower()].empty:
-                     st.error(f"⚠️ A tool with the link '{tool_link.strip()}' already exists.")
+                elif duplicate:
+                     st.error(f"⚠️ A tool with the link '{tool_link.strip()}' already exists ('{duplicate[1]['Name']}').")
+                elif near_matches and st.session_state.get('near_duplicate_confirmed') != submission_key:
+                    # Likely typo of an existing tool: warn once, a second submit of the same name/link adds it anyway
+                    st.session_state['near_duplicate_confirmed'] = submission_key
+                    similar_list = "\n".join(
+                        f"- **{match['tool']['Name']}** ({match['tool']['Link']}) – similar {match['matched_on'].lower()}, {match['similarity']:.0%}"
+                        for match in near_matches
+                    )
+                    st.warning(f"🤔 This looks very similar to tools already in the arsenal:\n{similar_list}\n\nIf it's really a different tool, submit again to add it anyway.")
                 else:
-                    with st.spinner("Transmitting data to the AI Galaxy... Please wait. 🌌"):
-                        time.sleep(1.5) # Simulate network latency/processing
-                        
-                        # Prepare data for saving
-                        actual_subscription_cost = subscription_cost_input.strip() if pricing_type in ["Paid", "Freemium", "Usage-based"] else ""
-
-                        if data_manager.add_entry(
-                            name=tool_name.strip(), 
-                            link=tool_link.strip(), 
-                            category=final_category_name, 
-                            pricing_type=pricing_type, 
-                            subscription_cost=actual_subscription_cost, 
-                            uploaded_by=final_uploader_name, 
-                            purpose=purpose_description.strip()
-                        ):
-                            st.success(f"🌠 Success! '{tool_name.strip()}' has been successfully added to our AI toolkit.")
-                            if helpers.LOTTIE_SUCCESS_URL:
-                                lottie_json = helpers.load_lottie_url(helpers.LOTTIE_SUCCESS_URL)
-                                if lottie_json:
-                                    st_lottie(lottie_json, height=120, loop=False, key="add_tool_success_lottie", speed=1)
-                            st.balloons()
-                            # Consider clearing specific form fields if clear_on_submit=False,
-                            # or rely on Streamlit's rerun behavior.
-                            # For a cleaner UX, explicitly clear relevant session state or use st.experimental_rerun()
-                            # after a short delay if you want the form to truly reset.
-                            # For now, form will persist data due to clear_on_submit=False, good for fixing errors.
-                        else:
-                            st.error("🔥 Houston, we have a problem! Failed to save the tool. Please check logs or try again.")
-        
+                    # Prepare data for saving
+                    actual_subscription_cost = subscription_cost_input.strip() if pricing_type in helpers.PRICING_TYPES_WITH_COST else ""
+
+                    # Queued for the write-behind writer (utils/write_queue.py): concurrent submissions share one write
+                    ticket = write_queue.submit(
+                        name=tool_name.strip(), 
+                        link=tool_link.strip(), 
+                        category=final_category_name, 
+                        pricing_type=pricing_type, 
+                        subscription_cost=actual_subscription_cost, 
+                        uploaded_by=final_uploader_name, 
+                        purpose=purpose_description.strip()
+                    )
+                    st.session_state.setdefault('add_tool_tickets', []).append(ticket) # Reported below, without waiting
+
+        show_submission_status()
+
         st.markdown("</div>", unsafe_allow_html=True) # Close .form-wrapper-card
 
     with col_info:
@@ -172,6 +208,7 @@ def show_add_tool_page():
         if helpers.LOTTIE_ADD_TOOL_URL:
             lottie_json = helpers.load_lottie_url(helpers.LOTTIE_ADD_TOOL_URL)
             if lottie_json:
+                from streamlit_lottie import st_lottie
                 st_lottie(lottie_json, height=280, key="add_tool_visual_lottie", speed=1)
             else:
                 st.info("✨ Adding new tools helps the whole team discover valuable AI resources!")
@@ -0,0 +1,87 @@
+# pages/bulk_import_page.py
+import streamlit as st
+import pandas as pd
+from utils import data_manager, helpers, style_utils, perf
+
+def show_import_result(result):
+    """The outcome of the last import: summary, the rows that were skipped and the full report to download."""
+    report, added = result['report'], result['added']
+    skipped = len(report) - added
+    if added:
+        st.success(f"🌠 Added {added} tools to the arsenal." + (f" {skipped} rows were skipped." if skipped else ""))
+    elif skipped:
+        st.warning(f"No tools were added; all {skipped} rows were skipped.")
+
+    problems = report[report['Status'] != "Added"]
+    if not problems.empty:
+        style_utils.section_title("Rows Not Imported", icon="🧾", alignment="left", margin_bottom="1rem")
+        st.dataframe(problems, use_container_width=True, hide_index=True)
+    st.download_button("⬇️ Download full import report", data=result['report_csv'],
+                       file_name="ai_tools_import_report.csv", mime="text/csv", key="bulk_import_report_button")
+
+@perf.traced("page: bulk import")
+def show_bulk_import_page():
+    """Displays the Bulk Import page (many tools at once from a CSV/XLSX/JSONL file)."""
+
+    style_utils.page_header(
+        title="Bulk Import Tools",
+        subtitle="Add a whole spreadsheet of AI tools in one go.",
+        icon="📦",
+        animation_class="anim-slideInDown"
+    )
+
+    col_upload, col_info = st.columns([2, 1.2])
+
+    with col_info:
+        style_utils.section_title("File Format", icon="📜", alignment="left", margin_bottom="1rem")
+        st.markdown(f"""
+        <ul style="font-size: 0.9rem; line-height: 1.6; color: #555;">
+            <li>One tool per row (CSV/XLSX) or per line (JSONL).</li>
+            <li>Columns: <code>{'</code>, <code>'.join(data_manager.IMPORT_COLUMNS)}</code>.</li>
+            <li><strong>Pricing_Type</strong> is one of: {', '.join(p for p in helpers.PRICING_TYPES if p != 'Select Pricing')}.</li>
+            <li>Rows with an empty <strong>Uploaded_By</strong> get the uploader you pick here.</li>
+            <li>Invalid rows and duplicates are skipped and listed in the report; everything else is added.</li>
+        </ul>
+        """, unsafe_allow_html=True)
+        template_csv = pd.DataFrame(columns=data_manager.IMPORT_COLUMNS).to_csv(index=False)
+        st.download_button("⬇️ Download CSV template", data=template_csv, file_name="ai_tools_import_template.csv",
+                           mime="text/csv", key="bulk_import_template_button")
+
+    with col_upload:
+        style_utils.section_title("Upload File", icon="📤", alignment="left", margin_bottom="1rem")
+        uploaded_file = st.file_uploader("Tools file", type=data_manager.IMPORT_FILE_TYPES, key="bulk_import_file")
+        default_uploader = st.selectbox(
+            "Uploaded By (for rows that don't say)",
+            options=[name for name in helpers.UPLOADERS_LIST if name not in ("Select Your Name", "Other")],
+            key="bulk_import_uploader"
+        )
+
+        if uploaded_file is None:
+            st.session_state.pop('bulk_import_result', None)
+            st.info("Upload a file to preview it before importing.")
+            return
+        upload_key = (uploaded_file.name, uploaded_file.size)
+        result = st.session_state.get('bulk_import_result')
+        if result and result['upload_key'] != upload_key: # A different file: its report no longer applies
+            result = st.session_state['bulk_import_result'] = None
+
+        df_import = data_manager.read_import_file(uploaded_file, uploaded_file.name)
+        if df_import is None:
+            return
+        missing_columns = [col for col in ["Name", "Link"] if col not in df_import.columns]
+        if missing_columns:
+            st.error(f"⚠️ The file is missing required column(s): {', '.join(missing_columns)}.")
+            return
+
+        st.caption(f"{len(df_import)} rows found. Preview:")
+        st.dataframe(df_import.head(20), use_container_width=True, hide_index=True)
+
+        if st.button(f"🚀 Import {len(df_import)} tools", key="bulk_import_button", type="primary"):
+            with st.spinner("Validating and importing..."):
+                report, added = data_manager.import_tools(df_import, default_uploader=default_uploader)
+            # Kept for later runs: clicking the download button reruns the page without this branch
+            result = st.session_state['bulk_import_result'] = {
+                'upload_key': upload_key, 'report': report, 'added': added, 'report_csv': report.to_csv(index=False),
+            }
+        if result:
+            show_import_result(result)
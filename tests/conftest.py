@@ -0,0 +1,15 @@
+# tests/conftest.py
+import pytest
+from utils import data_manager, indexes
+
+@pytest.fixture(params=["csv", "sqlite"])
+def store(request, tmp_path, monkeypatch):
+    """data_manager pointed at a fresh, empty database in tmp_path (once per storage backend). Returns the backend."""
+    monkeypatch.setattr(data_manager, "STORAGE_BACKEND", request.param)
+    monkeypatch.setattr(data_manager, "CSV_FILE_PATH", str(tmp_path / "tools.csv"))
+    monkeypatch.setattr(data_manager, "SQLITE_DB_PATH", str(tmp_path / "tools.sqlite3"))
+    data_manager.invalidate_data_caches()
+    indexes.drop_indexes()
+    yield data_manager.get_backend()
+    data_manager.invalidate_data_caches()
+    indexes.drop_indexes()
@@ -0,0 +1,123 @@
+# tests/test_data_manager.py
+import datetime
+from utils import data_manager, summary
+
+DAY = datetime.datetime(2026, 1, 1)
+CATEGORIES = ["Chatbots", "Image Generation", "SEO Tools"]
+
+def _tool(n):
+    """add_entry() arguments for a distinct tool."""
+    return dict(name=f"Tool {n}", link=f"https://tool{n}.example/", category=CATEGORIES[n % len(CATEGORIES)],
+                pricing_type="Paid" if n % 2 else "Free", subscription_cost="$10/mo" if n % 2 else "",
+                uploaded_by="Ana" if n % 3 else "Ben", purpose=f"Does thing number {n}")
+
+def _entries(first, count, date_time=None):
+    """count distinct add_entries() entries, numbered from first."""
+    return [dict(_tool(n), date_time=date_time or DAY + datetime.timedelta(hours=n)) for n in range(first, first + count)]
+
+def _serials(df):
+    return sorted(df['Serial_Number'].dropna().astype(int).tolist())
+
+def test_summary_matches_load_data_after_appends(store):
+    assert data_manager.get_dashboard_summary() == summary.empty() # Stores the (empty) summary to update in place
+    for n in range(1, summary.RECENT_LIMIT + 3):
+        assert data_manager.add_entry(**_tool(n))
+        assert store.read_summary() is not None # Updated by the append, not rebuilt on read
+        expected = summary.build(data_manager.load_data(), data_manager.DATE_TIME_FORMAT)
+        assert data_manager.get_dashboard_summary() == expected
+
+def test_summary_is_rebuilt_after_replace_all(store):
+    for n in range(1, 6):
+        data_manager.add_entry(**_tool(n))
+    df = data_manager.load_data()
+    assert data_manager.save_data(df[df['Category'] != "Chatbots"])
+    assert store.read_summary() is None
+    expected = summary.build(data_manager.load_data(), data_manager.DATE_TIME_FORMAT)
+    assert data_manager.get_dashboard_summary() == expected
+    assert store.read_summary() == expected
+
+def test_add_entries_allocates_consecutive_serials(store):
+    assert [serial for serial, _ in data_manager.add_entries(_entries(1, 3))] == [1, 2, 3]
+    assert [serial for serial, _ in data_manager.add_entries(_entries(4, 2))] == [4, 5]
+    assert _serials(data_manager.load_data()) == [1, 2, 3, 4, 5]
+
+def test_serials_are_reseeded_from_the_rows_after_replace_all(store):
+    data_manager.add_entries(_entries(1, 3))
+    df = data_manager.load_data()
+    df['Serial_Number'] = [40, 41, 42]
+    assert data_manager.save_data(df)
+    assert data_manager.add_entries(_entries(4, 1)) == [(43, None)]
+    df = data_manager.load_data()
+    assert data_manager.save_data(df[df['Serial_Number'] <= 40])
+    assert [serial for serial, _ in data_manager.add_entries(_entries(5, 2))] == [41, 42]
+    assert _serials(data_manager.load_data()) == [40, 41, 42]
+
+def test_allocate_serial_numbers_reserves_ranges(store):
+    data_manager.add_entries(_entries(1, 2))
+    assert data_manager.allocate_serial_numbers(5) == 3
+    assert data_manager.allocate_serial_numbers() == 8
+    assert data_manager.add_entries(_entries(3, 1)) == [(9, None)]
+
+def test_serials_stay_above_rows_written_outside_the_app(store):
+    data_manager.add_entries(_entries(1, 2))
+    with store.lock(): # Bypasses the sequence, like a hand edit or another tool would
+        store.append_records([{"Serial_Number": 50, "Name": "Outside", "Link": "https://outside.example/",
+                               "Category": CATEGORIES[0], "Pricing_Type": "Free", "Date_Time": DAY}])
+    assert data_manager.add_entries(_entries(3, 1)) == [(51, None)]
+    assert _serials(data_manager.load_data()) == [1, 2, 50, 51]
+
+def test_duplicates_are_rejected_within_and_across_batches(store):
+    data_manager.add_entries(_entries(1, 2))
+    again = dict(_entries(9, 1)[0], name=" tool 1 ") # Same name ignoring case and whitespace
+    results = data_manager.add_entries(_entries(3, 1) + [again] + _entries(3, 1))
+    assert results[0] == (3, None)
+    assert results[1] == (None, "A tool with the name ' tool 1 ' already exists.")
+    assert results[2][0] is None
+    assert _serials(data_manager.load_data()) == [1, 2, 3]
+
+def test_summary_matches_load_data_after_batches(store):
+    assert data_manager.get_dashboard_summary() == summary.empty()
+    batches = [
+        _entries(1, 4),
+        _entries(5, 3, date_time=DAY + datetime.timedelta(hours=2)), # Ties with row 2 and each other
+        _entries(8, 2, date_time=DAY - datetime.timedelta(days=3)), # Older than everything
+        _entries(10, 12), # More than RECENT_LIMIT at once
+    ]
+    for batch in batches:
+        data_manager.add_entries(batch)
+        assert store.read_summary() is not None
+        expected = summary.build(data_manager.load_data(), data_manager.DATE_TIME_FORMAT)
+        assert data_manager.get_dashboard_summary() == expected
+
+def test_facet_counts_match_groupby(store):
+    data_manager.add_entries(_entries(1, 20))
+    df = data_manager.load_data()
+    for column, filters in [("Category", {}), ("Pricing_Type", {"category": "Chatbots"}),
+                            ("Uploaded_By", {"pricing_type": "Paid", "category": "SEO Tools"})]:
+        rows = df
+        for arg, value in filters.items():
+            rows = rows[rows[data_manager.FACET_FILTERS[arg]] == value]
+        expected = rows.groupby(rows[column].astype("string"))[column].size()
+        counts = data_manager.facet_counts(**filters)[column]
+        assert counts.pop(None) == len(rows)
+        assert {value: count for value, count in counts.items() if count} == expected.to_dict()
+
+def test_filter_and_search(store):
+    data_manager.add_entries(_entries(1, 9))
+    paid_chatbots = data_manager.filter_tools(category="Chatbots", pricing_type="Paid")
+    assert set(paid_chatbots['Name']) == {"Tool 3", "Tool 9"}
+    assert paid_chatbots['Date_Time'].is_monotonic_decreasing
+    assert set(data_manager.filter_tools(category="Chatbots", search_term="number 6")['Name']) == {"Tool 6"}
+
+def test_filters_match_facet_counts_for_padded_values(store):
+    data_manager.add_entries(_entries(1, 6))
+    with store.lock(): # Padded values, as a hand-edited CSV or another tool might leave them
+        store.append_records([{"Serial_Number": 7, "Name": "Padded", "Link": "https://padded.example/",
+                               "Category": " Chatbots ", "Pricing_Type": "Paid\t", "Uploaded_By": " Ana", "Date_Time": DAY}])
+    counts = data_manager.facet_counts()
+    for arg, column, value in [("category", "Category", "Chatbots"), ("pricing_type", "Pricing_Type", "Paid"),
+                               ("uploaded_by", "Uploaded_By", "Ana")]:
+        for requested in (value, f" {value} "):
+            matched = data_manager.query_tools(**{arg: requested})
+            assert len(matched) == counts[column][value], (column, requested)
+            assert "Padded" in set(matched['Name'])
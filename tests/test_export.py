@@ -0,0 +1,51 @@
+# tests/test_export.py
+import io
+import gzip
+import json
+import pandas as pd
+import pytest
+from utils import data_manager, export
+
+ROWS = 23 # Several chunks with CHUNK_ROWS, the last one partial
+CHUNK_ROWS = 5
+
+@pytest.fixture
+def frame(monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", CHUNK_ROWS)
+    df = pd.DataFrame({
+        "Serial_Number": [str(n) for n in range(1, ROWS + 1)],
+        "Name": [f"Tool {n}" for n in range(1, ROWS + 1)],
+        "Link": [f"https://tool{n}.example/" for n in range(1, ROWS + 1)],
+        "Category": ["Chatbots", "SEO Tools"] * (ROWS // 2) + ["Chatbots"] * (ROWS % 2),
+        "Pricing_Type": ["Paid"] * ROWS,
+        "Subscription_Cost": ["$10/mo"] * ROWS,
+        "Uploaded_By": ["Ana"] * ROWS,
+        "Date_Time": [f"2026-01-01 00:00:{n:02d}" for n in range(ROWS)],
+        "Purpose": [f"Line one\nline \"two\" for {n}" for n in range(1, ROWS + 1)],
+    })
+    return data_manager._apply_schema_dtypes(df)
+
+def _expected_records(df):
+    return data_manager._prepare_frame_for_storage(df).astype("string").fillna("").to_dict(orient="records")
+
+def test_jsonl_has_one_record_per_line(frame):
+    lines = export.encode(frame, "jsonl").decode("utf-8").split("\n")
+    assert lines.pop() == "" # The file ends with a line break
+    assert len(lines) == len(frame)
+    assert all(line.strip() for line in lines)
+    records = [{key: "" if value is None else str(value) for key, value in json.loads(line).items()} for line in lines]
+    assert records == _expected_records(frame)
+
+def test_empty_jsonl_is_empty(frame):
+    assert export.encode(frame.iloc[0:0], "jsonl") == b""
+
+def test_csv_gz_round_trips(frame):
+    with gzip.open(io.BytesIO(export.encode(frame, "csv.gz")), "rt", encoding="utf-8", newline="") as f:
+        df = pd.read_csv(f, dtype="string", keep_default_na=False)
+    assert df.to_dict(orient="records") == _expected_records(frame)
+
+def test_xlsx_round_trips(frame):
+    pytest.importorskip("openpyxl")
+    df = pd.read_excel(io.BytesIO(export.encode(frame, "xlsx")), sheet_name="AI Tools", dtype=str, keep_default_na=False)
+    assert list(df.columns) == data_manager.EXPECTED_COLUMNS
+    assert df.to_dict(orient="records") == _expected_records(frame)
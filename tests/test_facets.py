@@ -0,0 +1,55 @@
+# tests/test_facets.py
+import numpy as np
+import pandas as pd
+import pytest
+from utils import facets
+
+VALUES = {
+    "Category": ["Chatbots", "SEO Tools", " Chatbots ", None, "", "Video Editing"],
+    "Pricing_Type": ["Free", "Paid", "Freemium", None],
+    "Uploaded_By": ["Ana", "Ben", "Cleo", ""],
+}
+
+@pytest.fixture(scope="module")
+def frame():
+    """Rows with messy facet values (surrounding whitespace, blanks, missing), index = row id."""
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({column: pd.array(rng.choice(np.array(values, dtype=object), size=300), dtype="string")
+                         for column, values in VALUES.items()})
+
+def _build(frame, chunks=1):
+    """A FacetIndex over frame, filled by appending it in `chunks` slices."""
+    index = facets.FacetIndex()
+    for rows in np.array_split(np.arange(len(frame)), chunks):
+        index.add_rows(frame.iloc[rows])
+    return index
+
+def _groupby_counts(rows, column):
+    keys = facets.facet_values(rows[column])
+    return rows[keys != ""].groupby(keys[keys != ""]).size().to_dict()
+
+@pytest.mark.parametrize("chunks", [1, 7])
+@pytest.mark.parametrize("column", facets.FACET_COLUMNS)
+def test_counts_match_groupby(frame, chunks, column):
+    index = _build(frame, chunks)
+    assert index.counts(column) == _groupby_counts(frame, column)
+    assert facets.popcount(index.all) == len(frame)
+
+@pytest.mark.parametrize("chunks", [1, 7])
+def test_counts_within_filters_match_groupby(frame, chunks):
+    index = _build(frame, chunks)
+    within = index.match({"Category": "Chatbots", "Pricing_Type": None, "Uploaded_By": "Ana"})
+    keys = {column: facets.facet_values(frame[column]) for column in facets.FACET_COLUMNS}
+    rows = frame[((keys["Category"] == "Chatbots") & (keys["Uploaded_By"] == "Ana")).to_numpy()]
+    assert facets.row_ids(within, index.rows).tolist() == rows.index.tolist()
+    counts = {value: count for value, count in index.counts("Pricing_Type", within=within).items() if count}
+    assert counts == _groupby_counts(rows, "Pricing_Type")
+
+def test_unknown_value_matches_nothing(frame):
+    index = _build(frame)
+    assert facets.popcount(index.match({"Category": "Nope"})) == 0
+
+def test_from_row_ids_round_trips(frame):
+    index = _build(frame)
+    ids = np.array([0, 5, 8, 299])
+    assert facets.row_ids(index.from_row_ids(ids), index.rows).tolist() == ids.tolist()
@@ -0,0 +1,66 @@
+# tests/test_indexes.py
+import numpy as np
+import pandas as pd
+import pytest
+from utils import facets, indexes, near_duplicates, search_index
+
+ROWS = 50
+
+def _frame(count, lineage="lineage-1"):
+    """count tools with row ids 0..count-1, as one lineage of load_data() frames."""
+    df = pd.DataFrame({
+        "Serial_Number": pd.array(range(1, count + 1), dtype="Int32"),
+        "Name": pd.array([f"Writer Tool {n}" for n in range(count)], dtype="string"),
+        "Link": pd.array([f"https://writer{n}.example/" for n in range(count)], dtype="string"),
+        "Category": pd.Categorical(["Content Creation"] * count),
+        "Pricing_Type": pd.Categorical(["Free", "Paid"] * (count // 2) + ["Free"] * (count % 2)),
+        "Uploaded_By": pd.Categorical(["Ana"] * count),
+        "Purpose": pd.array(["Writes blog posts"] * count, dtype="string"),
+    })
+    df.attrs['lineage'] = lineage
+    return df
+
+@pytest.fixture(autouse=True)
+def fresh_indexes():
+    indexes.drop_indexes()
+    yield
+    indexes.drop_indexes()
+
+@pytest.mark.parametrize("name, factory", [
+    ("search", search_index.SearchIndex), ("facets", facets.FacetIndex), ("near_duplicates", near_duplicates.NearDuplicateIndex),
+    ("serial", indexes.SerialIndex), ("duplicates", indexes.DuplicateKeyIndex),
+])
+def test_extending_leaves_the_handed_out_index_alone(name, factory):
+    old_df, new_df = _frame(ROWS), _frame(ROWS + 1)
+    old = indexes.get_index(name, old_df, factory)
+    new = indexes.get_index(name, new_df, factory)
+    assert new is not old and new.rows_indexed == ROWS + 1 and old.rows_indexed == ROWS
+    assert indexes.get_index(name, new_df, factory) is new
+
+def test_old_search_index_only_returns_rows_of_its_frame():
+    old_df, new_df = _frame(ROWS), _frame(ROWS + 1)
+    old = indexes.get_index('search', old_df, search_index.SearchIndex)
+    new = indexes.get_index('search', new_df, search_index.SearchIndex)
+    old_df.loc[old.search("blog")] # Raises KeyError for row ids past the end of old_df
+    assert set(new.search("blog").tolist()) == set(range(ROWS + 1))
+
+def test_old_facet_index_keeps_consistent_bitsets():
+    old_df = _frame(ROWS)
+    old = indexes.get_index('facets', old_df, facets.FacetIndex)
+    for count in range(ROWS + 1, ROWS + 600, 100): # Grows the bitsets several times
+        indexes.get_index('facets', _frame(count), facets.FacetIndex)
+    assert facets.popcount(old.match({"Pricing_Type": "Free"})) == (ROWS + 1) // 2
+    assert facets.row_ids(old.all, old.rows).tolist() == list(range(ROWS))
+
+def test_old_near_duplicate_index_only_returns_rows_of_its_frame():
+    old = indexes.get_index('near_duplicates', _frame(ROWS), near_duplicates.NearDuplicateIndex)
+    indexes.get_index('near_duplicates', _frame(ROWS + 1), near_duplicates.NearDuplicateIndex)
+    found = [row_id for row_id, _, _ in old.find(f"Writer Tool {ROWS}", f"https://writer{ROWS}.example/")]
+    assert found and max(found) < ROWS
+
+def test_older_frame_does_not_replace_the_shared_index():
+    new_df = _frame(ROWS + 1)
+    new = indexes.get_index('search', new_df, search_index.SearchIndex)
+    old = indexes.get_index('search', _frame(ROWS), search_index.SearchIndex)
+    assert old.rows_indexed == ROWS and np.all(old.search("blog") < ROWS)
+    assert indexes.get_index('search', new_df, search_index.SearchIndex) is new
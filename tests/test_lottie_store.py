@@ -0,0 +1,32 @@
+# tests/test_lottie_store.py
+import json
+import pytest
+from utils import helpers, lottie_store
+
+@pytest.fixture
+def empty_store(tmp_path, monkeypatch):
+    """lottie_store with empty bundled and cache dirs (the real fallback dir), no fetching and cold caches."""
+    monkeypatch.setattr(lottie_store, "STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(lottie_store, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(lottie_store, "FETCH_ENABLED", False)
+    caches = (lottie_store._animations, lottie_store._manifests, lottie_store._fallbacks)
+    for cache in caches:
+        cache.clear()
+    yield tmp_path
+    for cache in caches:
+        cache.clear()
+
+@pytest.mark.parametrize("url", helpers.LOTTIE_URLS)
+def test_every_animation_has_a_bundled_stand_in(empty_store, url):
+    animation = lottie_store.get(url)
+    assert animation is not None and animation["layers"]
+
+def test_stored_animation_replaces_the_stand_in(empty_store):
+    url = helpers.LOTTIE_SUCCESS_URL
+    stand_in = lottie_store.get(url)
+    real = {"v": "5.7.4", "nm": "real", "layers": []}
+    lottie_store._store(url, json.dumps(real).encode("utf-8"), lottie_store.CACHE_DIR)
+    assert lottie_store.get(url) == real != stand_in
+
+def test_unknown_url_has_no_animation(empty_store):
+    assert lottie_store.get("https://example.com/unknown.json") is None
@@ -0,0 +1,51 @@
+# tests/test_near_duplicates.py
+import pandas as pd
+import pytest
+from utils import near_duplicates
+
+CATALOGUE = ["ChatGPT", "Jasper", "Copy.ai", "Midjourney", "Canva", "Grammarly", "Notion AI", "Synthesia"]
+
+@pytest.fixture(scope="module")
+def index():
+    index = near_duplicates.NearDuplicateIndex()
+    index.add_rows(pd.DataFrame({"Name": pd.array(CATALOGUE, dtype="string"),
+                                 "Link": pd.array([None] * len(CATALOGUE), dtype="string")}))
+    return index
+
+def _transpositions(name):
+    """Every variant of name with two adjacent letters swapped."""
+    return {name[:i] + name[i + 1] + name[i] + name[i + 2:] for i in range(len(name) - 1) if name[i] != name[i + 1]}
+
+def _single_edits(name):
+    """Every variant of name with one letter dropped, replaced or inserted."""
+    edits = {name[:i] + name[i + 1:] for i in range(len(name))}
+    edits |= {name[:i] + c + name[i + 1:] for i in range(len(name)) for c in "xz"}
+    return edits | {name[:i] + c + name[i:] for i in range(len(name) + 1) for c in "xz"}
+
+def test_docstring_example_is_found(index):
+    assert [(row_id, column) for row_id, column, _ in index.find("ChatGTP")] == [(0, "Name")]
+
+@pytest.mark.parametrize("row_id,name", list(enumerate(CATALOGUE)))
+def test_adjacent_transpositions_are_found(index, row_id, name):
+    for typo in _transpositions(name):
+        if near_duplicates.similarity(typo.casefold(), name.casefold()) < near_duplicates.MIN_SIMILARITY:
+            continue # Too short for one swap to stay within the threshold
+        assert row_id in [found for found, _, _ in index.find(typo)], typo
+
+@pytest.mark.parametrize("row_id,name", list(enumerate(CATALOGUE)))
+def test_single_edits_are_found(index, row_id, name):
+    for typo in _single_edits(name):
+        if near_duplicates.similarity(typo.casefold(), name.casefold()) < near_duplicates.MIN_SIMILARITY:
+            continue
+        assert row_id in [found for found, _, _ in index.find(typo)], typo
+
+def test_report_pairs_short_names_one_edit_apart():
+    names = ["Jasper", "Jaspr", "Canva", "Canvx"]
+    index = near_duplicates.NearDuplicateIndex()
+    index.add_rows(pd.DataFrame({"Name": pd.array(names, dtype="string"),
+                                 "Link": pd.array([None] * len(names), dtype="string")}))
+    pairs = index.report(min_similarity=0.8)
+    assert set(zip(pairs["Row_A"], pairs["Row_B"])) == {(0, 1), (2, 3)}
+
+def test_unrelated_names_are_not_matched(index):
+    assert index.find("Stable Diffusion") == []
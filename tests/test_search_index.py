@@ -0,0 +1,46 @@
+# tests/test_search_index.py
+import numpy as np
+import pandas as pd
+import pytest
+from utils import search_index
+
+ROWS = [
+    ("Jasper", "Content Creation", "Writes marketing copy and blog posts"),
+    ("Midjourney", "Image Generation", "Generates images from text prompts"),
+    ("Copy.ai", "Content Creation", "Marketing copy, emails and social posts"),
+    ("Surfer", "SEO Tools", "Optimizes blog posts for search"),
+    ("Canva", "Design Tools", "Design social media images and posts"),
+    ("Blog Writer", "Content Creation", "Long-form articles"),
+]
+
+@pytest.fixture(scope="module")
+def frame():
+    return pd.DataFrame({column: pd.array(values, dtype="string")
+                         for column, values in zip(["Name", "Category", "Purpose"], zip(*ROWS))})
+
+def _build(frame, chunks=1):
+    index = search_index.SearchIndex()
+    for rows in np.array_split(np.arange(len(frame)), chunks):
+        index.add_rows(frame.iloc[rows])
+    return index
+
+def test_every_query_term_must_match(frame):
+    assert set(_build(frame).search("marketing copy").tolist()) == {0, 2}
+    assert _build(frame).search("marketing images").tolist() == []
+
+def test_terms_match_as_prefixes(frame):
+    assert set(_build(frame).search("gen").tolist()) == {1}
+    assert set(_build(frame).search("optim blo").tolist()) == {3}
+
+def test_name_hits_rank_above_purpose_hits(frame):
+    assert _build(frame).search("blog").tolist()[0] == 5
+
+@pytest.mark.parametrize("query", ["posts", "content", "social posts", "copy", "i"])
+def test_appending_rows_gives_the_same_results_as_one_build(frame, query):
+    assert _build(frame, chunks=4).search(query).tolist() == _build(frame).search(query).tolist()
+
+def test_limit_and_empty_queries(frame):
+    index = _build(frame)
+    assert len(index.search("posts", limit=2)) == 2
+    assert index.search("").tolist() == []
+    assert search_index.SearchIndex().search("posts").tolist() == []
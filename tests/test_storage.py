@@ -0,0 +1,122 @@
+# tests/test_storage.py
+import datetime
+import threading
+import pandas as pd
+import pytest
+from utils import data_manager, storage
+
+# A record with a line break inside a quoted field, cut right after that line break: a reader that only looked
+# for the last '\n' would take the first half for a complete record
+TORN_HEAD = '3,Torn Tool,https://torn.example/,Chatbots,Free,,Ana,2026-01-03 00:00:00,"Line one\n'
+TORN_REST = 'line two"\n'
+
+def _entry(number, date_time):
+    return dict(name=f"Tool {number}", link=f"https://tool{number}.example/", category="Chatbots",
+                pricing_type="Free", subscription_cost="", uploaded_by="Ana", purpose=f"Purpose {number}",
+                date_time=date_time)
+
+def _full_parse(backend):
+    """The rows as a from-scratch parse of the whole file gives them."""
+    return data_manager._sorted_frame(data_manager._normalize_frame(backend.read_frame(), show_schema_info=False))
+
+def _assert_same_rows(df, expected):
+    pd.testing.assert_frame_equal(df, expected, check_categorical=False)
+
+def _append_raw(path, text):
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+def _seed(count=2):
+    day = datetime.datetime(2026, 1, 1)
+    data_manager.add_entries([_entry(i, day + datetime.timedelta(hours=i)) for i in range(1, count + 1)])
+
+
+@pytest.mark.parametrize("data, complete", [
+    (b"a,b\n1,2\n", b"a,b\n1,2\n"),
+    (b"a,b\n1,2\n3,", b"a,b\n1,2\n"),
+    (b'a,b\n1,"x\n', b"a,b\n"), # The line break is inside a quoted field
+    (b'a,b\n1,"x\ny"\n2,"', b'a,b\n1,"x\ny"\n'),
+    (b'a,b\n1,"say ""hi""\n"\n', b'a,b\n1,"say ""hi""\n"\n'),
+    (b"", b""),
+])
+def test_complete_records_length(data, complete):
+    assert data[:storage.complete_records_length(data)] == complete
+
+@pytest.mark.parametrize("store", ["csv"], indirect=True)
+def test_appended_rows_are_merged_like_a_full_parse(store):
+    day = datetime.datetime(2026, 1, 1)
+    data_manager.add_entries([_entry(i, day + datetime.timedelta(hours=i)) for i in range(1, 4)])
+    first = data_manager.load_data()
+    # Newer rows, a tie with an existing row and an older row (merged by re-sorting)
+    data_manager.add_entries([_entry(4, day + datetime.timedelta(hours=9)), _entry(5, day + datetime.timedelta(hours=3)),
+                              _entry(6, day - datetime.timedelta(days=1))])
+    second = data_manager.load_data()
+    assert second.attrs['lineage'] == first.attrs['lineage'] # Took the tail path, not a reparse
+    _assert_same_rows(second, _full_parse(store))
+
+@pytest.mark.parametrize("store", ["csv"], indirect=True)
+def test_read_overlapping_an_append_waits_for_the_record(store):
+    _seed()
+    data_manager.load_data()
+    half_written, reading = threading.Event(), threading.Event()
+
+    def writer():
+        with store.lock():
+            _append_raw(store.path, TORN_HEAD)
+            half_written.set()
+            reading.wait(5)
+            _append_raw(store.path, TORN_REST)
+            storage.bump_version(store.path)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    half_written.wait(5)
+    timer = threading.Timer(0.2, reading.set) # Let the read start while the record is still torn
+    timer.start()
+    df = data_manager._read_typed_frame(store)
+    thread.join()
+    assert len(df) == 3
+    assert df.loc[2, 'Purpose'] == "Line one\nline two"
+    _assert_same_rows(df, _full_parse(store))
+
+@pytest.mark.parametrize("store", ["csv"], indirect=True)
+def test_torn_record_is_left_for_the_next_read(store, monkeypatch):
+    _seed()
+    data_manager.load_data()
+    _append_raw(store.path, TORN_HEAD)
+
+    def busy_lock():
+        raise storage.LockTimeoutError("busy")
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "lock", busy_lock) # The writer still holds it
+        df = data_manager._read_typed_frame(store)
+    assert len(df) == 2
+
+    _append_raw(store.path, TORN_REST)
+    df = data_manager._read_typed_frame(store)
+    assert len(df) == 3
+    assert df.loc[2, 'Purpose'] == "Line one\nline two"
+    _assert_same_rows(df, _full_parse(store))
+
+@pytest.mark.parametrize("store", ["csv"], indirect=True)
+def test_unterminated_last_record_of_a_hand_edited_file_is_read(store):
+    _seed()
+    _append_raw(store.path, TORN_HEAD + TORN_REST.rstrip("\n"))
+    assert len(data_manager._read_typed_frame(store)) == 3
+
+@pytest.mark.parametrize("value, expected", [("7", 7), ("7.0", 7), (7.0, 7), ("7.5", None), ("abc", None), ("", None)])
+def test_serial_value(value, expected):
+    assert storage.serial_value(value) == expected
+
+def test_migration_blanks_serials_that_are_not_whole_numbers(tmp_path):
+    csv_path, db_path = tmp_path / "tools.csv", tmp_path / "tools.sqlite3"
+    header = ",".join(data_manager.EXPECTED_COLUMNS)
+    rows = ["1,One,,Chatbots,Free,,Ana,2026-01-01 00:00:00,", "abc,Two,,Chatbots,Free,,Ana,2026-01-02 00:00:00,",
+            "3.5,Three,,Chatbots,Free,,Ana,2026-01-03 00:00:00,"]
+    csv_path.write_text("\n".join([header] + rows) + "\n", encoding="utf-8")
+    copied, invalid_serials = storage.migrate_csv_to_sqlite(str(csv_path), str(db_path), data_manager.EXPECTED_COLUMNS,
+                                                            data_manager.DATE_TIME_FORMAT)
+    assert copied == 3
+    assert invalid_serials == [(2, "abc"), (3, "3.5")]
+    backend = storage.SqliteBackend(str(db_path), data_manager.EXPECTED_COLUMNS, data_manager.DATE_TIME_FORMAT)
+    assert backend.read_frame()['Serial_Number'].isna().tolist() == [False, True, True]
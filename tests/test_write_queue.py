@@ -0,0 +1,40 @@
+# tests/test_write_queue.py
+from utils import data_manager, write_queue
+
+WAIT_SECONDS = 10
+
+def _submit(number, name=None):
+    return write_queue.submit(name or f"Tool {number}", f"https://tool{number}.example/", "Chatbots", "Free", "",
+                              "Ana", f"Does thing number {number}")
+
+def test_submissions_are_committed_with_unique_serials(store):
+    tickets = [_submit(n) for n in range(1, 6)] + [_submit(9, name="tool 1")]
+    assert write_queue.flush(WAIT_SECONDS)
+    assert [ticket.status for ticket in tickets] == ["added"] * 5 + ["duplicate"]
+    assert sorted(ticket.serial_number for ticket in tickets[:5]) == [1, 2, 3, 4, 5]
+    assert len(data_manager.load_data()) == 5
+
+def test_failed_batch_fails_its_tickets_and_the_writer_keeps_going(store, monkeypatch):
+    def broken(entries):
+        raise OSError("disk full")
+    with monkeypatch.context() as patch:
+        patch.setattr(data_manager, "add_entries", broken)
+        ticket = _submit(1)
+        assert ticket.wait(WAIT_SECONDS)
+    assert ticket.status == "failed" and "disk full" in ticket.message
+    assert write_queue.flush(WAIT_SECONDS)
+
+    ticket = _submit(2)
+    assert ticket.wait(WAIT_SECONDS)
+    assert ticket.status == "added"
+
+def test_unexpected_commit_error_still_finishes_every_ticket(store, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(data_manager, "add_entries", lambda entries: []) # Malformed results: _commit itself raises
+        tickets = [_submit(1), _submit(2)]
+        assert write_queue.flush(WAIT_SECONDS)
+    assert [ticket.status for ticket in tickets] == ["failed", "failed"]
+
+    ticket = _submit(3)
+    assert ticket.wait(WAIT_SECONDS)
+    assert ticket.status == "added"
@@ -0,0 +1,94 @@
+# utils/benchmark_near_duplicates.py
+# Benchmark of the near-duplicate detector (utils/near_duplicates.py) on a synthetic catalogue.
+#
+# Usage (from the project root):
+#   python -m utils.benchmark_near_duplicates [--tools 100000] [--queries 2000] [--seed 7]
+# Reports index build time, per-lookup latency (what the Add Tool form pays), name recall and the full dedupe report
+# time. Lookups pass no link, so a hit can only come from the MinHash path over Names (an exact domain match would
+# find every query whatever its name).
+import argparse
+import random
+import string
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils import near_duplicates
+
+_SYLLABLES = [c + v for c in "bcdfghjklmnprstvwxz" for v in "aeiou"] + ["ai", "gpt", "bot", "lab", "io", "ly"]
+_SUFFIXES = ["", "", "", " AI", " Pro", " Studio", " GPT", " Labs"]
+
+def _typo(text, rng):
+    """One random edit (swap, drop, replace or insert a letter)."""
+    if len(text) < 3:
+        return text + rng.choice(string.ascii_lowercase)
+    i = rng.randrange(len(text) - 1)
+    edit = rng.randrange(4)
+    if edit == 0:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if edit == 1:
+        return text[:i] + text[i + 1:]
+    if edit == 2:
+        return text[:i] + rng.choice(string.ascii_lowercase) + text[i + 1:]
+    return text[:i] + rng.choice(string.ascii_lowercase) + text[i:]
+
+def synthetic_catalogue(count, seed=7):
+    """A tools-like frame (Name, Link) with ~1% planted typo duplicates."""
+    rng = random.Random(seed)
+    names, links = [], []
+    for i in range(count):
+        if names and rng.random() < 0.01:
+            source = rng.randrange(len(names))
+            names.append(_typo(names[source], rng))
+            links.append(links[source].replace("https://", "http://"))
+            continue
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 5))).capitalize() + rng.choice(_SUFFIXES)
+        names.append(name)
+        links.append(f"https://www.{name.lower().replace(' ', '')}.{rng.choice(['ai', 'com', 'io'])}/")
+    return pd.DataFrame({"Name": pd.array(names, dtype="string"), "Link": pd.array(links, dtype="string")})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MinHash-LSH near-duplicate detection.")
+    parser.add_argument("--tools", type=int, default=100000, help="Catalogue size.")
+    parser.add_argument("--queries", type=int, default=2000, help="Number of Add Tool style lookups to time.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    df = synthetic_catalogue(args.tools, seed=args.seed)
+    started = time.perf_counter()
+    index = near_duplicates.NearDuplicateIndex()
+    index.add_rows(df)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(args.seed + 1)
+    samples = [rng.randrange(len(df)) for _ in range(args.queries)]
+    queries = [(i, _typo(df['Name'].iat[i], rng)) for i in samples]
+    name_keys = near_duplicates.indexes.name_keys(df['Name'])
+    candidate_times, lookup_times, hits, findable = [], [], 0, 0
+    for source, name in queries:
+        key = near_duplicates.indexes.name_key(name)
+        started = time.perf_counter()
+        index.names.candidates(key)
+        candidate_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        found = index.find(name, None)
+        lookup_times.append(time.perf_counter() - started)
+        # Recall over the typos still within MIN_SIMILARITY of their source (the others aren't duplicates by definition)
+        if near_duplicates.similarity(key, name_keys.iat[source]) >= near_duplicates.MIN_SIMILARITY:
+            findable += 1
+            hits += any(name_keys.iat[row_id] == name_keys.iat[source] for row_id, _, _ in found)
+
+    started = time.perf_counter()
+    report = index.report()
+    report_seconds = time.perf_counter() - started
+
+    candidate_ms, lookup_ms = np.array(candidate_times) * 1000, np.array(lookup_times) * 1000
+    print(f"tools: {len(df)}  index build: {build_seconds:.2f}s")
+    print(f"candidate lookup: median {np.median(candidate_ms):.3f} ms, p99 {np.percentile(candidate_ms, 99):.3f} ms")
+    print(f"verified lookup:  median {np.median(lookup_ms):.3f} ms, p99 {np.percentile(lookup_ms, 99):.3f} ms"
+          f"  (name-only recall: {hits / max(1, findable):.1%} of {findable} typos within the similarity threshold)")
+    print(f"dedupe report: {report_seconds:.2f}s, {len(report)} pairs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
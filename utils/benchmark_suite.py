@@ -0,0 +1,280 @@
+# utils/benchmark_suite.py
+# Headless benchmarks of the data_manager and dashboard hot paths on deterministic synthetic catalogues.
+#
+# Usage (from the project root):
+#   python -m utils.benchmark_suite [--sizes 1k 10k 100k 1m] [--backend csv|sqlite] [--repeat 5]
+#                                   [--output benchmark_results.json] [--compare previous_results.json]
+# Each size gets a fresh data file in a temporary directory (the real database is never touched). Every benchmark
+# reports min/median/max wall time over --repeat runs, rows/sec (rows in the catalogue per median run) and the
+# peak traced memory of one extra run. Results are saved as JSON (with the git commit and library versions);
+# --compare prints the median change against an earlier results file, so commits can be compared.
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import datetime
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+import numpy as np
+import pandas as pd
+import streamlit.logger
+streamlit.logger.set_log_level("error") # Headless: st.cache_data warns "No runtime found" for every cache
+from utils import data_manager, export, helpers, indexes, snapshot
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_REPEAT = 5
+ADD_BATCH_SIZE = 100 # Submissions per add_entries() call (a write-behind queue batch)
+REGRESSION_THRESHOLD = 0.10 # --compare flags medians that got more than 10% slower
+
+_SYLLABLES = [c + v for c in "bcdfghjklmnprstvwxz" for v in "aeiou"] + ["ai", "gpt", "bot", "lab", "io", "ly"]
+_SUFFIXES = ["", "", "", " AI", " Pro", " Studio", " GPT", " Labs"]
+_PURPOSE_WORDS = ("generate write optimize schedule analyze summarize translate design edit automate track "
+                  "campaigns content posts emails images videos reports audiences keywords leads brand copy "
+                  "social marketing teams faster with AI insights for your and in minutes across channels").split()
+
+def _zipf_weights(count, exponent=1.1):
+    """Skewed choice weights (a few popular values, a long tail), like real category/uploader usage."""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+def synthetic_catalogue(count, seed=7):
+    """A deterministic tools frame in the EXPECTED_COLUMNS schema, as stored (text dates, blank costs)."""
+    rng = np.random.default_rng(seed)
+    syllables = np.array(_SYLLABLES, dtype=object)
+    name_parts = syllables[rng.integers(0, len(syllables), size=(count, 4))]
+    three_syllables = rng.random(count) < 0.5
+    name_parts[three_syllables, 3] = ""
+    names = pd.Series(name_parts[:, 0] + name_parts[:, 1] + name_parts[:, 2] + name_parts[:, 3], dtype=object).str.capitalize()
+    names = names + np.array(_SUFFIXES, dtype=object)[rng.integers(0, len(_SUFFIXES), size=count)]
+    domains = names.str.lower().str.replace(" ", "", regex=False)
+    links = "https://www." + domains + np.array([".ai", ".com", ".io"], dtype=object)[rng.integers(0, 3, size=count)] + "/"
+
+    categories = np.array(helpers.PREDEFINED_CATEGORIES, dtype=object)
+    pricing_types = np.array([p for p in helpers.PRICING_TYPES if p != "Select Pricing"], dtype=object)
+    uploaders = np.array([u for u in helpers.UPLOADERS_LIST if u not in ("Select Your Name", "Other")], dtype=object)
+    pricing = pricing_types[rng.choice(len(pricing_types), size=count, p=_zipf_weights(len(pricing_types)))]
+    costs = np.where(np.isin(pricing, helpers.PRICING_TYPES_WITH_COST),
+                     "$" + rng.integers(5, 200, size=count).astype(str).astype(object) + "/month", "")
+
+    # Added over the last three years, with second resolution
+    start = np.datetime64("2023-01-01T00:00:00")
+    offsets = rng.integers(0, 3 * 365 * 24 * 3600, size=count).astype("timedelta64[s]")
+    date_times = pd.Series(start + offsets).dt.strftime(data_manager.DATE_TIME_FORMAT)
+
+    words = np.array(_PURPOSE_WORDS, dtype=object)
+    lengths = rng.integers(8, 30, size=count)
+    word_ids = rng.integers(0, len(words), size=int(lengths.sum()))
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    purposes = [" ".join(words[word_ids[bounds[i]:bounds[i + 1]]]).capitalize() + "." for i in range(count)]
+
+    return pd.DataFrame({
+        "Serial_Number": np.arange(1, count + 1),
+        "Name": names,
+        "Link": links,
+        "Category": categories[rng.choice(len(categories), size=count, p=_zipf_weights(len(categories)))],
+        "Pricing_Type": pricing,
+        "Subscription_Cost": costs,
+        "Uploaded_By": uploaders[rng.choice(len(uploaders), size=count, p=_zipf_weights(len(uploaders)))],
+        "Date_Time": date_times,
+        "Purpose": purposes,
+    }, columns=data_manager.EXPECTED_COLUMNS)
+
+def use_data_dir(work_dir, backend_kind):
+    """Points data_manager at a fresh data file in work_dir (the configured database is left alone)."""
+    data_manager.STORAGE_BACKEND = backend_kind
+    data_manager.CSV_FILE_PATH = os.path.join(work_dir, "tools.csv")
+    data_manager.SQLITE_DB_PATH = os.path.join(work_dir, "tools.sqlite3")
+    reset_caches()
+    backend = data_manager.get_backend()
+    backend.initialize()
+    return backend
+
+def reset_caches():
+    """Forgets everything parsed or cached in this process (the next load_data() is a cold start)."""
+    data_manager.invalidate_data_caches()
+    with data_manager._parsed_state_lock:
+        data_manager._parsed_state.clear()
+    indexes.drop_indexes()
+
+def _cold_start_without_snapshot():
+    reset_caches()
+    snap_path = snapshot.snapshot_path_for(data_manager.CSV_FILE_PATH)
+    if os.path.exists(snap_path):
+        os.remove(snap_path)
+
+def _measure(size_label, name, func, rows, repeat, setup=None, measure_memory=True):
+    """Times func() `repeat` times (setup() before each run, untimed), then traces peak memory of one more run."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    peak_bytes = None
+    if measure_memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            func()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    median = float(np.median(timings))
+    result = {
+        "size": size_label,
+        "benchmark": name,
+        "rows": rows,
+        "runs": repeat,
+        "min_seconds": min(timings),
+        "median_seconds": median,
+        "max_seconds": max(timings),
+        "rows_per_second": rows / median if median > 0 else None,
+        "peak_memory_mb": peak_bytes / 2**20 if peak_bytes is not None else None,
+    }
+    memory = f"{result['peak_memory_mb']:9.1f} MB" if peak_bytes is not None else "        - MB"
+    print(f"  {name:<42} median {median * 1000:10.2f} ms   min {min(timings) * 1000:10.2f} ms   {memory}", flush=True)
+    return result
+
+def run_size(size_label, count, backend_kind, repeat, seed, measure_memory, work_dir):
+    """Generates a catalogue of `count` rows and runs every benchmark on it. Returns the result dicts."""
+    started = time.perf_counter()
+    catalogue = synthetic_catalogue(count, seed=seed)
+    generate_seconds = time.perf_counter() - started
+    backend = use_data_dir(work_dir, backend_kind)
+    backend.replace_all(data_manager._prepare_frame_for_storage(catalogue))
+    print(f"\n{size_label}: {count} tools on {backend_kind} (generated in {generate_seconds:.2f}s)", flush=True)
+    del catalogue
+
+    results = []
+    bench = lambda name, func, rows=count, setup=None: results.append(
+        _measure(size_label, name, func, rows, repeat, setup=setup, measure_memory=measure_memory))
+
+    # Loading
+    if backend_kind == "csv" and snapshot.is_available():
+        bench("load_data (cold, full parse)", data_manager.load_data, setup=_cold_start_without_snapshot)
+        data_manager.load_data() # Writes the snapshot again
+        bench("load_data (cold, snapshot)", data_manager.load_data, setup=reset_caches)
+    else:
+        bench("load_data (cold)", data_manager.load_data, setup=reset_caches)
+    bench("load_data (cached rerun)", data_manager.load_data)
+    df = data_manager.load_data()
+    bench("get_next_serial_number (full scan)", lambda: data_manager.get_next_serial_number(df))
+    bench("get_all_categories (after a write)", data_manager.get_all_categories, setup=data_manager.invalidate_data_caches)
+    bench("get_dashboard_summary (after a write)", data_manager.get_dashboard_summary, setup=data_manager.invalidate_data_caches)
+
+    # Dashboard filtering (facet bitsets + search index; the first call after a cold start builds them)
+    top_category = str(df['Category'].value_counts().index[0])
+    top_uploader = str(df['Uploaded_By'].value_counts().index[0])
+    search_term = "marketing ema"
+    bench("dashboard indexes build (filter + search)",
+          lambda: data_manager.filter_tools(category=top_category, search_term=search_term), setup=indexes.drop_indexes)
+    bench("filter_tools (category)", lambda: data_manager.filter_tools(category=top_category))
+    bench("filter_tools (category + uploader)", lambda: data_manager.filter_tools(category=top_category, uploaded_by=top_uploader))
+    bench("filter_tools (search)", lambda: data_manager.filter_tools(search_term=search_term))
+    bench("filter_tools (category + pricing + search)",
+          lambda: data_manager.filter_tools(category=top_category, pricing_type="Free", search_term=search_term))
+    bench("facet_counts (search)", lambda: data_manager.facet_counts(search_term=search_term))
+
+    # Download Data (what export.get_export encodes on a cache miss; replaces get_csv_download_content)
+    bench("export csv.gz (full dataset)", lambda: export.encode(data_manager.load_data(), "csv.gz"))
+    del df
+
+    # Writes last: they grow the catalogue
+    rng = random.Random(seed + count)
+    def new_entry():
+        token = f"{rng.getrandbits(64):016x}"
+        return dict(name=f"Bench Tool {token}", link=f"https://bench-{token}.ai", category="Analytics",
+                    pricing_type="Paid", subscription_cost="$10/month", uploaded_by="Rayna",
+                    purpose="Synthetic submission written by the benchmark suite.")
+    def add_one():
+        if not data_manager.add_entry(**new_entry()):
+            raise RuntimeError("add_entry failed")
+    bench("add_entry (1 tool)", add_one, rows=1)
+    bench(f"add_entries (batch of {ADD_BATCH_SIZE})",
+          lambda: data_manager.add_entries([new_entry() for _ in range(ADD_BATCH_SIZE)]), rows=ADD_BATCH_SIZE)
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """Prints the median change of every benchmark against a saved results file. Returns the regression count."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    before = {(r["size"], r["benchmark"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    regressions = 0
+    for result in results:
+        old = before.get((result["size"], result["benchmark"]))
+        if old is None or not old["median_seconds"]:
+            continue
+        change = result["median_seconds"] / old["median_seconds"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  <-- slower"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"  {result['size']:>5} {result['benchmark']:<42} {old['median_seconds'] * 1000:10.2f} -> "
+              f"{result['median_seconds'] * 1000:10.2f} ms ({change:+.0%}){flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data_manager and dashboard hot paths on synthetic catalogues.")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES), help="Catalogue sizes to run.")
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite"])
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced (slower) peak-memory run.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to save the JSON results.")
+    parser.add_argument("--compare", help="Earlier results file to compare the medians with.")
+    parser.add_argument("--keep-data", help="Directory to keep the generated data files in (default: a temporary one).")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    work_root = args.keep_data or tempfile.mkdtemp(prefix="arsenal-bench-")
+    try:
+        for size_label in args.sizes:
+            work_dir = os.path.join(work_root, f"{args.backend}-{size_label}")
+            shutil.rmtree(work_dir, ignore_errors=True)
+            os.makedirs(work_dir)
+            results += run_size(size_label, SIZES[size_label], args.backend, args.repeat, args.seed,
+                                not args.no_memory, work_dir)
+    finally:
+        reset_caches()
+        if not args.keep_data:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    meta = {
+        "commit": _git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "backend": args.backend,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\nSaved {len(results)} results to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# utils/card_renderer.py
+# Dashboard tool cards as HTML. The card template is parsed into (literal, field) pieces once at import, every
+# field is built and HTML-escaped a whole column at a time, and a page of cards goes out as one st.markdown block
+# (Visit buttons are plain links inside the cards) instead of one markdown + one link_button per tool.
+# Rendered cards are memoized per (row id, dataset version), so paging back and forth only renders new cards. Row ids
+# (the frame index: the row's position in storage) are unique where Serial_Numbers may not be (legacy/hand-edited data).
+import string
+import threading
+import numpy as np
+import pandas as pd
+from utils import helpers, style_utils, perf
+
+CATEGORY_ICONS = {
+    "Content Creation": "✍️", "Image Generation": "🎨", "Data Analysis": "📊",
+    "Social Media Management": "📱", "Email Marketing": "📧", "SEO Tools": "🔍",
+    "Video Editing": "🎬", "Voice/Audio": "🎤", "Translation": "🌐",
+    "Chatbots": "🤖", "Design Tools": "🖼️", "Analytics": "📈",
+    "PPT Creation": "💻", "Other": "🌟"
+}
+DEFAULT_ICON = "🛠️"
+CARD_VARIANTS = ["variant-1", "variant-2", "variant-3", "variant-4", "variant-5"]
+CARD_ANIMATION_STEP = 0.08 # Seconds between the slide-in of consecutive cards
+KEY_BENEFIT_WORDS = 15
+PURPOSE_SNIPPET_CHARS = 150
+NO_PURPOSE_TEXT = "No detailed purpose provided."
+CARD_CACHE_MAX_ENTRIES = 5000
+
+# Everything that depends only on the tool. Lines are stripped when compiled: markdown would treat indented
+# lines after a blank one as a code block.
+CARD_BODY_TEMPLATE = """
+    <div class="card-header-front">
+        <div class="tool-name-front">{name_html}</div>
+        <div class="tool-category-badge">{category}</div>
+    </div>
+    <div class="tool-icon-front">{icon}</div>
+    <div>
+        <div class="tool-key-benefit-title">Key Benefit / Use</div>
+        <div class="tool-key-benefit-text">{key_benefit}</div>
+    </div>
+    <div class="tool-stats-front">
+        <div class="tool-stat">
+            <div class="tool-stat-label">Pricing</div>
+            <div class="tool-stat-value">{pricing}</div>
+        </div>
+        <div class="tool-stat">
+            <div class="tool-stat-label">Added By</div>
+            <div class="tool-stat-value">{uploaded_by}</div>
+        </div>
+    </div>
+    <div class="tool-purpose-details-area">
+        <p class="tool-purpose-text-label">Purpose:</p>
+        <p class="tool-purpose-full-text">{purpose}</p>
+    </div>
+    {button_html}
+"""
+# Position-dependent wrapper (colour variant and animation delay), filled per page
+CARD_WRAPPER_TEMPLATE = '<div class="tool-card-wrapper {variant} {animation}" style="animation-delay: {delay:.2f}s;">{body}</div>'
+
+_card_cache = {} # (row id, dataset version) -> card body HTML
+_card_cache_lock = threading.Lock()
+
+def compile_template(template):
+    """[(literal, field name or None)] pieces of a str.format-style template, with line indentation removed."""
+    template = "".join(line.strip() for line in template.splitlines())
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+
+def fill_template(pieces, fields, index):
+    """Fills compiled template pieces for every row at once; fields maps field names to string Series."""
+    out = pd.Series("", index=index, dtype="str")
+    for literal, field in pieces:
+        if literal:
+            out = out + literal
+        if field is not None:
+            out = out + fields[field]
+    return out
+
+_CARD_BODY_PIECES = compile_template(CARD_BODY_TEMPLATE)
+
+def escape_column(values):
+    """html.escape (quote=True) for a whole column of text."""
+    return (values.str.replace("&", "&amp;", regex=False).str.replace("<", "&lt;", regex=False)
+            .str.replace(">", "&gt;", regex=False).str.replace('"', "&quot;", regex=False)
+            .str.replace("'", "&#x27;", regex=False))
+
+def _text_column(rows, column, default=""):
+    """Column as text with runs of whitespace collapsed (a blank line would end the markdown HTML block)."""
+    if column not in rows.columns:
+        return pd.Series(default, index=rows.index, dtype="str")
+    return rows[column].astype("string").fillna(default).astype("str").str.replace(r"\s+", " ", regex=True)
+
+def render_card_bodies(rows):
+    """Card body HTML for every row of rows (a Series aligned with rows)."""
+    if rows.empty:
+        return pd.Series([], index=rows.index, dtype="str")
+    name = escape_column(_text_column(rows, 'Name', 'N/A'))
+    link = _text_column(rows, 'Link').str.strip()
+    has_link = (link != "").to_numpy()
+    safe_link = escape_column(link)
+    name_html = name.where(~has_link, "<a href='" + safe_link + "' target='_blank' class='tool-card-link'>" + name
+                           + " <span class='link-icon'>🔗</span></a>")
+
+    category = _text_column(rows, 'Category', 'Other')
+    icon = category.str.strip().map(CATEGORY_ICONS).fillna(DEFAULT_ICON).astype("str")
+
+    purpose = _text_column(rows, 'Purpose')
+    purpose = purpose.where(purpose.str.strip() != "", NO_PURPOSE_TEXT)
+    # First KEY_BENEFIT_WORDS words, with "..." if there were more
+    key_benefit = purpose.str.extract(r"^ ?((?:\S+ ){0,%d}\S+)" % (KEY_BENEFIT_WORDS - 1), expand=False).fillna("")
+    key_benefit = key_benefit.where(purpose.str.count(r"\S+") <= KEY_BENEFIT_WORDS, key_benefit + "...")
+    purpose_snippet = escape_column(purpose.str.slice(0, PURPOSE_SNIPPET_CHARS))
+    purpose_snippet = purpose_snippet.where(purpose.str.len() <= PURPOSE_SNIPPET_CHARS, purpose_snippet + "...")
+
+    pricing_type = _text_column(rows, 'Pricing_Type', 'N/A')
+    cost = _text_column(rows, 'Subscription_Cost').str.strip()
+    show_cost = (pricing_type.isin(helpers.PRICING_TYPES_WITH_COST) & (cost != "") & (cost.str.lower() != "nan")).to_numpy()
+    pricing = escape_column(pricing_type)
+    pricing = pricing.where(~show_cost, pricing + " (" + escape_column(cost) + ")")
+
+    button_html = pd.Series(np.where(
+        has_link,
+        ("<a href='" + safe_link + "' target='_blank' rel='noopener' class='tool-card-visit-button'>Visit Tool ➔</a>").to_numpy(),
+        "<p class='no-website-message-card'>No website link provided</p>"), index=rows.index, dtype="str")
+
+    fields = {
+        "name_html": name_html, "category": escape_column(category), "icon": icon,
+        "key_benefit": escape_column(key_benefit), "pricing": pricing,
+        "uploaded_by": escape_column(_text_column(rows, 'Uploaded_By', 'N/A')),
+        "purpose": purpose_snippet, "button_html": button_html,
+    }
+    return fill_template(_CARD_BODY_PIECES, fields, rows.index)
+
+def _cached_card_bodies(rows, dataset_version):
+    """Card bodies for rows (a slice of a frame from data_manager, indexed by row id), rendering (and memoizing) only
+    the ones not cached for this dataset version."""
+    keys = [(int(row_id), dataset_version) for row_id in rows.index]
+    with _card_cache_lock:
+        bodies = [_card_cache.get(key) for key in keys]
+    missing = [i for i, body in enumerate(bodies) if body is None]
+    perf.record_cache("card_bodies", hits=len(bodies) - len(missing), misses=len(missing))
+    if missing:
+        rendered = render_card_bodies(rows.iloc[missing]).tolist()
+        with _card_cache_lock:
+            for i, body in zip(missing, rendered):
+                bodies[i] = body
+                _card_cache[keys[i]] = body
+            # Oldest entries first (dict order); older dataset versions are never asked for again
+            for key in list(_card_cache)[:max(0, len(_card_cache) - CARD_CACHE_MAX_ENTRIES)]:
+                del _card_cache[key]
+    return bodies
+
+@perf.traced()
+def render_card_page(rows, dataset_version, first_index=0):
+    """One HTML block with a card per row of rows, in order. first_index keeps the colour variants of a page
+    continuing from the previous one."""
+    animation = style_utils.get_css_animation_class("slideInUp")
+    cards = [
+        CARD_WRAPPER_TEMPLATE.format(variant=CARD_VARIANTS[(first_index + i) % len(CARD_VARIANTS)], animation=animation,
+                                     delay=i * CARD_ANIMATION_STEP, body=body)
+        for i, body in enumerate(_cached_card_bodies(rows, dataset_version))
+    ]
+    return '<div class="tool-card-container">' + "".join(cards) + "</div>"
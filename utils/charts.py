@@ -0,0 +1,59 @@
+# utils/charts.py
+# Dashboard analytics figures. Building a plotly.express figure (and its layout) costs tens of milliseconds, so each
+# figure is built once per dataset version and cached as Plotly JSON; reruns from typing in the search box or
+# changing filters just hand the cached JSON to st.plotly_chart. Hit/build statistics: get_figure_cache_stats().
+import time
+import threading
+import logging
+import pandas as pd
+from utils import data_manager, perf
+
+logger = logging.getLogger(__name__)
+
+# Process-wide figure cache statistics (read via get_figure_cache_stats())
+_figure_stats = {"requests": 0, "builds": 0, "build_seconds_total": 0.0, "last_build_seconds": 0.0}
+_figure_stats_guard = threading.Lock()
+
+def _record_request():
+    with _figure_stats_guard:
+        _figure_stats["requests"] += 1
+
+def _record_build(name, build_seconds):
+    with _figure_stats_guard:
+        _figure_stats["builds"] += 1
+        _figure_stats["build_seconds_total"] += build_seconds
+        _figure_stats["last_build_seconds"] = build_seconds
+    logger.info("Built figure '%s' in %.1f ms", name, build_seconds * 1000)
+
+def get_figure_cache_stats() -> dict:
+    """Figure requests, builds (cache misses), hits, hit rate and build times since the process started."""
+    with _figure_stats_guard:
+        stats = dict(_figure_stats)
+    stats["hits"] = max(0, stats["requests"] - stats["builds"])
+    stats["hit_rate"] = stats["hits"] / stats["requests"] if stats["requests"] else 0.0
+    return stats
+
+@perf.traced("category_chart")
+def category_chart_json():
+    """The "Tools per Category" bar chart as Plotly figure JSON, or None if no tool has a category yet."""
+    _record_request()
+    return _category_chart_for_version(data_manager.get_dataset_version())
+
+@data_manager.data_cache(max_entries=4)
+def _category_chart_for_version(dataset_version):
+    import plotly.express as px # ~100 ms to import, so only once the first figure is actually built
+    started = time.perf_counter()
+    category_counts = pd.DataFrame(list(data_manager.get_dashboard_summary()['categories'].items()), columns=['Category', 'Count'])
+    if category_counts.empty:
+        return None
+    fig_bar = px.bar(category_counts, x='Category', y='Count',
+                     title='Tools per Category', color='Category',
+                     labels={'Count': '# of Tools', 'Category': 'Tool Category'},
+                     height=400, template="plotly_white")
+    fig_bar.update_layout(title_x=0.5,
+                          plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                          font=dict(family="Poppins, sans-serif", color="#4A5568"),
+                          xaxis={'categoryorder': 'total descending'})
+    figure_json = fig_bar.to_json()
+    _record_build("category_chart", time.perf_counter() - started)
+    return figure_json
@@ -3,116 +3,401 @@ import streamlit as st
 import pandas as pd
 import datetime
 import os
+import io
+import logging
+import threading
+import sys
+import uuid
+import functools
+import numpy as np
+from utils import storage, snapshot, indexes, near_duplicates, search_index, facets, summary, perf
 # from utils import helpers # Loaded at the end if needed, or manage imports carefully
 
 CSV_FILE_PATH = "ai_tools_database.csv" # You might want to rename this to align with your v1.0 (e.g., "data/ai_tools.csv")
 # Ensure this path is consistent with where you want the file.
 # If you used "data/ai_tools.xlsx" or "data/ai_tools.csv" in your v1.0, adjust CSV_FILE_PATH.
 
+# Storage backend: "csv" (default, the file above) or "sqlite" (indexed database, see utils/migrate_csv_to_sqlite.py)
+STORAGE_BACKEND = os.environ.get("APP_STORAGE_BACKEND", "csv").strip().lower()
+SQLITE_DB_PATH = os.environ.get("APP_SQLITE_PATH", "ai_tools_database.sqlite3")
+
 # This schema is from our "battle card" enhancement phase.
 # If your v1.0 had a different schema, adjust this to match the columns you actually want to save and use.
 EXPECTED_COLUMNS = [
-    "Serial_Number", "Name", "Link", "Category", "Pricing_Type", 
+    "Serial_Number", "Name", "Link", "Category", "Pricing_Type",
     "Subscription_Cost", "Uploaded_By", "Date_Time", "Purpose"
 ]
 
+DATE_TIME_FORMAT = '%Y-%m-%d %H:%M:%S' # Format used for Date_Time when written to storage
+
+# In-memory dtypes for every loaded frame. Bump SCHEMA_VERSION whenever this changes (invalidates snapshots).
+# Low-cardinality columns are categoricals: a few bytes per row instead of a Python string each, and == filters
+# compare integer codes. Date_Time is parsed with DATE_TIME_FORMAT (no per-row format inference).
+SCHEMA_VERSION = 2
+COLUMN_DTYPES = {
+    "Serial_Number": "Int32",
+    "Name": "string",
+    "Link": "string",
+    "Category": "category",
+    "Pricing_Type": "category",
+    "Subscription_Cost": "string",
+    "Uploaded_By": "category",
+    "Date_Time": "datetime64[ns]",
+    "Purpose": "string",
+}
+CATEGORICAL_COLUMNS = [col for col, dtype in COLUMN_DTYPES.items() if dtype == "category"]
+
+# When True, add_entry appends a single record to the end of the CSV instead of rewriting the whole file.
+# The full rewrite is still used whenever the header on disk doesn't match EXPECTED_COLUMNS (schema migration).
+APPEND_ONLY_INSERTS = True
+
+# Keep a typed, pre-sorted Arrow snapshot next to the CSV (ai_tools_database.csv.arrow) so cold loads skip
+# CSV parsing/typing/sorting. Rebuilt automatically whenever the CSV changes. Needs pyarrow; ignored without it.
+SNAPSHOT_ENABLED = os.environ.get("APP_SNAPSHOT_CACHE", "1") != "0"
+
+logger = logging.getLogger(__name__)
+
+_backends = {} # (kind, path) -> StorageBackend, so connections/state are shared by all sessions in this process
+
+def get_backend():
+    """Returns the configured storage backend (created once per process)."""
+    path = SQLITE_DB_PATH if STORAGE_BACKEND == "sqlite" else CSV_FILE_PATH
+    key = (STORAGE_BACKEND, path)
+    backend = _backends.get(key)
+    if backend is None:
+        backend = _backends[key] = storage.create_backend(
+            STORAGE_BACKEND, path, EXPECTED_COLUMNS, DATE_TIME_FORMAT, csv_read_options=_csv_read_options()
+        )
+    return backend
+
 def initialize_csv():
-    """Creates the CSV file with headers if it doesn't exist."""
-    # Check if the directory for CSV_FILE_PATH exists, create if not
-    data_dir = os.path.dirname(CSV_FILE_PATH)
-    if data_dir and not os.path.exists(data_dir): # Check if data_dir is not empty (i.e., not root)
-        try:
-            os.makedirs(data_dir, exist_ok=True)
-        except OSError as e:
-            st.error(f"Could not create data directory '{data_dir}': {e}")
-            return # Stop if directory creation fails
+    """Creates the data file (CSV with headers, or the SQLite tables) if it doesn't exist."""
+    backend = get_backend()
+    try:
+        backend.initialize()
+    except OSError as e:
+        st.error(f"Could not create data storage '{backend.path}': {e}")
+    except Exception as e:
+        st.error(f"Failed to initialize data storage '{backend.path}': {e}")
+
+def _csv_read_options():
+    """read_csv arguments for the declared schema: only our columns, everything read as text, typed afterwards."""
+    return {
+        "usecols": lambda col: col in COLUMN_DTYPES,
+        "dtype": {col: "string" for col in COLUMN_DTYPES},
+    }
+
+def _read_csv_bytes(raw_bytes):
+    return pd.read_csv(io.BytesIO(raw_bytes), **_csv_read_options())
+
+def _parse_date_time(values):
+    """Parses Date_Time with the declared format; only rows that don't match it fall back to inference."""
+    parsed = pd.to_datetime(values, format=DATE_TIME_FORMAT, errors='coerce')
+    leftovers = parsed.isna() & values.notna() & (values.astype("string").str.strip() != '')
+    if leftovers.any(): # Hand-edited rows in another format
+        parsed[leftovers] = pd.to_datetime(values[leftovers], format='mixed', errors='coerce')
+    return parsed.astype(COLUMN_DTYPES['Date_Time'])
+
+def _apply_schema_dtypes(df):
+    """Converts each column to its COLUMN_DTYPES dtype (no-op for columns that already match)."""
+    for col, dtype in COLUMN_DTYPES.items():
+        if col == 'Date_Time':
+            if not pd.api.types.is_datetime64_any_dtype(df[col]) or str(df[col].dtype) != dtype:
+                df[col] = _parse_date_time(df[col]) if not pd.api.types.is_datetime64_any_dtype(df[col]) else df[col].astype(dtype)
+        elif col == 'Serial_Number':
+            if str(df[col].dtype) != dtype:
+                numeric = pd.to_numeric(df[col], errors='coerce')
+                df[col] = numeric.where(numeric % 1 == 0).astype(dtype) # Non-integers become <NA>
+        elif dtype == 'category':
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("string").astype("category")
+            elif str(df[col].cat.categories.dtype) != "string": # e.g. after an Arrow round trip
+                df[col] = df[col].cat.rename_categories(df[col].cat.categories.astype("string"))
+        elif str(df[col].dtype) != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+def empty_frame():
+    """An empty frame with the declared columns and dtypes."""
+    return _apply_schema_dtypes(pd.DataFrame(columns=EXPECTED_COLUMNS))
+
+def _memory_report(df):
+    """Bytes used by df and an estimate of what the same data would take with plain object/int64 columns."""
+    actual = int(df.memory_usage(deep=True, index=False).sum())
+    saved = 0
+    for col in CATEGORICAL_COLUMNS:
+        codes = df[col].cat.codes.to_numpy()
+        category_sizes = np.array([sys.getsizeof(str(c)) for c in df[col].cat.categories] + [0], dtype=np.int64)
+        object_bytes = 8 * len(codes) + int(category_sizes[codes].sum()) # codes == -1 (missing) hits the trailing 0
+        saved += object_bytes - int(df[col].memory_usage(deep=True, index=False))
+    saved += 8 * len(df) - int(df['Serial_Number'].memory_usage(deep=True, index=False)) # vs int64
+    return {"rows": len(df), "bytes": actual, "saved_bytes": saved}
+
+def _normalize_frame(df, show_schema_info=True):
+    """Aligns a raw frame from storage with EXPECTED_COLUMNS and converts every column to COLUMN_DTYPES."""
+    updated_csv = False
+
+    for col in EXPECTED_COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.NA
+            updated_csv = True
+
+    # If columns were added or order changed, re-order and save
+    if updated_csv or list(df.columns) != EXPECTED_COLUMNS:
+         # Ensure only expected columns are kept, in the right order
+        df = df.reindex(columns=EXPECTED_COLUMNS, fill_value=pd.NA)
+        if updated_csv and show_schema_info: # Only show info if new columns were actually added
+            st.info("Database schema updated. Columns have been adjusted/added.")
+        # save_data(df) # Save immediately if schema changed (be careful with recursion if save_data calls load_data)
+                       # It's generally safer to let the next save operation handle it or handle it post-load.
+
+    return _apply_schema_dtypes(df)
+
+def _with_memory_report(df):
+    report = _memory_report(df)
+    df.attrs['memory_report'] = report
+    logger.info("Loaded %d rows in %.1f KiB (%.1f KiB saved by categorical/Int32 columns)",
+                report['rows'], report['bytes'] / 1024, report['saved_bytes'] / 1024)
+    return df
+
+def _sorted_frame(df):
+    """Newest first; rows with the same Date_Time keep reverse file order (the later-added row comes first).
+
+    The index is left as the row's position in storage (its row id), which utils/indexes relies on.
+    """
+    return df.iloc[::-1].sort_values(by="Date_Time", ascending=False, kind="stable")
+
+def _new_lineage(df):
+    """Tags a freshly read frame; frames that only grow by appended rows keep their lineage (see utils/indexes)."""
+    df.attrs['lineage'] = uuid.uuid4().hex
+    return df
+
+# Last fully typed frame per CSV path plus the fingerprint (byte offset, row count, sha256) of the bytes it came from.
+# When a later load finds the same prefix followed by new bytes, only that tail is parsed and merged in.
+_parsed_state = {}
+_parsed_state_lock = threading.Lock()
+SNAPSHOT_REFRESH_TAIL_ROWS = 500 # Rewrite the snapshot once this many rows were merged in since it was written
+
+def _unify_categories(df, other):
+    """Gives both frames identical categoricals (existing categories keep their codes) so concat stays categorical."""
+    df = df.copy(deep=False)
+    other = other.copy(deep=False)
+    for col in CATEGORICAL_COLUMNS:
+        new_categories = other[col].cat.categories.difference(df[col].cat.categories)
+        if len(new_categories):
+            df[col] = df[col].cat.add_categories(new_categories)
+        other[col] = other[col].astype(df[col].dtype)
+    return df, other
+
+def _merge_tail(df, tail_df):
+    """Merges newly parsed (typed) rows into a frame sorted newest first."""
+    if tail_df.empty:
+        return df
+    if df.empty:
+        return _sorted_frame(tail_df)
+    df, tail_df = _unify_categories(df, tail_df)
+    # Reverse file order first so ties sort exactly like _sorted_frame would on the whole file
+    tail_df = tail_df.iloc[::-1]
+    newest_existing = df['Date_Time'].iloc[0]
+    if tail_df['Date_Time'].notna().all() and (pd.isna(newest_existing) or tail_df['Date_Time'].min() >= newest_existing):
+        # The usual case (new tools are the newest): prepend without re-sorting everything
+        tail_df = tail_df.sort_values(by="Date_Time", ascending=False, kind="stable")
+        return pd.concat([tail_df, df])
+    merged = pd.concat([tail_df, df])
+    return merged.sort_values(by="Date_Time", ascending=False, kind="stable")
+
+def _read_tail(raw_bytes, offset):
+    """Parses raw_bytes[offset:] (with the file's header line) into a typed frame."""
+    header_end = raw_bytes.find(b'\n') + 1
+    tail_bytes = raw_bytes[:header_end] + raw_bytes[offset:]
+    return _normalize_frame(_read_csv_bytes(tail_bytes), show_schema_info=False)
+
+def _read_typed_frame(backend, show_schema_info=True):
+    """Returns all rows normalized and sorted newest first.
+
+    CSV backend: uses the Arrow snapshot when the file is unchanged, parses only the appended tail when the
+    previously parsed prefix is intact (same sha256), and falls back to a full parse otherwise.
+    """
+    if not (backend.name == "csv" and SNAPSHOT_ENABLED and snapshot.is_available()):
+        return _new_lineage(_with_memory_report(_sorted_frame(_normalize_frame(backend.read_frame(), show_schema_info))))
+
+    path = backend.path
+    snapshot_key = f"schema-{SCHEMA_VERSION}:" + ",".join(EXPECTED_COLUMNS) # Schema changes invalidate old snapshots
+    with _parsed_state_lock:
+        state = _parsed_state.get(path)
+    current_stat = snapshot.file_stat(path)
+    if state and state['fingerprint']['size'] == current_stat['size'] \
+            and state['fingerprint']['mtime_ns'] == current_stat['mtime_ns']:
+        return state['df'].copy(deep=False)
+
+    df, fingerprint = snapshot.load(path, extra_key=snapshot_key)
+    if df is not None:
+        df = _new_lineage(_apply_schema_dtypes(df))
+        _remember_parsed_state(path, df, fingerprint, snapshot_rows=len(df))
+        return df.copy(deep=False)
 
-    if not os.path.exists(CSV_FILE_PATH):
+    # Base to extend: what this process parsed last, else whatever snapshot is on disk (even if stale)
+    if state:
+        base_df, base_fp, snapshot_rows = state['df'], state['fingerprint'], state['snapshot_rows']
+    else:
+        base_df, base_fp = snapshot.read(path, extra_key=snapshot_key)
+        snapshot_rows = len(base_df) if base_df is not None else 0
+        if base_df is not None:
+            base_df = _new_lineage(_apply_schema_dtypes(base_df))
+
+    stat_before = snapshot.file_stat(path)
+    raw_bytes = backend.read_complete_bytes() # Never a half-written record: its offset would poison the next tail parse
+    fingerprint = snapshot.fingerprint_for(raw_bytes, stat_before)
+
+    df = None
+    if base_df is not None and base_fp and 0 < base_fp['size'] <= len(raw_bytes) \
+            and snapshot.content_hash(raw_bytes[:base_fp['size']]) == base_fp['sha256']:
         try:
-            df = pd.DataFrame(columns=EXPECTED_COLUMNS)
-            df.to_csv(CSV_FILE_PATH, index=False)
-        except Exception as e:
-            st.error(f"Failed to initialize CSV file '{CSV_FILE_PATH}': {e}")
+            tail_df = _read_tail(raw_bytes, base_fp['size']) if len(raw_bytes) > base_fp['size'] else base_df.iloc[0:0]
+            tail_df.index = tail_df.index + len(base_df) # Row ids continue after the rows already parsed
+            df = _merge_tail(base_df, tail_df)
+            df.attrs['lineage'] = base_df.attrs['lineage'] # Same rows plus appended ones: indexes can be extended
+            logger.info("Parsed %d appended rows from '%s' (offset %d)", len(tail_df), path, base_fp['size'])
+        except (pd.errors.ParserError, ValueError) as e: # e.g. a record still being written; just reparse fully
+            logger.warning("Tail parse of '%s' failed (%s); reparsing the whole file", path, e)
+            df = None
+    if df is None:
+        df = _new_lineage(_with_memory_report(_sorted_frame(_normalize_frame(_read_csv_bytes(raw_bytes), show_schema_info))))
+        snapshot_rows = 0
+    fingerprint['rows'] = len(df)
+
+    if len(df) - snapshot_rows >= SNAPSHOT_REFRESH_TAIL_ROWS or snapshot_rows == 0:
+        if snapshot.write(path, df, fingerprint, extra_key=snapshot_key):
+            snapshot_rows = len(df)
+            logger.info("Rebuilt snapshot for '%s' (%d rows)", path, len(df))
+    _remember_parsed_state(path, df, fingerprint, snapshot_rows)
+    return df.copy(deep=False)
+
+def _remember_parsed_state(path, df, fingerprint, snapshot_rows):
+    with _parsed_state_lock:
+        _parsed_state[path] = {'df': df, 'fingerprint': fingerprint, 'snapshot_rows': snapshot_rows}
+
+# --- Data-derived caches ---
+# Everything cached from the tools data is keyed on get_dataset_version(), so an unchanged dataset is never
+# re-parsed and edits made outside the app show up on the next rerun. Writes clear only these caches
+# (never st.cache_data globally, which would also drop e.g. the Lottie animations).
+_data_caches = []
+
+def data_cache(**cache_kwargs):
+    """Like @st.cache_data, but registers the function so invalidate_data_caches() clears it after writes.
+
+    The decorated function should take the dataset version as its first argument. Hits and misses are counted in
+    the performance trace (utils/perf.py) under the function's name.
+    """
+    def decorator(func):
+        @functools.wraps(func) # st.cache_data keys on the wrapped function's name and source
+        def compute(*args, **kwargs):
+            perf.mark_cache_miss() # The body only runs on a miss
+            return func(*args, **kwargs)
+        cached_func = st.cache_data(show_spinner=False, **cache_kwargs)(compute)
+        _data_caches.append(cached_func)
+        return perf.cache_probe(func.__name__.strip("_").replace("_for_version", ""), cached_func)
+    return decorator
+
+def invalidate_data_caches():
+    """Drops every data-derived cache entry (old versions can't be hit anyway; this frees their memory)."""
+    for cached_func in _data_caches:
+        cached_func.clear()
+
+def get_dataset_version():
+    """Returns a cheap token identifying the current state of the stored data (write counter + file stat)."""
+    initialize_csv()
+    return get_backend().change_token()
 
-@st.cache_data(ttl=600) # Cache data for 10 minutes
+@data_cache(max_entries=2)
+def _load_data_for_version(dataset_version):
+    return _load_data_uncached()
+
+@perf.traced("load_data")
 def load_data():
-    """Loads data from the CSV file with error handling and schema validation."""
-    initialize_csv() 
-    try:
-        df = pd.read_csv(CSV_FILE_PATH)
-        
-        updated_csv = False
-        current_columns = list(df.columns)
-
-        for col in EXPECTED_COLUMNS:
-            if col not in df.columns:
-                df[col] = pd.NA
-                updated_csv = True
-        
-        # If columns were added or order changed, re-order and save
-        if updated_csv or [col for col in EXPECTED_COLUMNS if col in current_columns] != [col for col in current_columns if col in EXPECTED_COLUMNS]:
-             # Ensure only expected columns are kept, in the right order
-            df = df.reindex(columns=EXPECTED_COLUMNS, fill_value=pd.NA)
-            if updated_csv: # Only show info if new columns were actually added
-                st.info("Database schema updated. Columns have been adjusted/added.")
-            # save_data(df) # Save immediately if schema changed (be careful with recursion if save_data calls load_data)
-                           # It's generally safer to let the next save operation handle it or handle it post-load.
-
-
-        if 'Date_Time' in df.columns:
-            df['Date_Time'] = pd.to_datetime(df['Date_Time'], errors='coerce')
-        else: # Should not happen if initialize_csv and validation work
-            df['Date_Time'] = pd.NaT
-            
-        if 'Serial_Number' in df.columns and not df.empty:
-            # Coerce to numeric, fill NA with 0 (for max() to work), then int.
-            # If all are NA after coerce, fillna(0) makes max() return 0.
-            df['Serial_Number'] = pd.to_numeric(df['Serial_Number'], errors='coerce').fillna(0).astype(int)
-
-        return df.sort_values(by="Date_Time", ascending=False).reset_index(drop=True)
+    """Loads data from storage with error handling and schema validation (cached per dataset version)."""
+    return _load_data_for_version(get_dataset_version())
 
+def _read_rows(backend, show_schema_info=True):
+    """Reads and normalizes all rows, raising on failure. The write counter it was read at is kept in
+    df.attrs['data_version']. Makes no Streamlit calls with show_schema_info=False (safe off the script thread)."""
+    # Read the version *before* the rows: if a write lands in between we err on the side of a stale version,
+    # which makes the next writer re-check the latest rows instead of trusting this snapshot.
+    data_version = backend.version()
+    try:
+        df = _read_typed_frame(backend, show_schema_info)
     except pd.errors.EmptyDataError:
-        return pd.DataFrame(columns=EXPECTED_COLUMNS) # Return empty df with correct columns
+        df = empty_frame() # Return empty df with correct columns
+    df.attrs['data_version'] = data_version
+    return df
+
+@perf.traced("read rows")
+def _load_data_uncached():
+    """Reads and normalizes all rows, reporting problems on the page (an empty frame is returned then)."""
+    initialize_csv()
+    backend = get_backend()
+    try:
+        return _read_rows(backend)
     except FileNotFoundError:
-        st.error(f"Data file '{CSV_FILE_PATH}' not found. A new one will be created on next save.")
-        return pd.DataFrame(columns=EXPECTED_COLUMNS)
+        st.error(f"Data file '{backend.path}' not found. A new one will be created on next save.")
+        return empty_frame()
     except Exception as e:
-        st.error(f"Error loading data from CSV '{CSV_FILE_PATH}': {e}")
-        return pd.DataFrame(columns=EXPECTED_COLUMNS)
+        st.error(f"Error loading data from '{backend.path}': {e}")
+        return empty_frame()
+
+def _prepare_frame_for_storage(df_to_save):
+    """Returns a copy of df_to_save with storage-friendly values, restricted to EXPECTED_COLUMNS in order."""
+    df_save = df_to_save.copy()
+    # Ensure Date_Time is string for storage
+    if 'Date_Time' in df_save.columns and pd.api.types.is_datetime64_any_dtype(df_save['Date_Time']):
+         df_save['Date_Time'] = df_save['Date_Time'].dt.strftime(DATE_TIME_FORMAT)
+
+    # Handle Subscription_Cost: convert to string, replace 'nan' from float NAs
+    if 'Subscription_Cost' in df_save.columns:
+        df_save['Subscription_Cost'] = df_save['Subscription_Cost'].astype(str).replace('nan', '').replace('<NA>', '')
+
+    # Ensure only expected columns are saved, in the correct order
+    return df_save.reindex(columns=EXPECTED_COLUMNS, fill_value='') # Fill missing with empty string for CSV
 
-def save_data(df_to_save):
-    """Saves the DataFrame to the CSV file."""
+def save_data(df_to_save, expected_version=None):
+    """Saves the DataFrame, replacing everything in storage.
+
+    Pass expected_version (e.g. df.attrs['data_version'] from load_data) to refuse the write if someone
+    else saved in the meantime, instead of silently overwriting their rows.
+    """
     if df_to_save is None:
         st.error("No data provided to save.")
         return False
-    
+
+    backend = get_backend()
     try:
-        # Ensure the directory exists before saving
-        data_dir = os.path.dirname(CSV_FILE_PATH)
-        if data_dir and not os.path.exists(data_dir):
-            os.makedirs(data_dir, exist_ok=True)
-
-        df_save = df_to_save.copy()
-        # Ensure Date_Time is string for CSV storage
-        if 'Date_Time' in df_save.columns and pd.api.types.is_datetime64_any_dtype(df_save['Date_Time']):
-             df_save['Date_Time'] = df_save['Date_Time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Handle Subscription_Cost: convert to string, replace 'nan' from float NAs
-        if 'Subscription_Cost' in df_save.columns:
-            df_save['Subscription_Cost'] = df_save['Subscription_Cost'].astype(str).replace('nan', '').replace('<NA>', '')
-
-        # Ensure only expected columns are saved, in the correct order
-        df_final_to_write = df_save.reindex(columns=EXPECTED_COLUMNS, fill_value='') # Fill missing with empty string for CSV
-
-        df_final_to_write.to_csv(CSV_FILE_PATH, index=False)
-        st.cache_data.clear() # Clear cache after saving new data
+        backend.initialize()
+        with backend.lock() as lock_wait:
+            backend.check_version(expected_version)
+            new_version = backend.replace_all(_prepare_frame_for_storage(df_to_save))
+        logger.info("Saved %d rows to '%s' (version %d, lock wait %.4fs)", len(df_to_save), backend.path, new_version, lock_wait)
+        invalidate_data_caches() # Only data-derived caches; the new version would miss them anyway
         return True
+    except storage.VersionConflictError:
+        st.error("The database was updated by someone else while you were editing. Please reload and try again.")
+        return False
+    except storage.LockTimeoutError as e:
+        st.error(f"The database is busy right now, please try again in a moment. ({e})")
+        return False
     except Exception as e:
-        st.error(f"Error saving data to CSV '{CSV_FILE_PATH}': {e}")
+        st.error(f"Error saving data to '{backend.path}': {e}")
         return False
 
+def get_storage_stats():
+    """Returns storage diagnostics: backend, current data version and lock wait statistics."""
+    backend = get_backend()
+    stats = storage.get_lock_stats()
+    stats['backend'] = backend.name
+    stats['data_version'] = backend.version()
+    return stats
+
 def get_next_serial_number(df):
-    """Calculates the next serial number."""
+    """Calculates the next serial number from the rows (full scan; only used to seed the persisted sequence)."""
     if df.empty or 'Serial_Number' not in df.columns or df['Serial_Number'].isnull().all() or df['Serial_Number'].max() == 0:
         return 1
     # Ensure we are taking max of integers
@@ -121,56 +406,485 @@ def get_next_serial_number(df):
         return 1
     return int(valid_sns.max()) + 1
 
-def add_entry(name, link, category, pricing_type, subscription_cost, uploaded_by, purpose):
-    """Adds a new tool entry to the database."""
-    df = load_data() # Load current data
-    
-    # Integrity check for Serial_Number (should be handled by load_data, but good to be defensive)
+def append_entry_row(entry):
+    """Appends one record (dict keyed by column name) to storage. Hold get_backend().lock() while calling."""
+    return get_backend().append_records([entry])
+
+def _latest_rows_locked(df, backend):
+    """df if nobody wrote since it was read, else the latest rows. Hold backend.lock() while calling."""
+    if backend.version() != df.attrs.get('data_version'):
+        logger.info("Data changed since it was cached (version %s); re-reading latest rows", df.attrs.get('data_version'))
+        return _load_data_uncached()
+    return df
+
+# Rows as of the last add_entries() read, per backend: consecutive batches re-read only after something changed
+_rows_for_write = {}
+
+def _rows_for_write_locked(backend):
+    """The latest rows for duplicate checks and serial seeding, read without Streamlit (add_entries runs on the
+    write queue's thread, which has no script run context). Hold backend.lock() while calling."""
+    key = (backend.name, backend.path)
+    token = backend.change_token()
+    cached = _rows_for_write.get(key)
+    if cached is None or cached[0] != token:
+        cached = _rows_for_write[key] = (token, _read_rows(backend, show_schema_info=False))
+    return cached[1]
+
+def allocate_serial_numbers(count=1):
+    """Reserves `count` consecutive serial numbers (unique across sessions and processes) and returns the first.
+
+    Numbers come from a persisted sequence (a `.seq` file next to the CSV, or a row in the SQLite meta table),
+    never below the highest Serial_Number stored + 1, so hand edits to the data or a lost `.seq` can't cause repeats.
+    """
+    backend = get_backend()
+    backend.initialize()
+    with backend.lock():
+        return backend.allocate_serials(count, lambda: get_next_serial_number(_ensure_serial_numbers(_latest_rows_locked(load_data(), backend))))
+
+# --- Dashboard summary ---
+# Total, per-category counts and recent additions, materialized next to the data (see utils/summary.py).
+
+def _update_summary_locked(backend, current_summary, new_records):
+    """Writes the summary for the rows just appended. current_summary is what read_summary() returned right
+    before the append (None = missing or stale: leave it for get_dashboard_summary() to rebuild).
+    Hold backend.lock() while calling."""
+    if current_summary is None:
+        return
+    try:
+        backend.write_summary(summary.apply_appended(current_summary, new_records, DATE_TIME_FORMAT))
+    except Exception as e: # The rows are written; a stale summary is just rebuilt on the next read
+        logger.warning("Could not update the dashboard summary for '%s': %s", backend.path, e)
+
+@perf.traced()
+def get_dashboard_summary():
+    """{'total', 'categories' ({category: count}), 'recent' (newest first, up to summary.RECENT_LIMIT)} for
+    the dashboard overview. Read from the materialized summary; the rows are only scanned when it is missing
+    or stale (then it is rebuilt and stored)."""
+    return _summary_for_version(get_dataset_version())
+
+@data_cache(max_entries=2)
+def _summary_for_version(dataset_version):
+    backend = get_backend()
+    try:
+        stored = backend.read_summary()
+    except Exception as e:
+        logger.warning("Could not read the dashboard summary for '%s': %s", backend.path, e)
+        stored = None
+    if stored is not None:
+        return stored
+    df = load_data()
+    rebuilt = summary.build(df, DATE_TIME_FORMAT)
+    try:
+        with backend.lock():
+            # Only store it if df is still what's on disk
+            if backend.change_token() == dataset_version and backend.version() == df.attrs.get('data_version'):
+                backend.write_summary(rebuilt)
+                logger.info("Rebuilt the dashboard summary for '%s' (%d rows)", backend.path, len(df))
+    except Exception as e:
+        logger.warning("Could not store the dashboard summary for '%s': %s", backend.path, e)
+    return rebuilt
+
+def _ensure_serial_numbers(df):
+    """Integrity check for Serial_Number (should be handled by load_data, but good to be defensive)."""
     if 'Serial_Number' not in df.columns or not pd.api.types.is_numeric_dtype(df['Serial_Number']):
         df['Serial_Number'] = pd.Series(range(1, len(df) + 1), dtype=int) if not df.empty else pd.Series(dtype=int)
-        if not df.empty:
-             st.warning("Serial_Number column integrity issue detected and resolved before adding new entry.")
-
-    next_sn = get_next_serial_number(df)
-    
-    new_entry_data = {
-        "Serial_Number": next_sn,
-        "Name": name,
-        "Link": link,
-        "Category": category,
-        "Pricing_Type": pricing_type,
-        "Subscription_Cost": subscription_cost if pricing_type in ["Paid", "Freemium"] else "",
-        "Uploaded_By": uploaded_by,
-        "Date_Time": datetime.datetime.now(), # Store as datetime object initially
-        "Purpose": purpose
-    }
-    
-    # Ensure all EXPECTED_COLUMNS are present in the new entry dictionary for pd.DataFrame constructor
-    for col in EXPECTED_COLUMNS:
-        if col not in new_entry_data:
-            new_entry_data[col] = pd.NA 
-
-    new_entry_df = pd.DataFrame([new_entry_data])
-    
-    # Important: Realign columns of new_entry_df to match df (or EXPECTED_COLUMNS) before concat
-    new_entry_df = new_entry_df.reindex(columns=df.columns if not df.empty else EXPECTED_COLUMNS, fill_value=pd.NA)
+        if not df.empty: # Logged, not shown: this runs on the write path, possibly off the script thread
+             logger.warning("Serial_Number column integrity issue detected and resolved before adding new entry.")
+    return df
 
-    df_updated = pd.concat([df, new_entry_df], ignore_index=True)
-    
-    if save_data(df_updated):
-        return True
-    else: # If save fails, we shouldn't consider the entry added
+def add_entry(name, link, category, pricing_type, subscription_cost, uploaded_by, purpose):
+    """Adds a new tool entry to the database."""
+    entry = dict(name=name, link=link, category=category, pricing_type=pricing_type,
+                 subscription_cost=subscription_cost, uploaded_by=uploaded_by, purpose=purpose)
+    try:
+        (serial, problem), = add_entries([entry])
+    except storage.LockTimeoutError as e:
+        st.error(f"The database is busy right now, please try again in a moment. ({e})")
         return False
+    except Exception as e: # If the write fails, we shouldn't consider the entry added
+        st.error(f"Error adding entry to '{get_backend().path}': {e}")
+        return False
+    if serial is None:
+        st.error(f"⚠️ {problem}")
+        return False
+    return True
+
+def add_entries(entries):
+    """Adds tool submissions in one locked write (one append, one version bump, one summary update).
+
+    entries are dicts with add_entry()'s keyword arguments, plus an optional 'date_time' (default: now).
+    Returns one (serial_number, None) per entry, or (None, reason) for an entry that duplicates an existing tool
+    or an earlier entry of the same call. Raises (storage.LockTimeoutError, OSError, ...) if nothing could be written;
+    the page-facing wrappers (add_entry, utils/write_queue.py) turn that into a message. Makes no Streamlit UI
+    calls, so it can run on the write queue's thread.
+    """
+    from utils import helpers # Late import, as in import_tools
+    backend = get_backend()
+    backend.initialize()
+    results = []
+
+    with backend.lock() as lock_wait:
+        # Duplicates are checked against the latest rows (we hold the lock, so they can't move again) and against
+        # the entries before this one in the batch
+        df = _rows_for_write_locked(backend)
+        index = indexes.get_index('duplicates', df, indexes.DuplicateKeyIndex)
+        batch_names, batch_links = set(), set()
+        accepted = []
+        for entry in entries:
+            name_key, link_key = indexes.name_key(entry['name']), indexes.link_key(entry['link'])
+            if name_key and (name_key in index.names or name_key in batch_names):
+                results.append((None, f"A tool with the name '{entry['name']}' already exists."))
+            elif link_key and (link_key in index.links or link_key in batch_links):
+                results.append((None, f"A tool with the link '{entry['link']}' already exists."))
+            else:
+                batch_names.add(name_key)
+                batch_links.add(link_key)
+                results.append(None) # Filled in with the serial number below
+                accepted.append((len(results) - 1, entry))
+        if not accepted:
+            return results
+
+        # Never below the rows' highest serial (the CSV may have been edited since the sequence was written)
+        first_sn = backend.allocate_serials(len(accepted), lambda: get_next_serial_number(_ensure_serial_numbers(df)))
+        new_records = []
+        for offset, (position, entry) in enumerate(accepted):
+            new_entry_data = {
+                "Serial_Number": first_sn + offset,
+                "Name": entry['name'],
+                "Link": entry['link'],
+                "Category": entry['category'],
+                "Pricing_Type": entry['pricing_type'],
+                "Subscription_Cost": entry['subscription_cost'] if entry['pricing_type'] in helpers.PRICING_TYPES_WITH_COST else "",
+                "Uploaded_By": entry['uploaded_by'],
+                "Date_Time": entry.get('date_time') or datetime.datetime.now(), # Store as datetime object initially
+                "Purpose": entry['purpose']
+            }
+            # Ensure all EXPECTED_COLUMNS are present in the new entry dictionary for pd.DataFrame constructor
+            for col in EXPECTED_COLUMNS:
+                if col not in new_entry_data:
+                    new_entry_data[col] = pd.NA
+            new_records.append(new_entry_data)
+            results[position] = (first_sn + offset, None)
+
+        if APPEND_ONLY_INSERTS and backend.can_append():
+            # Fast path: storage already has the expected schema, so just append the records (O(new rows) instead of O(N))
+            current_summary = backend.read_summary()
+            new_version = backend.append_records(new_records)
+            _update_summary_locked(backend, current_summary, new_records)
+        else:
+            # Slow path (schema migration): atomically rewrite everything with the new rows included
+            df = _ensure_serial_numbers(df)
+            new_entries_df = pd.DataFrame(new_records)
+            # Important: Realign columns of new_entries_df to match df (or EXPECTED_COLUMNS) before concat
+            new_entries_df = new_entries_df.reindex(columns=df.columns if not df.empty else EXPECTED_COLUMNS, fill_value=pd.NA)
+            df_updated = pd.concat([df, new_entries_df], ignore_index=True)
+            new_version = backend.replace_all(_prepare_frame_for_storage(df_updated))
+
+    logger.info("Added %d tool(s) from #%s to '%s' (version %d, lock wait %.4fs)", len(new_records), first_sn, backend.path, new_version, lock_wait)
+    invalidate_data_caches() # Only data-derived caches; the new version would miss them anyway
+    return results
+
+# --- Bulk Import ---
+IMPORT_COLUMNS = ["Name", "Link", "Category", "Pricing_Type", "Subscription_Cost", "Uploaded_By", "Purpose"]
+IMPORT_FILE_TYPES = ["csv", "xlsx", "jsonl"]
+
+def read_import_file(file_obj, file_name):
+    """Reads an uploaded CSV/XLSX/JSONL file into a frame of strings. Returns None (after st.error) if it can't."""
+    extension = os.path.splitext(file_name)[1].lower().lstrip('.')
+    try:
+        if extension == "csv":
+            df = pd.read_csv(file_obj, dtype="string", keep_default_na=False)
+        elif extension == "xlsx":
+            df = pd.read_excel(file_obj, dtype=str).astype("string") # Needs openpyxl
+        elif extension == "jsonl":
+            df = pd.read_json(file_obj, lines=True, dtype=False).astype("string")
+        else:
+            st.error(f"Unsupported file type '.{extension}'. Please upload one of: {', '.join(IMPORT_FILE_TYPES)}.")
+            return None
+    except ImportError as e:
+        st.error(f"Reading .{extension} files needs an extra package: {e}")
+        return None
+    except Exception as e:
+        st.error(f"Could not read '{file_name}': {e}")
+        return None
+    # Be lenient with headers: "pricing type", "Pricing-Type" and "PRICING_TYPE" all mean Pricing_Type
+    canonical = {col.lower(): col for col in IMPORT_COLUMNS}
+    df.columns = [canonical.get(str(col).strip().lower().replace(' ', '_').replace('-', '_'), str(col).strip()) for col in df.columns]
+    return df
+
+def import_tools(df_import, default_uploader=None):
+    """Validates and adds many tools at once. Returns (report, added_count).
+
+    Every row is validated in one vectorized pass (helpers.validate_tool_frame) and checked against the catalogue
+    and the rest of the file for duplicate Names/Links. The valid rows get a block of consecutive serial numbers
+    and are written in a single append (one transaction on SQLite). The report has one line per input row:
+    Row (1-based, as in the file), Name, Status ("Added", "Invalid" or "Duplicate"), Serial_Number and Message.
+    """
+    from utils import helpers # Late import to avoid circularity if helpers imports data_manager
+    rows = df_import.reindex(columns=IMPORT_COLUMNS).astype("string").reset_index(drop=True)
+    for col in IMPORT_COLUMNS:
+        rows[col] = rows[col].fillna("").str.strip()
+    if default_uploader:
+        rows.loc[rows['Uploaded_By'] == "", 'Uploaded_By'] = default_uploader
+    # Pricing types are matched case-insensitively and stored in their canonical spelling
+    pricing_lookup = {p.lower(): p for p in helpers.PRICING_TYPES if p != "Select Pricing"}
+    canonical_pricing = rows['Pricing_Type'].str.lower().map(pricing_lookup)
+    rows['Pricing_Type'] = canonical_pricing.fillna(rows['Pricing_Type'])
+    rows.loc[~rows['Pricing_Type'].isin(helpers.PRICING_TYPES_WITH_COST), 'Subscription_Cost'] = ""
+
+    report = pd.DataFrame({
+        "Row": np.arange(2, len(rows) + 2), # Line numbers as seen in a spreadsheet (header is line 1)
+        "Name": rows['Name'],
+        "Status": "Added",
+        "Serial_Number": pd.array([pd.NA] * len(rows), dtype="Int64"),
+        "Message": "",
+    })
+    errors = helpers.validate_tool_frame(rows)
+    invalid = errors.str.len() > 0
+    report.loc[invalid, 'Status'] = "Invalid"
+    report.loc[invalid, 'Message'] = errors[invalid].str.join(" ")
+
+    name_keys, link_keys = indexes.name_keys(rows['Name']), indexes.link_keys(rows['Link'])
+    # Duplicates inside the file itself: the first occurrence wins
+    for keys, label in ((name_keys, "name"), (link_keys, "link")):
+        pending = (report['Status'] == "Added") & (keys != "")
+        first_row = report.loc[pending, 'Row'].groupby(keys[pending]).transform('first')
+        repeated = first_row.index[keys[pending].duplicated(keep='first').to_numpy()]
+        report.loc[repeated, 'Status'] = "Duplicate"
+        report.loc[repeated, 'Message'] = f"Same {label} as row " + first_row[repeated].astype(str) + " of this file."
+
+    backend = get_backend()
+    added = 0
+    try:
+        backend.initialize()
+        df = load_data()
+        with backend.lock() as lock_wait:
+            # Dedupe against the latest catalogue (the cached one is fine unless someone wrote since it was read)
+            df = _latest_rows_locked(df, backend)
+            index = indexes.get_index('duplicates', df, indexes.DuplicateKeyIndex)
+            for keys, existing, label in ((name_keys, index.names, "name"), (link_keys, index.links, "link")):
+                existing_rows = keys.map(existing)
+                clash = (report['Status'] == "Added") & existing_rows.notna()
+                if clash.any():
+                    existing_names = df.loc[existing_rows[clash].astype(int), 'Name'].astype(str).to_numpy()
+                    report.loc[clash, 'Status'] = "Duplicate"
+                    report.loc[clash, 'Message'] = [f"A tool with this {label} already exists ('{n}')." for n in existing_names]
+
+            to_add = rows[report['Status'] == "Added"].copy()
+            if not to_add.empty:
+                first_sn = backend.allocate_serials(len(to_add), lambda: get_next_serial_number(_ensure_serial_numbers(df)))
+                to_add['Serial_Number'] = np.arange(first_sn, first_sn + len(to_add))
+                to_add['Date_Time'] = datetime.datetime.now()
+                to_add = to_add.reindex(columns=EXPECTED_COLUMNS)
+                if APPEND_ONLY_INSERTS and backend.can_append():
+                    current_summary = backend.read_summary()
+                    new_records = to_add.to_dict(orient='records')
+                    new_version = backend.append_records(new_records)
+                    _update_summary_locked(backend, current_summary, new_records)
+                else: # Schema migration: one atomic rewrite with the new rows included
+                    new_version = backend.replace_all(_prepare_frame_for_storage(pd.concat([_ensure_serial_numbers(df), to_add], ignore_index=True)))
+                report.loc[to_add.index, 'Serial_Number'] = to_add['Serial_Number'].to_numpy()
+                added = len(to_add)
+                logger.info("Imported %d tools into '%s' (version %d, lock wait %.4fs)", added, backend.path, new_version, lock_wait)
+    except storage.LockTimeoutError as e:
+        st.error(f"The database is busy right now, please try again in a moment. ({e})")
+        report.loc[report['Status'] == "Added", ['Status', 'Message']] = ["Not added", "Database busy."]
+        return report, 0
+    except Exception as e:
+        st.error(f"Error importing tools into '{backend.path}': {e}")
+        report.loc[report['Status'] == "Added", ['Status', 'Message']] = ["Not added", str(e)]
+        return report, 0
+
+    if added:
+        invalidate_data_caches() # Only data-derived caches; the new version would miss them anyway
+    return report, added
 
 def get_all_categories():
     """Gets all unique categories from the data, plus predefined ones from helpers."""
-    df = load_data()
+    return _categories_for_version(get_dataset_version())
+
+@data_cache(max_entries=2)
+def _categories_for_version(dataset_version):
+    backend = get_backend()
     data_categories = []
-    if not df.empty and 'Category' in df.columns:
-        # Ensure categories are strings, drop NAs, get unique, convert to list
-        data_categories = df['Category'].astype(str).str.strip().replace('', pd.NA).dropna().unique().tolist()
-    
+    if backend.supports_queries:
+        initialize_csv()
+        data_categories = backend.distinct_values('Category') # Served from the Category index
+    else:
+        df = load_data()
+        if not df.empty and 'Category' in df.columns:
+            # Category is categorical, so its distinct values are already known (no scan over the rows)
+            data_categories = pd.Series(df['Category'].cat.categories, dtype="string").str.strip().replace('', pd.NA).dropna().unique().tolist()
+
     from utils import helpers # Late import to avoid circularity if helpers imports data_manager
     # Combine, ensure uniqueness, and sort
     combined_categories = sorted(list(set(helpers.PREDEFINED_CATEGORIES + [cat for cat in data_categories if cat])))
-    return combined_categories
\ No newline at end of file
+    return combined_categories
+
+# --- Lookups & Queries ---
+# Indexed on the SQLite backend; the CSV backend answers them from the cached DataFrame.
+
+def find_tool_by(column, value):
+    """Returns the first tool (dict) whose column matches value case-insensitively, or None."""
+    value = str(value).strip()
+    if not value:
+        return None
+    backend = get_backend()
+    if backend.supports_queries:
+        initialize_csv()
+        return backend.find_first(column, value)
+    df = load_data()
+    if df.empty or column not in df.columns:
+        return None
+    matches = df[df[column].astype(str).str.lower() == value.lower()]
+    return matches.iloc[0].to_dict() if not matches.empty else None
+
+# Dashboard filter argument -> column
+FACET_FILTERS = {"category": "Category", "pricing_type": "Pricing_Type", "uploaded_by": "Uploaded_By"}
+
+def _facet_index(df):
+    return indexes.get_index('facets', df, facets.FacetIndex)
+
+def _facet_filters(**values):
+    """{column: value} for the dashboard filter arguments (values may be None = any)."""
+    return {FACET_FILTERS[arg]: value for arg, value in values.items()}
+
+def query_tools(category=None, pricing_type=None, uploaded_by=None):
+    """Returns tools matching the given Category / Pricing_Type / Uploaded_By (None = any), newest first."""
+    filters = {column: value for column, value in
+               _facet_filters(category=category, pricing_type=pricing_type, uploaded_by=uploaded_by).items() if value is not None}
+    backend = get_backend()
+    if backend.supports_queries:
+        initialize_csv()
+        return _normalize_frame(backend.query(filters), show_schema_info=False)
+    df = load_data()
+    if df.empty or not filters:
+        return df
+    # Intersect the facet bitsets, then keep those rows in the frame's (newest first) order
+    index = _facet_index(df)
+    keep = facets.row_mask(index.match(filters), index.rows)
+    return df[keep[df.index.to_numpy()]]
+
+def _search_row_ids(df, query, limit=None):
+    return indexes.get_index('search', df, search_index.SearchIndex).search(query, limit=limit)
+
+def search_tools(query, limit=None):
+    """Tools matching every word of query (as prefixes) in Name, Category or Purpose, most relevant first.
+
+    Ranked with BM25 from an inverted index (utils/search_index) that is built once per dataset and
+    extended with just the new rows after inserts.
+    """
+    df = load_data()
+    if df.empty or not search_index.tokenize(query):
+        return df.iloc[0:0]
+    return df.loc[_search_row_ids(df, query, limit=limit)]
+
+@perf.traced()
+def filter_tools(category=None, pricing_type=None, uploaded_by=None, search_term=None):
+    """The dashboard's view: Category/Pricing_Type/Uploaded_By filters (None = any) plus an optional search.
+
+    Without a search the tools come newest first; with one, most relevant first (see search_tools).
+    """
+    if not search_term or not search_index.tokenize(search_term):
+        return query_tools(category=category, pricing_type=pricing_type, uploaded_by=uploaded_by)
+    df = load_data()
+    if df.empty:
+        return df
+    row_ids = _search_row_ids(df, search_term)
+    filters = _facet_filters(category=category, pricing_type=pricing_type, uploaded_by=uploaded_by)
+    if any(value is not None for value in filters.values()):
+        index = _facet_index(df)
+        row_ids = row_ids[facets.row_mask(index.match(filters), index.rows)[row_ids]] # Keeps the ranking order
+    return df.loc[row_ids]
+
+@perf.traced()
+def facet_counts(category=None, pricing_type=None, uploaded_by=None, search_term=None):
+    """Live counts for the dashboard filters: {column: {value: count}} for each facet column, counting the tools
+    that match the search and every *other* filter (so each option shows what picking it would give).
+    The None key holds the count for "any value". Counts are bitset popcounts; no rows are scanned.
+    """
+    df = load_data()
+    index = _facet_index(df)
+    within = index.all
+    if search_term and search_index.tokenize(search_term) and not df.empty:
+        within = index.from_row_ids(_search_row_ids(df, search_term))
+    selected = _facet_filters(category=category, pricing_type=pricing_type, uploaded_by=uploaded_by)
+    counts = {}
+    for column in facets.FACET_COLUMNS:
+        others = index.match({col: value for col, value in selected.items() if col != column}, within=within)
+        counts[column] = {None: facets.popcount(others), **index.counts(column, within=others)}
+    return counts
+
+def get_recent_additions(limit=10):
+    """Returns the `limit` most recently added tools, newest first."""
+    backend = get_backend()
+    if backend.supports_queries:
+        initialize_csv()
+        return _normalize_frame(backend.query(limit=limit), show_schema_info=False) # Walks the Date_Time index
+    return load_data().head(limit)
+
+def get_tool_by_serial(serial):
+    """Returns the tool (dict) with this Serial_Number, or None, without scanning the rows."""
+    try:
+        serial = int(serial)
+    except (TypeError, ValueError):
+        return None
+    backend = get_backend()
+    if backend.supports_queries:
+        initialize_csv()
+        return backend.find_by_serial(serial) # Serial_Number index
+    df = load_data()
+    if df.empty:
+        return None
+    row_id = indexes.get_index('serial', df, indexes.SerialIndex).lookup(serial)
+    return df.loc[row_id].to_dict() if row_id is not None else None
+
+def find_duplicate(name=None, link=None):
+    """Returns (column, tool) for an existing tool with the same Name or Link, or None.
+
+    Names are compared ignoring case and whitespace; links also ignore http/https, "www." and trailing slashes.
+    The normalized keys live in hash sets that are extended with just the new rows after each insert.
+    """
+    df = load_data()
+    if df.empty:
+        return None
+    index = indexes.get_index('duplicates', df, indexes.DuplicateKeyIndex)
+    for column, row_id in (('Name', index.find_name(name)), ('Link', index.find_link(link))):
+        if row_id is not None:
+            return column, df.loc[row_id].to_dict()
+    return None
+
+def find_near_duplicates(name=None, link=None, limit=5):
+    """Existing tools whose Name or Link domain is very similar to the given ones (typos, spacing, punctuation).
+
+    Returns up to `limit` dicts {'matched_on', 'similarity', 'tool'}, best first. Candidates come from a
+    MinHash-LSH index (see utils/near_duplicates), so a lookup doesn't scan the catalogue.
+    """
+    df = load_data()
+    if df.empty:
+        return []
+    index = indexes.get_index('near_duplicates', df, near_duplicates.NearDuplicateIndex)
+    return [
+        {'matched_on': column, 'similarity': score, 'tool': df.loc[row_id].to_dict()}
+        for row_id, column, score in index.find(name, link)[:limit]
+    ]
+
+def get_dedupe_report():
+    """All pairs of likely duplicate tools in the catalogue, most similar first (cached per dataset version)."""
+    return _dedupe_report_for_version(get_dataset_version())
+
+@data_cache(max_entries=1)
+def _dedupe_report_for_version(dataset_version):
+    columns = ["Similarity", "Matched_On", "Serial_A", "Name_A", "Link_A", "Serial_B", "Name_B", "Link_B"]
+    df = load_data()
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    pairs = indexes.get_index('near_duplicates', df, near_duplicates.NearDuplicateIndex).report()
+    report = pairs[["Similarity", "Matched_On"]].copy()
+    for side in ("A", "B"):
+        tools = df.loc[pairs[f"Row_{side}"], ["Serial_Number", "Name", "Link"]].reset_index(drop=True)
+        report[f"Serial_{side}"] = tools["Serial_Number"]
+        report[f"Name_{side}"] = tools["Name"]
+        report[f"Link_{side}"] = tools["Link"]
+    report["Similarity"] = report["Similarity"].round(3)
+    return report[columns]
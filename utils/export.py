@@ -0,0 +1,88 @@
+# utils/export.py
+# Download Data exports: the full dataset or a filtered dashboard view as gzip CSV, JSONL, Parquet or XLSX.
+# Rows are encoded EXPORT_CHUNK_ROWS at a time straight into the output buffer (no full-table copy or text
+# build-up), and the encoded bytes are cached per (dataset version, format, view), so re-downloading is free.
+import io
+import gzip
+import datetime
+import importlib.util
+import pandas as pd
+from utils import data_manager
+
+EXPORT_CHUNK_ROWS = 5000
+
+# format key -> (label, file extension, mime type)
+EXPORT_FORMATS = {
+    "csv.gz": ("CSV (gzip)", "csv.gz", "application/gzip"),
+    "jsonl": ("JSON Lines", "jsonl", "application/x-ndjson"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet"),
+    "xlsx": ("Excel (XLSX)", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+_FORMAT_REQUIREMENTS = {"parquet": "pyarrow", "xlsx": "openpyxl"} # Optional packages some formats need
+
+def available_formats():
+    """Format keys whose optional dependencies are installed."""
+    return [fmt for fmt in EXPORT_FORMATS
+            if fmt not in _FORMAT_REQUIREMENTS or importlib.util.find_spec(_FORMAT_REQUIREMENTS[fmt]) is not None]
+
+def export_file_name(fmt, view_name="all"):
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"ai_marketing_arsenal_{view_name}_{timestamp}.{EXPORT_FORMATS[fmt][1]}"
+
+def _chunks(df):
+    """Export-ready slices of df: EXPECTED_COLUMNS only, Date_Time as text, blanks instead of missing costs."""
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        yield data_manager._prepare_frame_for_storage(df.iloc[start:start + EXPORT_CHUNK_ROWS])
+
+def _write_csv_gz(df, sink):
+    # mtime=0 keeps the bytes identical for identical data
+    with gzip.GzipFile(fileobj=sink, mode="wb", mtime=0) as gz, io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+        if df.empty:
+            text.write(",".join(data_manager.EXPECTED_COLUMNS) + "\n")
+        for i, chunk in enumerate(_chunks(df)):
+            chunk.to_csv(text, index=False, header=(i == 0), lineterminator="\n")
+
+def _write_jsonl(df, sink):
+    for chunk in _chunks(df): # Every record, the last one of a chunk included, already ends with "\n"
+        sink.write(chunk.to_json(orient="records", lines=True, force_ascii=False).encode("utf-8"))
+
+def _write_parquet(df, sink):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    # Typed columns (Int32, dictionary-encoded categories, timestamps); one row group per chunk
+    typed = df.reindex(columns=data_manager.EXPECTED_COLUMNS)
+    schema = pa.Schema.from_pandas(typed.iloc[0:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for start in range(0, max(len(typed), 1), EXPORT_CHUNK_ROWS):
+            chunk = typed.iloc[start:start + EXPORT_CHUNK_ROWS]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+def _write_xlsx(df, sink):
+    with pd.ExcelWriter(sink, engine="openpyxl") as writer:
+        if df.empty:
+            pd.DataFrame(columns=data_manager.EXPECTED_COLUMNS).to_excel(writer, sheet_name="AI Tools", index=False)
+        row = 0
+        for chunk in _chunks(df):
+            chunk.to_excel(writer, sheet_name="AI Tools", index=False, header=(row == 0), startrow=row + (row > 0))
+            row += len(chunk)
+
+_WRITERS = {"csv.gz": _write_csv_gz, "jsonl": _write_jsonl, "parquet": _write_parquet, "xlsx": _write_xlsx}
+
+def encode(df, fmt):
+    """Encodes df in the given export format and returns the bytes."""
+    sink = io.BytesIO()
+    _WRITERS[fmt](df, sink)
+    return sink.getvalue()
+
+def get_export(fmt, filters=None):
+    """Bytes of the full dataset (filters=None) or of the dashboard view for `filters` (kwargs of
+    data_manager.filter_tools), cached per dataset version. Returns None if the format can't be produced."""
+    if fmt not in available_formats():
+        return None
+    filter_key = tuple(sorted((filters or {}).items()))
+    return _export_for_version(data_manager.get_dataset_version(), fmt, filter_key)
+
+@data_manager.data_cache(max_entries=8)
+def _export_for_version(dataset_version, fmt, filter_key):
+    df = data_manager.filter_tools(**dict(filter_key)) if filter_key else data_manager.load_data()
+    return encode(df, fmt)
@@ -0,0 +1,109 @@
+# utils/facets.py
+# Facet index for the dashboard filters: one bitset (row set) per Category, Pricing_Type and Uploaded_By value.
+#
+# Bit i of a row set is row id i (the frame index from data_manager.load_data). Row sets are packed uint8 arrays,
+# so combining filters is a bitwise AND and counting a facet value is a popcount, over n/8 bytes. Appended rows
+# just set their bits (see indexes.TableIndex); the arrays grow by doubling.
+import numpy as np
+import pandas as pd
+from utils import indexes
+
+FACET_COLUMNS = ["Category", "Pricing_Type", "Uploaded_By"]
+
+def facet_values(values):
+    """Facet keys of a column: text with surrounding whitespace stripped, '' for blanks (never listed)."""
+    # "string", not "str": on pandas < 3 astype("str") turns missing values into the text "nan"
+    return values.astype("string").fillna("").str.strip()
+
+if hasattr(np, "bitwise_count"): # numpy >= 2
+    def popcount(bits):
+        return int(np.bitwise_count(bits).sum())
+else:
+    def popcount(bits):
+        return int(np.unpackbits(bits).sum())
+
+def row_ids(bits, rows):
+    """Sorted row ids in a row set (rows = number of indexed rows)."""
+    return np.flatnonzero(row_mask(bits, rows))
+
+def row_mask(bits, rows):
+    """Row set as a boolean array indexed by row id."""
+    return np.unpackbits(bits, count=rows, bitorder="little").astype(bool)
+
+
+class FacetIndex(indexes.TableIndex):
+    """Bitset per facet value, for filters (intersections) and live counts (popcounts)."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = 0 # Row ids [0, rows) have been indexed
+        self.capacity = 0 # Bytes per bitset
+        self.sets = {column: {} for column in FACET_COLUMNS} # column -> {value: bitset}
+        self.all = np.zeros(0, dtype=np.uint8)
+
+    def _grow(self, rows):
+        needed = (rows + 7) // 8
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2, 64)
+        grow = lambda bits: np.concatenate((bits, np.zeros(capacity - len(bits), dtype=np.uint8)))
+        self.all = grow(self.all)
+        for value_sets in self.sets.values():
+            for value in value_sets:
+                value_sets[value] = grow(value_sets[value])
+        self.capacity = capacity
+
+    def add_rows(self, rows):
+        if rows.empty:
+            return
+        ids = rows.index.to_numpy(dtype=np.int64)
+        self.rows = max(self.rows, int(ids.max()) + 1)
+        self._grow(self.rows)
+        np.bitwise_or.at(self.all, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+        for column in FACET_COLUMNS:
+            if column not in rows.columns:
+                continue
+            codes, uniques = pd.factorize(facet_values(rows[column]))
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            value_sets = self.sets[column]
+            for code, value in enumerate(uniques.tolist()):
+                if not value:
+                    continue
+                value_ids = ids[order[bounds[code]:bounds[code + 1]]]
+                bits = value_sets.get(value)
+                if bits is None:
+                    bits = value_sets[value] = np.zeros(self.capacity, dtype=np.uint8)
+                np.bitwise_or.at(bits, value_ids >> 3, (1 << (value_ids & 7)).astype(np.uint8))
+
+    def copy(self):
+        # add_rows() sets bits in place
+        clone = super().copy()
+        clone.all = self.all.copy()
+        clone.sets = {column: {value: bits.copy() for value, bits in value_sets.items()}
+                      for column, value_sets in self.sets.items()}
+        return clone
+
+    def from_row_ids(self, ids):
+        """Row set holding the given row ids (e.g. search hits)."""
+        bits = np.zeros(self.capacity, dtype=np.uint8)
+        ids = np.asarray(ids, dtype=np.int64)
+        np.bitwise_or.at(bits, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+        return bits
+
+    def match(self, filters, within=None):
+        """Row set of the rows matching every {column: value} filter (None = any), inside `within` if given."""
+        bits = self.all if within is None else within
+        for column, value in filters.items():
+            if value is None:
+                continue
+            value_bits = self.sets[column].get(str(value).strip())
+            if value_bits is None:
+                return np.zeros(self.capacity, dtype=np.uint8)
+            bits = bits & value_bits
+        return bits
+
+    def counts(self, column, within=None):
+        """{value: number of rows in `within` (default: all) having it}, sorted by value; zero counts included."""
+        return {value: popcount(bits if within is None else bits & within)
+                for value, bits in sorted(self.sets[column].items())}
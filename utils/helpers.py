@@ -1,8 +1,8 @@
 # utils/helpers.py
-import streamlit as st
-import requests
-import json
 import re # For URL validation
+import numpy as np
+import pandas as pd
+from utils import lottie_store
 # from streamlit_lottie import st_lottie # Not directly used here, but in pages
 
 # --- Lottie Animation URLs (Keep your existing ones or update) ---
@@ -14,20 +14,15 @@ LOTTIE_SUCCESS_URL = "https://assets1.lottiefiles.com/packages/lf20_5tkzkblw.jso
 LOTTIE_NO_RESULTS_URL = "https://assets4.lottiefiles.com/packages/lf20_i8mmfrht.json"
 
 
-@st.cache_data # Cache the Lottie data
+LOTTIE_URLS = [LOTTIE_EMPTY_STATE_URL, LOTTIE_ADD_TOOL_URL, LOTTIE_LOADING_URL, LOTTIE_SUCCESS_URL, LOTTIE_NO_RESULTS_URL]
+
 def load_lottie_url(url: str):
-    """Fetches Lottie animation JSON from a URL."""
-    if not url: return None
-    try:
-        r = requests.get(url, timeout=10) # Added timeout
-        r.raise_for_status()
-        return r.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Lottie Error: Could not fetch animation from {url}. Details: {e}")
-        return None
-    except json.JSONDecodeError:
-        st.error(f"Lottie Error: Invalid JSON from {url}. Content: {r.text[:200]}...")
-        return None
+    """Returns the Lottie animation JSON for a URL from the local asset store (utils/lottie_store.py).
+
+    Never blocks on the network: if the animation isn't stored yet this returns None and it is fetched in
+    the background, so the page just renders without it this time.
+    """
+    return lottie_store.get(url)
 
 # display_lottie_animation can be in pages where st_lottie is called, or here if preferred.
 # For now, keeping it simple and assuming pages will call st_lottie directly.
@@ -55,20 +50,27 @@ UPLOADERS_LIST = [
     "Other" # Option to type if name not in list
 ]
 
+# Regex for validating URLs (simplified, focuses on http/https). Compiled once at import, shared by the form
+# and the vectorized bulk validation.
+URL_REGEX = re.compile(
+    r'^(?:http|ftp)s?://'  # http:// or https:// or ftp:// or ftps://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'  # ...or ipv4
+    r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'  # ...or ipv6
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Validation rules shared by validate_tool_inputs (form) and validate_tool_frame (bulk import)
+MIN_NAME_LENGTH = 2
+MIN_PURPOSE_LENGTH = 10
+PRICING_TYPES_WITH_COST = ["Paid", "Freemium", "Usage-based"]
+
 def is_valid_url(url_string: str) -> bool:
     """Checks if a string is a valid HTTP/HTTPS URL."""
     if not url_string:
         return False # Empty string is not a valid URL for this context
-    # Regex for validating URLs (simplified, focuses on http/https)
-    regex = re.compile(
-        r'^(?:http|ftp)s?://'  # http:// or https:// or ftp:// or ftps://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'  # ...or ipv4
-        r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'  # ...or ipv6
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return re.match(regex, url_string) is not None
+    return URL_REGEX.match(url_string) is not None
 
 def validate_tool_inputs(name, link, category, new_category_name, pricing_type, subscription_cost, uploaded_by, other_uploader_name, purpose):
     """Validates form inputs for adding a new tool. Returns a list of error messages."""
@@ -80,7 +82,7 @@ def validate_tool_inputs(name, link, category, new_category_name, pricing_type,
     new_category_name_clean = new_category_name.strip()
     other_uploader_name_clean = other_uploader_name.strip() if uploaded_by == "Other" else ""
 
-    if len(name_clean) < 2:
+    if len(name_clean) < MIN_NAME_LENGTH:
         errors.append("Tool Name must be at least 2 characters long.")
     
     if not link_clean:
@@ -95,7 +97,7 @@ def validate_tool_inputs(name, link, category, new_category_name, pricing_type,
     
     if pricing_type == "Select Pricing":
         errors.append("Please select a Pricing Type.")
-    elif pricing_type in ["Paid", "Freemium", "Usage-based"] and not subscription_cost.strip():
+    elif pricing_type in PRICING_TYPES_WITH_COST and not subscription_cost.strip():
         # "Contact for Pricing" might not have a cost input
         errors.append(f"Subscription Cost is required if Pricing Type is '{pricing_type}'.")
     
@@ -104,7 +106,7 @@ def validate_tool_inputs(name, link, category, new_category_name, pricing_type,
     elif uploaded_by == "Other" and len(other_uploader_name_clean) < 2:
         errors.append("If 'Other' uploader is selected, please enter your name (at least 2 characters).")
 
-    if len(purpose_clean) < 10: # Increased minimum length
+    if len(purpose_clean) < MIN_PURPOSE_LENGTH: # Increased minimum length
         errors.append("Purpose & Usage description must be at least 10 characters long.")
         
     # You might want to add duplicate checks here or handle them in the page logic before calling data_manager.add_entry
@@ -116,4 +118,32 @@ def validate_tool_inputs(name, link, category, new_category_name, pricing_type,
     # if link_clean and not df_current[df_current['Link'].str.lower() == link_clean.lower()].empty:
     #     errors.append(f"A tool with the link '{link_clean}' already exists.")
         
-    return errors
\ No newline at end of file
+    return errors
+
+def validate_tool_frame(df):
+    """Vectorized validate_tool_inputs for bulk imports: one list of error messages per row (index of df).
+
+    df holds the final values (Name, Link, Category, Pricing_Type, Subscription_Cost, Uploaded_By, Purpose);
+    there are no "Other" placeholders in a file, so category and uploader just have to be filled in.
+    """
+    text = {col: df[col].astype("string").fillna("").str.strip() for col in
+            ["Name", "Link", "Category", "Pricing_Type", "Subscription_Cost", "Uploaded_By", "Purpose"]}
+    valid_pricing = [p for p in PRICING_TYPES if p != "Select Pricing"]
+    rules = [
+        (text["Name"].str.len() < MIN_NAME_LENGTH, "Tool Name must be at least 2 characters long."),
+        (text["Link"] == "", "Tool Link is required."),
+        ((text["Link"] != "") & ~text["Link"].str.match(URL_REGEX).fillna(False).astype(bool),
+         "Please enter a valid Tool Link (e.g., http://example.com)."),
+        (text["Category"].str.len() < 2, "Category must be at least 2 characters."),
+        (~text["Pricing_Type"].isin(valid_pricing), f"Pricing Type must be one of: {', '.join(valid_pricing)}."),
+        (text["Pricing_Type"].isin(PRICING_TYPES_WITH_COST) & (text["Subscription_Cost"] == ""),
+         "Subscription Cost is required for Paid, Freemium and Usage-based tools."),
+        (text["Uploaded_By"].str.len() < 2, "Uploaded By must be at least 2 characters."),
+        (text["Purpose"].str.len() < MIN_PURPOSE_LENGTH, "Purpose & Usage description must be at least 10 characters long."),
+    ]
+    errors = [[] for _ in range(len(df))]
+    for failed, message in rules:
+        for position in np.flatnonzero(failed.to_numpy(dtype=bool)):
+            errors[position].append(message)
+    return pd.Series(errors, index=df.index, dtype=object)
+
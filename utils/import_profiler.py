@@ -0,0 +1,97 @@
+# utils/import_profiler.py
+# APP_PROFILE_IMPORTS=1: per-module import timings, like `python -X importtime`, for the imports the app triggers
+# itself (cold start and the first visit of each page, now that pages import their heavy dependencies lazily).
+#
+# install() puts a finder in front of sys.meta_path that wraps every module's loader with a timer. Each import is
+# written to stderr in the -X importtime format ("import time: self [us] | cumulative | module", nested imports
+# indented) and kept for take_new_timings(), which main.py uses to log what each rerun imported against a budget.
+# Stdlib only, so installing it doesn't itself import anything heavy.
+import os
+import sys
+import time
+import threading
+import importlib.abc
+
+ENABLED = os.environ.get("APP_PROFILE_IMPORTS", "0") not in ("", "0")
+# A rerun whose new imports take longer than this is logged as a warning (catches import-time regressions).
+# pandas + numpy + pyarrow alone are ~600 ms on a cold start; the dashboard's first run currently needs ~1 s.
+IMPORT_BUDGET_MS = float(os.environ.get("APP_IMPORT_BUDGET_MS", "1200"))
+
+_timings = [] # (module, self seconds, cumulative seconds, depth) in completion order
+_reported = 0 # Entries of _timings already returned by take_new_timings()
+_timings_guard = threading.Lock()
+_local = threading.local() # Per-thread stack of imports in progress
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Wraps a loader and times module creation + execution (which includes any nested imports)."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name): # get_data, is_package, get_resource_reader, ... go to the real loader
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # The clock starts here: extension modules do their work in create_module rather than exec_module
+        stack = _local.__dict__.setdefault("stack", [])
+        stack.append([spec.name, 0.0, time.perf_counter()]) # module, children's cumulative time, start
+        create = getattr(self._loader, "create_module", None)
+        try:
+            return create(spec) if create is not None else None
+        except BaseException:
+            stack.pop()
+            raise
+
+    def exec_module(self, module):
+        stack = _local.__dict__.setdefault("stack", [])
+        if not stack or stack[-1][0] != module.__name__: # e.g. importlib.reload(), which skips create_module
+            stack.append([module.__name__, 0.0, time.perf_counter()])
+        try:
+            return self._loader.exec_module(module)
+        finally:
+            name, children, started = stack.pop()
+            cumulative = time.perf_counter() - started
+            if stack:
+                stack[-1][1] += cumulative
+            _record(name, cumulative - children, cumulative, len(stack))
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Delegates to the other finders and wraps the loader of whatever spec they return."""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and not isinstance(spec.loader, _TimingLoader) and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader)
+                return spec
+        return None
+
+
+def _record(name, self_seconds, cumulative_seconds, depth):
+    with _timings_guard:
+        _timings.append((name, self_seconds, cumulative_seconds, depth))
+    sys.stderr.write(f"import time: {self_seconds * 1e6:9.0f} | {cumulative_seconds * 1e6:10.0f} | {'  ' * depth}{name}\n")
+
+def install():
+    """Starts timing imports (idempotent). Call before importing what should be measured."""
+    if not any(isinstance(finder, _TimingFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _TimingFinder())
+        sys.stderr.write("import time: self [us] | cumulative | imported package\n")
+
+def take_new_timings():
+    """Top-level imports (depth 0) completed since the last call, as (module, self s, cumulative s), slowest first."""
+    global _reported
+    with _timings_guard:
+        new, _reported = _timings[_reported:], len(_timings)
+    return sorted(((name, self_s, cumulative_s) for name, self_s, cumulative_s, depth in new if depth == 0),
+                  key=lambda row: -row[2])
+
+def get_import_timings():
+    """Every recorded import: [(module, self seconds, cumulative seconds, depth)] in completion order."""
+    with _timings_guard:
+        return list(_timings)
@@ -0,0 +1,143 @@
+# utils/indexes.py
+# In-memory lookup structures over the loaded tools frame, kept up to date incrementally as rows are appended.
+#
+# Frames from data_manager.load_data() carry stable row ids (the DataFrame index = position in the file, in
+# insertion order) and a "lineage" token in df.attrs. Frames of the same lineage only ever grow by appended rows,
+# so an index built for one of them is extended with just the new row ids instead of being rebuilt. Extending works
+# on a copy: an index handed out is never modified, so a session still holding an older frame keeps an index that
+# matches it (no row ids past its end, bitsets of the same length).
+import re
+import copy
+import threading
+import pandas as pd
+
+_indexes = {} # name -> TableIndex
+_indexes_lock = threading.RLock()
+
+
+class TableIndex:
+    """Base class for an index over the tools frame. Subclasses implement add_rows()."""
+
+    def __init__(self):
+        self.lineage = None
+        self.rows_indexed = 0 # Row ids [0, rows_indexed) are in the index
+
+    def add_rows(self, rows: pd.DataFrame):
+        """Adds rows (a slice of the tools frame; its index holds the row ids) to the index."""
+        raise NotImplementedError
+
+    def copy(self):
+        """A copy that add_rows() can extend without changing this index. Subclasses copy whatever add_rows()
+        modifies in place (attributes it only reassigns can be shared)."""
+        return copy.copy(self)
+
+
+def get_index(name: str, df: pd.DataFrame, factory):
+    """Returns index `name` brought up to date with df (a full frame from load_data).
+
+    Built with factory() the first time, or whenever df isn't a grown version of what was indexed last. The
+    returned index is never modified afterwards, so it can be used without holding any lock.
+    """
+    lineage = df.attrs.get('lineage')
+    with _indexes_lock:
+        index = _indexes.get(name)
+        if index is not None and index.lineage == lineage and lineage is not None and len(df) < index.rows_indexed:
+            return _build(factory, df, lineage) # An older frame than the shared index: keep that one for newer frames
+        if index is None or lineage is None or index.lineage != lineage:
+            index = _indexes[name] = _build(factory, df, lineage)
+        elif len(df) > index.rows_indexed:
+            index = index.copy()
+            index.add_rows(df[df.index >= index.rows_indexed]) # Only the appended rows
+            index.rows_indexed = len(df)
+            _indexes[name] = index
+        return index
+
+def _build(factory, df, lineage):
+    index = factory()
+    index.lineage = lineage
+    index.add_rows(df)
+    index.rows_indexed = len(df)
+    return index
+
+def drop_indexes():
+    """Forgets every index (they are rebuilt on next use)."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+class SerialIndex(TableIndex):
+    """Serial_Number -> row id (primary-key lookups). If a number was ever duplicated, the earliest row wins."""
+
+    def __init__(self):
+        super().__init__()
+        self.row_ids = {}
+
+    def add_rows(self, rows):
+        serials = rows['Serial_Number'].dropna().astype('int64').sort_index()
+        serials = serials[~serials.duplicated(keep='first')]
+        for serial, row_id in zip(serials.tolist(), serials.index.tolist()):
+            self.row_ids.setdefault(serial, row_id) # Appended rows never displace older ones
+
+    def copy(self):
+        clone = super().copy()
+        clone.row_ids = dict(self.row_ids)
+        return clone
+
+    def lookup(self, serial):
+        return self.row_ids.get(int(serial))
+
+
+# --- Duplicate detection keys ---
+# Two tools are the same if their names match ignoring case/whitespace, or their links match ignoring case,
+# the http/https scheme, a leading "www." and trailing slashes.
+_WHITESPACE_RE = re.compile(r"\s+")
+_LINK_PREFIX_RE = re.compile(r"^(?:https?://)?(?:www\.)?", re.IGNORECASE)
+
+def name_key(value):
+    """Normalized Name used for duplicate checks ('' for blanks)."""
+    if value is None or pd.isna(value):
+        return ""
+    return _WHITESPACE_RE.sub(" ", str(value).strip()).casefold()
+
+def link_key(value):
+    """Normalized Link used for duplicate checks ('' for blanks)."""
+    if value is None or pd.isna(value):
+        return ""
+    return _LINK_PREFIX_RE.sub("", str(value).strip().lower()).rstrip("/")
+
+def name_keys(values: pd.Series) -> pd.Series:
+    """Vectorized name_key() (<NA> stays <NA>)."""
+    return values.astype("string").str.strip().str.replace(_WHITESPACE_RE, " ", regex=True).str.casefold()
+
+def link_keys(values: pd.Series) -> pd.Series:
+    """Vectorized link_key() (<NA> stays <NA>)."""
+    return values.astype("string").str.strip().str.lower().str.replace(_LINK_PREFIX_RE, "", regex=True).str.rstrip("/")
+
+
+class DuplicateKeyIndex(TableIndex):
+    """Hash sets (dicts to the row id) of normalized Name and Link keys, for O(1) duplicate checks."""
+
+    def __init__(self):
+        super().__init__()
+        self.names = {}
+        self.links = {}
+
+    def add_rows(self, rows):
+        rows = rows.sort_index() # Earliest row wins if the data already holds duplicates
+        for keys, target in ((name_keys(rows['Name']), self.names), (link_keys(rows['Link']), self.links)):
+            keys = keys[keys.notna() & (keys != "")]
+            for key, row_id in zip(keys.tolist(), keys.index.tolist()):
+                target.setdefault(key, row_id)
+
+    def copy(self):
+        clone = super().copy()
+        clone.names, clone.links = dict(self.names), dict(self.links)
+        return clone
+
+    def find_name(self, name):
+        key = name_key(name)
+        return self.names.get(key) if key else None
+
+    def find_link(self, link):
+        key = link_key(link)
+        return self.links.get(key) if key else None
@@ -0,0 +1,279 @@
+# utils/load_test.py
+# Load test: N simulated marketers using main.py at the same time, through streamlit.testing.v1.AppTest (no browser,
+# no network), to find how many concurrent sessions one server process handles before rerun latency degrades.
+#
+# Usage (from the project root):
+#   python -m utils.load_test [--sessions 1 4 8 16] [--actions 30] [--tools 10000] [--p95-budget-ms 1000]
+#                             [--output load_test_results.json]
+# Each level of --sessions runs that many sessions concurrently, one thread each (like the server's script threads),
+# against a fresh synthetic catalogue in a temporary directory (see utils/benchmark_suite.py). Every session opens
+# the app and then does --actions random actions: dashboard searches, filter changes, Add Tool submissions and
+# downloads. Reported per level: p50/p95/p99 rerun latency (overall and per action), reruns/sec, write throughput
+# (tools committed and disk commits per second), lost writes (acknowledged submissions missing from storage once
+# the write queue has drained), errors and memory per session (RSS growth / sessions; a rough figure, as later
+# levels reuse memory the allocator kept from earlier ones).
+import os
+import gc
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import resource
+import threading
+import contextlib
+from unittest import mock
+import numpy as np
+import streamlit as st
+import streamlit_option_menu
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.util import patch_config_options
+from streamlit.runtime import Runtime
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+import streamlit.logger
+streamlit.logger.set_log_level("error") # Headless: no "missing ScriptRunContext" / deprecation noise per rerun
+from utils import data_manager, helpers, lottie_store, write_queue, benchmark_suite
+
+APP_SCRIPT = "main.py"
+ROUTE_STATE_KEY = "_load_test_route" # Session state key the patched navbar reads the page from
+DASHBOARD, ADD_TOOL, DOWNLOAD = "🛡️ Dashboard", "➕ Add Tool", "📥 Download Data"
+ACTION_WEIGHTS = {"search": 40, "filter": 30, "add": 15, "download": 15}
+SEARCH_TERMS = ["email", "social", "video", "copy", "seo", "analy", "marketing ema", "images", "brand", "leads"]
+RUN_TIMEOUT_SECONDS = 120
+
+def _routed_option_menu(menu_title=None, options=(), default_index=0, **kwargs):
+    """Stands in for the streamlit-option-menu navbar (a browser component AppTest can't click)."""
+    return st.session_state.get(ROUTE_STATE_KEY, options[default_index])
+
+@contextlib.contextmanager
+def _shared_runtime():
+    """Lets AppTest instances run concurrently in one process.
+
+    AppTest.run() normally installs a fresh mock Runtime (and a fresh script cache) as a process-wide singleton
+    and clears it when the run ends, so overlapping runs break each other. Here every session shares one mock
+    runtime and one bytecode cache for the whole test, which is also how a real server runs its sessions.
+    """
+    class _PerRunRuntime: # AppTest sets/clears its per-run mock on this instead of on the real Runtime
+        _instance = None
+    shared = mock.MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.dataframe_source_mgr = DataframeSourceManager()
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    script_cache = ScriptCache()
+    with patch_config_options({"global.appTest": True}), \
+            mock.patch.object(app_test, "Runtime", _PerRunRuntime), \
+            mock.patch.object(app_test, "ScriptCache", lambda: script_cache), \
+            mock.patch.object(app_test, "patch_config_options", lambda options: contextlib.nullcontext()), \
+            mock.patch.object(Runtime, "_instance", shared), \
+            mock.patch.object(streamlit_option_menu, "option_menu", _routed_option_menu), \
+            mock.patch.object(lottie_store, "FETCH_ENABLED", False): # No network
+        yield
+
+def _rss_bytes():
+    """Current resident set size (Linux), else the peak one."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class SimulatedSession:
+    """One marketer: an AppTest of main.py plus the latency of every rerun it triggered."""
+
+    def __init__(self, number, seed, categories):
+        self.number = number
+        self.rng = random.Random(seed * 1000 + number)
+        self.categories = categories
+        self.app = AppTest.from_file(os.path.abspath(APP_SCRIPT), default_timeout=RUN_TIMEOUT_SECONDS)
+        self.latencies = [] # (action, seconds)
+        self.errors = []
+        self.acknowledged = [] # Names of submissions the form reported as added or queued
+        self.rejected = 0
+
+    def _run(self, action):
+        started = time.perf_counter()
+        self.app.run()
+        self.latencies.append((action, time.perf_counter() - started))
+        if self.app.exception:
+            self.errors.append(f"{action}: {self.app.exception[0].value}")
+
+    def _go_to(self, page):
+        if self.app.session_state[ROUTE_STATE_KEY] != page:
+            self.app.session_state[ROUTE_STATE_KEY] = page
+            self._run("navigate")
+
+    def open(self):
+        self.app.session_state[ROUTE_STATE_KEY] = DASHBOARD
+        self._run("open")
+
+    def search(self):
+        self._go_to(DASHBOARD)
+        self.app.text_input(key="dashboard_search_input").set_value(self.rng.choice(SEARCH_TERMS + [""]))
+        self._run("search")
+
+    def filter(self):
+        self._go_to(DASHBOARD)
+        self.app.selectbox(key="dashboard_cat_select").set_value(self.rng.choice(self.categories + [None]))
+        self._run("filter")
+
+    def add(self):
+        self._go_to(ADD_TOOL)
+        token = f"{self.number}-{self.rng.getrandbits(48):012x}"
+        name = f"Load Test Tool {token}"
+        self.app.text_input[0].set_value(name)
+        self.app.text_input[1].set_value(f"https://load-{token}.ai")
+        self.app.selectbox[0].set_value(self.app.selectbox[0].options[1])
+        self.app.selectbox[1].set_value("Free")
+        self.app.selectbox[2].set_value(self.app.selectbox[2].options[1])
+        self.app.text_area[0].set_value("Synthetic submission from the load test harness.")
+        self.app.button[0].click()
+        self._run("add")
+        messages = [element.value for element in list(self.app.success) + list(self.app.info)]
+        if any(name in message for message in messages):
+            self.acknowledged.append(name)
+        else:
+            self.rejected += 1
+
+    def download(self):
+        self._go_to(DOWNLOAD)
+        self._run("download")
+
+    def play(self, actions, think_seconds):
+        self.open()
+        names, weights = list(ACTION_WEIGHTS), list(ACTION_WEIGHTS.values())
+        for _ in range(actions):
+            getattr(self, self.rng.choices(names, weights)[0])()
+            if think_seconds:
+                time.sleep(self.rng.uniform(0, 2 * think_seconds))
+
+
+def _percentiles_ms(seconds):
+    if not seconds:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+    p50, p95, p99 = np.percentile(np.array(seconds) * 1000, [50, 95, 99])
+    return {"count": len(seconds), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+def run_level(session_count, args, work_dir):
+    """Runs session_count concurrent sessions on a fresh catalogue and returns the level's report."""
+    benchmark_suite.use_data_dir(work_dir, args.backend).replace_all(
+        data_manager._prepare_frame_for_storage(benchmark_suite.synthetic_catalogue(args.tools, seed=args.seed)))
+    categories = list(helpers.PREDEFINED_CATEGORIES)
+    SimulatedSession(-1, args.seed, categories).open() # Warm-up (cold load, indexes): not measured
+    queue_before = write_queue.get_queue_stats()
+    gc.collect()
+    rss_before = _rss_bytes()
+
+    sessions = [SimulatedSession(number, args.seed, categories) for number in range(session_count)]
+    crashed = []
+    def play(session):
+        try:
+            session.play(args.actions, args.think_time)
+        except Exception as e: # A broken session shouldn't stop the others
+            crashed.append(f"session {session.number}: {e!r}")
+    threads = [threading.Thread(target=play, args=(session,), name=f"load-session-{session.number}") for session in sessions]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    write_queue.flush(RUN_TIMEOUT_SECONDS)
+    wall_seconds = time.perf_counter() - started
+    gc.collect()
+    rss_after = _rss_bytes()
+
+    # Lost writes: acknowledged by the form but not in storage after the queue drained
+    data_manager.invalidate_data_caches()
+    stored_names = set(data_manager.load_data()['Name'].astype(str))
+    acknowledged = [name for session in sessions for name in session.acknowledged]
+    lost = [name for name in acknowledged if name not in stored_names]
+    queue_after = write_queue.get_queue_stats()
+    committed = queue_after["committed"] - queue_before["committed"]
+    disk_commits = queue_after["batches"] - queue_before["batches"]
+
+    latencies = [latency for session in sessions for latency in session.latencies]
+    by_action = {}
+    for action, seconds in latencies:
+        by_action.setdefault(action, []).append(seconds)
+    report = {
+        "sessions": session_count,
+        "wall_seconds": wall_seconds,
+        "reruns": len(latencies),
+        "reruns_per_second": len(latencies) / wall_seconds if wall_seconds else None,
+        "latency": _percentiles_ms([seconds for _, seconds in latencies]),
+        "latency_by_action": {action: _percentiles_ms(seconds) for action, seconds in sorted(by_action.items())},
+        "submissions_acknowledged": len(acknowledged),
+        "submissions_rejected": sum(session.rejected for session in sessions),
+        "tools_committed": committed,
+        "disk_commits": disk_commits,
+        "writes_per_second": committed / wall_seconds if wall_seconds else None,
+        "lost_writes": len(lost),
+        "errors": [error for session in sessions for error in session.errors] + crashed,
+        "memory_per_session_mb": max(0, rss_after - rss_before) / session_count / 2**20,
+        "rss_mb": rss_after / 2**20,
+    }
+    del sessions
+    return report
+
+def _print_level(report):
+    latency = report["latency"]
+    print(f"{report['sessions']:>8} {report['reruns']:>7} {latency['p50_ms'] or 0:>8.0f} {latency['p95_ms'] or 0:>8.0f} "
+          f"{latency['p99_ms'] or 0:>8.0f} {report['reruns_per_second'] or 0:>9.1f} {report['tools_committed']:>7} "
+          f"{report['disk_commits']:>7} {report['writes_per_second'] or 0:>8.2f} {report['lost_writes']:>5} "
+          f"{len(report['errors']):>6} {report['memory_per_session_mb']:>10.1f}", flush=True)
+    for error in report["errors"][:3]:
+        print(f"         ! {error}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of main.py through Streamlit AppTest.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8, 16], help="Concurrent sessions per level.")
+    parser.add_argument("--actions", type=int, default=30, help="Random actions per session (after opening the app).")
+    parser.add_argument("--tools", type=int, default=10000, help="Synthetic catalogue size.")
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite"])
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between a session's actions, seconds.")
+    parser.add_argument("--p95-budget-ms", type=float, default=1000.0, help="p95 rerun latency still considered OK.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Save the per-level reports as JSON.")
+    args = parser.parse_args(argv)
+    if not os.path.exists(APP_SCRIPT):
+        print(f"Run from the project root ({APP_SCRIPT} not found).", file=sys.stderr)
+        return 2
+
+    reports = []
+    work_root = tempfile.mkdtemp(prefix="arsenal-load-")
+    print(f"{args.tools} tools on {args.backend}, {args.actions} actions per session"
+          f"{f', think time {args.think_time}s' if args.think_time else ''}")
+    print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'reruns/s':>9} {'added':>7} "
+          f"{'commits':>7} {'adds/s':>8} {'lost':>5} {'errors':>6} {'MB/session':>10}")
+    try:
+        with _shared_runtime():
+            for session_count in args.sessions:
+                work_dir = os.path.join(work_root, f"{session_count}-sessions")
+                os.makedirs(work_dir)
+                report = run_level(session_count, args, work_dir)
+                reports.append(report)
+                _print_level(report)
+    finally:
+        benchmark_suite.reset_caches()
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    within_budget = [r["sessions"] for r in reports if r["latency"]["p95_ms"] is not None and r["latency"]["p95_ms"] <= args.p95_budget_ms]
+    if within_budget:
+        print(f"\nUp to {max(within_budget)} concurrent sessions stay within the p95 budget of {args.p95_budget_ms:.0f} ms.")
+    else:
+        print(f"\nNo level stayed within the p95 budget of {args.p95_budget_ms:.0f} ms.")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"tools": args.tools, "backend": args.backend, "actions": args.actions, "levels": reports}, f, indent=2)
+        print(f"Saved to {args.output}")
+    lost = sum(r["lost_writes"] for r in reports)
+    return 1 if lost or any(r["errors"] for r in reports) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
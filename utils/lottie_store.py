@@ -0,0 +1,176 @@
+# utils/lottie_store.py
+# Offline store for the Lottie animations. Animations are kept as content-addressed files
+# (<sha256 of the JSON bytes>.json) plus manifest.json mapping each source URL to its hash, in two places:
+# assets/lottie/ is bundled with the app (read-only at runtime) and .cache/lottie/ (untracked) holds whatever the
+# running app fetched itself. get() never touches the network: an animation that is in neither is served from
+# assets/lottie/fallback/ (small stand-ins made for this app, same layout) right away and fetched into the cache in
+# the background with a pooled requests session, so the real one shows up on a later rerun. Set APP_LOTTIE_FETCH=0
+# on hosts without internet access to skip fetching entirely.
+#
+# Fill the bundled store ahead of time (e.g. when building the image), from the project root:
+#   python -m utils.lottie_store
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils import storage, perf
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = os.environ.get("APP_LOTTIE_STORE_DIR", os.path.join("assets", "lottie"))
+CACHE_DIR = os.environ.get("APP_LOTTIE_CACHE_DIR", os.path.join(".cache", "lottie"))
+FALLBACK_DIR = os.path.join("assets", "lottie", "fallback")
+MANIFEST_NAME = "manifest.json"
+FETCH_ENABLED = os.environ.get("APP_LOTTIE_FETCH", "1") != "0"
+FETCH_TIMEOUT_SECONDS = 10
+FETCH_WORKERS = 2
+RETRY_AFTER_SECONDS = 300 # Don't hit a failing URL again for this long
+
+_animations = {} # url -> parsed animation (process-wide, read from disk once)
+_fallbacks = {} # url -> parsed stand-in, served until the real animation is stored
+_manifests = {} # store directory -> {url: sha256}, loaded lazily
+_pending = set() # URLs being fetched right now
+_failed_at = {} # url -> time.monotonic() of the last failed fetch
+_store_lock = threading.Lock()
+_executor = None
+_session = None
+
+def _blob_path(store_dir, digest):
+    return os.path.join(store_dir, f"{digest}.json")
+
+def _load_manifest(store_dir):
+    """url -> sha256 for the animations in store_dir. Call with _store_lock held."""
+    if store_dir not in _manifests:
+        try:
+            with open(os.path.join(store_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                _manifests[store_dir] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _manifests[store_dir] = {}
+    return _manifests[store_dir]
+
+def _read_from(store_dir, url):
+    """The animation for url stored in store_dir, or None. Call with _store_lock held."""
+    digest = _load_manifest(store_dir).get(url)
+    if not digest:
+        return None
+    try:
+        with open(_blob_path(store_dir, digest), "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+    if hashlib.sha256(raw).hexdigest() != digest: # Corrupt or hand-edited: fetch it again
+        logger.warning("Lottie asset for %s in %s doesn't match its hash; ignoring it", url, store_dir)
+        return None
+    return json.loads(raw)
+
+def _read_stored(url):
+    """The animation for url from the bundled store, else the runtime cache, or None. Call with _store_lock held."""
+    animation = _read_from(STORE_DIR, url)
+    return animation if animation is not None else _read_from(CACHE_DIR, url)
+
+def _store(url, raw, store_dir):
+    """Writes raw animation bytes under their hash in store_dir and records url in its manifest. Returns the parsed
+    animation."""
+    animation = json.loads(raw) # Refuse to store anything that isn't JSON
+    digest = hashlib.sha256(raw).hexdigest()
+    storage.atomic_write(_blob_path(store_dir, digest), lambda f: f.write(raw), mode="wb")
+    with _store_lock:
+        manifest = dict(_load_manifest(store_dir))
+        manifest[url] = digest
+        storage.atomic_write(os.path.join(store_dir, MANIFEST_NAME),
+                             lambda f: json.dump(manifest, f, indent=2, sort_keys=True))
+        _manifests[store_dir] = manifest
+        _animations[url] = animation
+    return animation
+
+def _get_session():
+    global _session
+    if _session is None:
+        import requests # Only needed once something is actually fetched (~60 ms to import)
+        _session = requests.Session() # Keeps connections to lottie.host / lottiefiles open between fetches
+    return _session
+
+def fetch(url, store_dir=None):
+    """Downloads url into store_dir (default: the runtime cache; blocking). Returns the animation, or None if it
+    couldn't be fetched."""
+    import requests
+    try:
+        response = _get_session().get(url, timeout=FETCH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        animation = _store(url, response.content, store_dir or CACHE_DIR)
+        logger.info("Stored Lottie animation %s (%d bytes)", url, len(response.content))
+        return animation
+    except (requests.exceptions.RequestException, ValueError, OSError) as e:
+        with _store_lock:
+            _failed_at[url] = time.monotonic()
+        logger.warning("Could not fetch Lottie animation %s: %s", url, e)
+        return None
+    finally:
+        with _store_lock:
+            _pending.discard(url)
+
+def _schedule_fetch(url):
+    """Queues a background fetch of url unless one is running or it failed recently. Call with _store_lock held."""
+    global _executor
+    if not FETCH_ENABLED or url in _pending:
+        return
+    failed_at = _failed_at.get(url)
+    if failed_at is not None and time.monotonic() - failed_at < RETRY_AFTER_SECONDS:
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="lottie-fetch")
+    _pending.add(url)
+    _executor.submit(fetch, url)
+
+def _read_fallback(url):
+    """The bundled stand-in for url, or None. Call with _store_lock held."""
+    if url not in _fallbacks:
+        _fallbacks[url] = _read_from(FALLBACK_DIR, url)
+    return _fallbacks[url]
+
+def get(url):
+    """The animation for url from the bundled store or the runtime cache. If it is in neither, it is fetched into the
+    cache in the background for later reruns and its stand-in (or None) is returned right away."""
+    if not url:
+        return None
+    with _store_lock:
+        animation = _animations.get(url)
+        stored = animation is not None
+        if not stored:
+            animation = _read_stored(url)
+            stored = animation is not None
+            if stored:
+                _animations[url] = animation
+            else:
+                _schedule_fetch(url)
+                animation = _read_fallback(url)
+    perf.record_cache("lottie", hits=int(stored), misses=int(not stored))
+    return animation
+
+def prefetch(urls):
+    """Starts background fetches for every url not stored yet (cheap to call on every run)."""
+    for url in urls:
+        get(url)
+
+def main():
+    """Fills the bundled store (assets/lottie/) with every animation the app uses."""
+    from utils import helpers
+    missing = 0
+    for url in helpers.LOTTIE_URLS:
+        with _store_lock:
+            stored = _read_from(STORE_DIR, url) is not None
+        if stored:
+            print(f"stored   {url}")
+        elif fetch(url, STORE_DIR) is not None:
+            print(f"fetched  {url}")
+        else:
+            print(f"MISSING  {url}")
+            missing += 1
+    return 1 if missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# utils/migrate_csv_to_sqlite.py
+# One-shot migration of the CSV database into the SQLite backend.
+#
+# Usage (from the project root):
+#   python -m utils.migrate_csv_to_sqlite [--csv ai_tools_database.csv] [--db ai_tools_database.sqlite3] [--overwrite]
+# Then start the app with APP_STORAGE_BACKEND=sqlite (and APP_SQLITE_PATH if you changed --db).
+import argparse
+import sys
+from utils import data_manager, storage
+
+MAX_LISTED_PROBLEMS = 20
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy every tool from the CSV database into a SQLite database.")
+    parser.add_argument("--csv", default=data_manager.CSV_FILE_PATH, help="Source CSV file.")
+    parser.add_argument("--db", default=data_manager.SQLITE_DB_PATH, help="Target SQLite database file.")
+    parser.add_argument("--overwrite", action="store_true", help="Replace rows already present in the target database.")
+    args = parser.parse_args(argv)
+
+    try:
+        copied, invalid_serials = storage.migrate_csv_to_sqlite(
+            args.csv, args.db, data_manager.EXPECTED_COLUMNS, data_manager.DATE_TIME_FORMAT, overwrite=args.overwrite
+        )
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Migration failed: {e}", file=sys.stderr)
+        return 1
+    for row, value in invalid_serials[:MAX_LISTED_PROBLEMS]:
+        print(f"Row {row}: Serial_Number '{value}' is not a whole number; copied with an empty Serial_Number.", file=sys.stderr)
+    if len(invalid_serials) > MAX_LISTED_PROBLEMS:
+        print(f"... and {len(invalid_serials) - MAX_LISTED_PROBLEMS} more rows with an invalid Serial_Number.", file=sys.stderr)
+    print(f"Migrated {copied} tools from '{args.csv}' to '{args.db}'.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
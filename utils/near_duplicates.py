@@ -0,0 +1,300 @@
+# utils/near_duplicates.py
+# Near-duplicate detection for tool Names and Link domains (typos like "ChatGTP" vs "ChatGPT") with MinHash-LSH.
+#
+# Every normalized string is cut into character n-grams. A MinHash signature of NUM_PERM values estimates the
+# Jaccard similarity of two n-gram sets, and splitting it into BANDS bands puts similar strings into at least one
+# shared bucket with high probability. A lookup only looks at its bucket-mates (so its cost doesn't grow with the
+# catalogue) and those candidates are then verified with an exact similarity score.
+#
+# One typo in a short name changes a large share of its n-grams, so MinHash alone misses some of them. Every string
+# is therefore also stored under exact "edit keys" (itself and each variant with one character deleted): two strings
+# one insert, delete, replace or swap of neighbouring letters apart always share one, whatever their n-grams.
+import re
+import copy
+import itertools
+import difflib
+import numpy as np
+import pandas as pd
+from utils import indexes
+
+NGRAM = 3 # Bytes per n-gram (at most 8)
+BANDS = 24
+ROWS_PER_BAND = 3 # Pairs with n-gram Jaccard 0.4 share a bucket ~80% of the time, 0.5+ ~96%
+NUM_PERM = BANDS * ROWS_PER_BAND
+MIN_SIMILARITY = 0.85 # Verified similarity (difflib ratio, 0-1) needed to call two tools near-duplicates
+MIN_ESTIMATED_JACCARD = 0.3 # Candidates below this signature-estimated n-gram overlap are dropped unverified
+MAX_QUERY_CANDIDATES = 20 # Verified per lookup, best estimates first
+MAX_BUCKET = 100 # Lookups and the batch report skip buckets bigger than this (very common n-grams, not duplicates)
+
+_rng = np.random.default_rng(20240601) # Fixed seed: signatures must be comparable across processes
+_HASH_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1) # Multiply-shift hash family
+_HASH_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_BAND_MIX = np.uint64(0x100000001B3)
+_BAND_SHIFT = np.uint64(59) # Top bits of a bucket key hold the band number (BANDS <= 32)
+_SIGNATURE_CHUNK = 20000 # Strings per vectorized signature block (bounds the temporary n-gram x NUM_PERM matrix)
+
+_DOMAIN_TAIL_RE = re.compile(r"(?:\.[a-z0-9-]+)?(?:[/?#:].*)?$") # TLD, then port, path, query or fragment
+
+def domain_key(link):
+    """Host part of a link without its TLD, normalized like indexes.link_key() ("openai.com" -> "openai")."""
+    return _DOMAIN_TAIL_RE.sub("", indexes.link_key(link), count=1)
+
+def domain_keys(values: pd.Series) -> pd.Series:
+    """Vectorized domain_key()."""
+    return indexes.link_keys(values).str.replace(_DOMAIN_TAIL_RE, "", n=1, regex=True)
+
+_CHAR_BIN_CHARS = b"abcdefghijklmnopqrstuvwxyz0123456789"
+_CHAR_BINS = len(_CHAR_BIN_CHARS) + 1 # Any other byte shares the last bin (only loosens the bound)
+_CHAR_BIN_OF_BYTE = np.full(256, _CHAR_BINS - 1, dtype=np.int64)
+_CHAR_BIN_OF_BYTE[np.frombuffer(_CHAR_BIN_CHARS, dtype=np.uint8)] = np.arange(len(_CHAR_BIN_CHARS))
+
+def char_counts(texts):
+    """Per-string character histograms (len(texts) x _CHAR_BINS, uint8) for the vectorized quick_ratio bound."""
+    encoded = [text.encode("utf-8") for text in texts]
+    byte_lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    owners = np.repeat(np.arange(len(encoded), dtype=np.int64), byte_lengths)
+    bins = _CHAR_BIN_OF_BYTE[np.frombuffer(b"".join(encoded), dtype=np.uint8)]
+    counts = np.bincount(owners * _CHAR_BINS + bins, minlength=len(encoded) * _CHAR_BINS)
+    return np.minimum(counts, 255).astype(np.uint8).reshape(len(encoded), _CHAR_BINS)
+
+def _ngram_codes(texts):
+    """Byte n-grams of every (space-padded) string packed into integers, plus how many each string has."""
+    encoded = [f" {text} ".encode("utf-8") for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    codes = np.zeros(max(0, len(data) - NGRAM + 1), dtype=np.uint64)
+    for offset in range(NGRAM):
+        codes = (codes << np.uint64(8)) | data[offset:len(data) - NGRAM + 1 + offset]
+    counts = lengths - NGRAM + 1 # Padded non-empty strings are at least NGRAM bytes long
+    # Keep only the n-grams that start and end inside the same string
+    string_starts = np.cumsum(lengths) - lengths
+    output_starts = np.cumsum(counts) - counts
+    positions = np.arange(int(counts.sum()), dtype=np.int64) + np.repeat(string_starts - output_starts, counts)
+    return codes[positions], counts
+
+def signatures(texts):
+    """MinHash signatures (len(texts) x NUM_PERM, uint64) of non-empty normalized strings."""
+    result = np.empty((len(texts), NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(texts), _SIGNATURE_CHUNK):
+        codes, counts = _ngram_codes(texts[start:start + _SIGNATURE_CHUNK])
+        # (NUM_PERM x n-grams): each row is one hash function, reduced per string along contiguous memory
+        permuted = (_HASH_A[:, None] * codes + _HASH_B[:, None]) >> np.uint64(32) # uint64 arithmetic wraps, as intended
+        offsets = np.cumsum(counts) - counts
+        result[start:start + len(counts)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return result
+
+def bucket_keys(sigs):
+    """One bucket key per band (len(sigs) x BANDS, uint64); the band number is folded into the top bits."""
+    bands = sigs.reshape(len(sigs), BANDS, ROWS_PER_BAND)
+    mixed = np.zeros((len(sigs), BANDS), dtype=np.uint64)
+    for row in range(ROWS_PER_BAND):
+        mixed = (mixed ^ bands[:, :, row]) * _BAND_MIX
+    return (mixed >> np.uint64(5)) | (np.arange(BANDS, dtype=np.uint64) << _BAND_SHIFT)
+
+def edit_keys(text):
+    """Set of hashes of text and of every variant of it with one character deleted (two strings at most one edit
+    apart share at least one). Hashes are process-local, like the index itself."""
+    keys = {hash(text[:i] + text[i + 1:]) for i in range(len(text))}
+    keys.add(hash(text))
+    return keys
+
+def _merge_sorted(keys, slots, new_keys, new_slots):
+    """keys/slots with new_keys/new_slots added, keeping keys sorted."""
+    order = np.argsort(new_keys, kind="stable")
+    new_keys, new_slots = new_keys[order], new_slots[order]
+    if len(keys) == 0:
+        return new_keys, new_slots
+    # A few appended rows: insert in place instead of re-sorting everything
+    positions = np.searchsorted(keys, new_keys, side="right")
+    return np.insert(keys, positions, new_keys), np.insert(slots, positions, new_slots)
+
+def _lookup(keys, slots, probes, max_group=None):
+    """Distinct slots stored under any of the probe keys (keys sorted), skipping keys held by more than max_group."""
+    starts = np.searchsorted(keys, probes, side="left")
+    ends = np.searchsorted(keys, probes, side="right")
+    hits = [slots[s:e] for s, e in zip(starts.tolist(), ends.tolist()) 
+            if e > s and (max_group is None or e - s <= max_group)]
+    return np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+
+def _sorted_unique(values):
+    """np.unique(values) by sorting (faster than its hash path on millions of int64 codes)."""
+    values = np.sort(values)
+    return values[np.concatenate(([True], values[1:] != values[:-1]))] if len(values) else values
+
+def _pair_codes(keys, slots, count):
+    """low * count + high for every pair of distinct slots sharing a key (keys sorted; groups over MAX_BUCKET
+    are skipped), sorted and without repeats."""
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    sizes = np.diff(np.concatenate((starts, [len(keys)])))
+    codes = [np.empty(0, dtype=np.int64)]
+    for size in np.unique(sizes[(sizes > 1) & (sizes <= MAX_BUCKET)]).tolist():
+        # Every group of this size at once: (groups x size) matrix of slots, then all its column pairs
+        members = slots[starts[sizes == size][:, None] + np.arange(size)]
+        left, right = np.triu_indices(size, k=1)
+        low = np.minimum(members[:, left], members[:, right]).ravel()
+        high = np.maximum(members[:, left], members[:, right]).ravel()
+        codes.append((low * count + high)[low != high]) # One int64 per pair, so repeats across keys drop cheaply
+    return _sorted_unique(np.concatenate(codes))
+
+def similarity(a, b):
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+def similar_enough(a, b, min_similarity):
+    """Verified similarity of a and b if it reaches min_similarity, else None (cheap upper bounds checked first)."""
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < min_similarity:
+        return None
+    score = matcher.ratio()
+    return score if score >= min_similarity else None
+
+
+class LshTable:
+    """LSH buckets for one kind of key.
+
+    Entries live in slots (insertion order). Buckets are one sorted array of bucket keys plus the slot of each
+    entry, and the edit keys are kept the same way; the low 16 bits of every signature are kept per slot to estimate
+    Jaccard similarity cheaply (b-bit MinHash) before the exact check.
+    """
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.slots = np.empty(0, dtype=np.int64)
+        self.edit_keys = np.empty(0, dtype=np.int64)
+        self.edit_slots = np.empty(0, dtype=np.int64)
+        self.sigs = np.empty((0, NUM_PERM), dtype=np.uint16)
+        self.row_ids = np.empty(0, dtype=np.int64) # slot -> row id
+        self.lengths = np.empty(0, dtype=np.int64)
+        self.char_counts = np.empty((0, _CHAR_BINS), dtype=np.uint8)
+        self.texts = [] # slot -> normalized string, for verification
+
+    def add(self, texts: pd.Series):
+        """Adds normalized strings (index = row ids); blanks are skipped."""
+        texts = texts[texts.notna() & (texts != "")]
+        if texts.empty:
+            return
+        values = texts.tolist()
+        sigs = signatures(values)
+        first_slot = len(self.texts)
+        new_slots = np.arange(first_slot, first_slot + len(values), dtype=np.int64)
+        self.keys, self.slots = _merge_sorted(self.keys, self.slots, bucket_keys(sigs).ravel(), np.repeat(new_slots, BANDS))
+        per_value = [edit_keys(value) for value in values]
+        self.edit_keys, self.edit_slots = _merge_sorted(
+            self.edit_keys, self.edit_slots,
+            np.fromiter(itertools.chain.from_iterable(per_value), dtype=np.int64, count=sum(map(len, per_value))),
+            np.repeat(new_slots, [len(keys) for keys in per_value]))
+        self.sigs = np.concatenate((self.sigs, sigs.astype(np.uint16)))
+        self.row_ids = np.concatenate((self.row_ids, texts.index.to_numpy(dtype=np.int64)))
+        self.lengths = np.concatenate((self.lengths, np.fromiter(map(len, values), dtype=np.int64, count=len(values))))
+        self.char_counts = np.concatenate((self.char_counts, char_counts(values)))
+        self.texts.extend(values)
+
+    def copy(self):
+        """A copy that add() can extend without changing this table (its arrays are replaced, never grown in place)."""
+        clone = copy.copy(self)
+        clone.texts = list(self.texts)
+        return clone
+
+    def candidates(self, text):
+        """(slots, estimated Jaccard) of entries sharing at least one bucket (up to MAX_BUCKET entries) with text, plus
+        any entry sharing an edit key with it (estimate 1.0), best estimate first."""
+        empty = np.empty(0, dtype=np.int64), np.empty(0)
+        if not text or len(self.keys) == 0:
+            return empty
+        sig = signatures([text])
+        slots = _lookup(self.keys, self.slots, bucket_keys(sig)[0], MAX_BUCKET)
+        estimates = (self.sigs[slots] == sig[0].astype(np.uint16)).mean(axis=1)
+        # A typo can leave too few shared n-grams for any bucket, but never shares no edit key
+        one_edit = _lookup(self.edit_keys, self.edit_slots, np.fromiter(edit_keys(text), dtype=np.int64))
+        if len(one_edit):
+            slots = np.concatenate((one_edit, slots))
+            estimates = np.concatenate((np.ones(len(one_edit)), estimates))
+            slots, first = np.unique(slots, return_index=True) # Keeps the 1.0 of a slot found both ways
+            estimates = estimates[first]
+        order = np.argsort(-estimates, kind="stable")
+        return slots[order], estimates[order]
+
+    def matches(self, text, min_similarity=MIN_SIMILARITY):
+        """[(row_id, similarity)] of verified near-duplicates of text, best first."""
+        slots, estimates = self.candidates(text)
+        if len(slots) == 0:
+            return []
+        # Same cheap bounds as the batch report before the exact check
+        total_length = self.lengths[slots] + len(text)
+        shared = np.minimum(self.char_counts[slots], char_counts([text])[0]).sum(axis=1, dtype=np.int64)
+        plausible = (estimates >= MIN_ESTIMATED_JACCARD) & (2 * np.minimum(self.lengths[slots], len(text)) >= min_similarity * total_length) \
+            & (2 * shared >= min_similarity * total_length)
+        found = []
+        for slot in slots[plausible][:MAX_QUERY_CANDIDATES].tolist():
+            score = similar_enough(text, self.texts[slot], min_similarity)
+            if score is not None:
+                found.append((int(self.row_ids[slot]), score))
+        return sorted(found, key=lambda item: -item[1])
+
+    def candidate_pairs(self, min_similarity=MIN_SIMILARITY):
+        """(left, right) slot arrays of the pairs sharing a bucket or an edit key that pass the cheap vectorized
+        checks."""
+        count = len(self.texts)
+        edit_codes = _pair_codes(self.edit_keys, self.edit_slots, count)
+        codes = _sorted_unique(np.concatenate((_pair_codes(self.keys, self.slots, count), edit_codes)))
+        left, right = codes // count, codes % count
+        # Upper bound of the difflib ratio from the lengths alone (same as SequenceMatcher.real_quick_ratio)
+        length_a, length_b = self.lengths[left], self.lengths[right]
+        keep = 2 * np.minimum(length_a, length_b) >= min_similarity * (length_a + length_b)
+        left, right, total_length = left[keep], right[keep], (length_a + length_b)[keep]
+        one_edit = np.isin(codes[keep], edit_codes, assume_unique=True)
+        keep = np.zeros(len(left), dtype=bool)
+        for start in range(0, len(left), _SIGNATURE_CHUNK): # Bounded temporaries (chunk x NUM_PERM)
+            chunk = slice(start, start + _SIGNATURE_CHUNK)
+            estimated = one_edit[chunk] | \
+                ((self.sigs[left[chunk]] == self.sigs[right[chunk]]).mean(axis=1) >= MIN_ESTIMATED_JACCARD)
+            # Shared characters bound the ratio too (same as SequenceMatcher.quick_ratio)
+            shared = np.minimum(self.char_counts[left[chunk]], self.char_counts[right[chunk]]).sum(axis=1, dtype=np.int64)
+            keep[chunk] = estimated & (2 * shared >= min_similarity * total_length[chunk])
+        return left[keep], right[keep]
+
+
+class NearDuplicateIndex(indexes.TableIndex):
+    """MinHash-LSH tables over normalized Names and Link domains."""
+
+    def __init__(self):
+        super().__init__()
+        self.names = LshTable()
+        self.domains = LshTable()
+
+    def add_rows(self, rows):
+        self.names.add(indexes.name_keys(rows['Name']))
+        self.domains.add(domain_keys(rows['Link']))
+
+    def copy(self):
+        clone = super().copy()
+        clone.names, clone.domains = self.names.copy(), self.domains.copy()
+        return clone
+
+    def find(self, name=None, link=None, min_similarity=MIN_SIMILARITY):
+        """[(row_id, column, similarity)] of near-duplicates by Name and/or Link domain, best first."""
+        found = {}
+        for column, table, text in (('Name', self.names, indexes.name_key(name)), ('Link', self.domains, domain_key(link))):
+            for row_id, score in table.matches(text, min_similarity):
+                if row_id not in found or score > found[row_id][1]:
+                    found[row_id] = (column, score)
+        return sorted(((row_id, column, score) for row_id, (column, score) in found.items()), key=lambda item: -item[2])
+
+    def report(self, min_similarity=MIN_SIMILARITY):
+        """DataFrame of near-duplicate pairs across the whole catalogue (row ids in Row_A/Row_B), best first."""
+        frames = []
+        for column, table in (('Name', self.names), ('Link', self.domains)):
+            left, right = table.candidate_pairs(min_similarity)
+            scores = np.fromiter((similar_enough(table.texts[a], table.texts[b], min_similarity) or 0.0
+                                  for a, b in zip(left.tolist(), right.tolist())), dtype=np.float64, count=len(left))
+            keep = scores >= min_similarity
+            row_a, row_b = table.row_ids[left[keep]], table.row_ids[right[keep]]
+            frames.append(pd.DataFrame({
+                "Row_A": np.minimum(row_a, row_b), "Row_B": np.maximum(row_a, row_b), # Older row first
+                "Matched_On": column, "Similarity": scores[keep],
+            }))
+        pairs = pd.concat(frames, ignore_index=True)
+        # A pair matching on both Name and domain is listed once, with its best score
+        pairs = pairs.sort_values("Similarity", ascending=False, kind="stable").drop_duplicates(["Row_A", "Row_B"])
+        return pairs.reset_index(drop=True)
@@ -0,0 +1,214 @@
+# utils/perf.py
+# Per-rerun performance instrumentation: named spans (load_data, filters, card rendering, charts, ...) and cache
+# hits/misses, collected for one script run at a time.
+#
+# Off by default. A rerun is traced when the URL has ?perf=1 (and then a developer panel with the spans, the caches
+# and the process-wide stats is shown at the bottom of the page) or when APP_PERF_TRACE=1 (every rerun of every
+# session, no panel). Each traced rerun is appended to APP_PERF_LOG (default perf_trace.jsonl; empty disables) as
+# one JSON line. When a rerun isn't traced, span() returns a shared no-op context manager and the wrappers are a
+# thread-local lookup, so the instrumentation costs a few hundred nanoseconds per call.
+import os
+import json
+import time
+import logging
+import datetime
+import threading
+import functools
+import contextlib
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+QUERY_PARAM = "perf"
+TRACE_ALL = os.environ.get("APP_PERF_TRACE", "0") not in ("", "0")
+LOG_PATH = os.environ.get("APP_PERF_LOG", "perf_trace.jsonl")
+PANEL_MAX_SPANS = 300 # Spans listed in the panel (all of them still go to the log)
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _ThreadState(threading.local):
+    trace = None # RunTrace of the script run on this thread, or None (a class default: no AttributeError to catch)
+
+_local = _ThreadState()
+_log_lock = threading.Lock()
+
+
+class RunTrace:
+    """Spans and cache outcomes of one script run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans = [] # [name, depth, start offset, duration] in start order
+        self.depth = 0
+        self.caches = {} # cache name -> [hits, misses]
+        self.cache_probes = [] # Stack of "did the cached function run" flags (see cache_probe)
+        self.info = {}
+
+
+class _Span:
+    __slots__ = ("trace", "record", "started")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.record = [name, 0, 0.0, None]
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.record[1] = self.trace.depth
+        self.record[2] = self.started - self.trace.started
+        self.trace.spans.append(self.record)
+        self.trace.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.record[3] = time.perf_counter() - self.started
+        self.trace.depth -= 1
+        return False
+
+
+def span(name):
+    """Context manager timing a named block of the current rerun (a no-op when the rerun isn't traced)."""
+    trace = _local.trace
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+def traced(name=None):
+    """Decorator: every call of the function is a span (named after the function unless name is given)."""
+    def decorator(func):
+        label = name or func.__name__
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _local.trace
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_cache(name, hits=0, misses=0):
+    """Counts cache hits/misses for the current rerun (no-op when it isn't traced)."""
+    trace = _local.trace
+    if trace is not None:
+        counts = trace.caches.setdefault(name, [0, 0])
+        counts[0] += hits
+        counts[1] += misses
+
+def mark_cache_miss():
+    """Called from inside a cached function's body, which only runs on a miss (see cache_probe)."""
+    trace = _local.trace
+    if trace is not None and trace.cache_probes:
+        trace.cache_probes[-1] = True
+
+def cache_probe(name, cached_func):
+    """Wraps a cached function (whose body calls mark_cache_miss()) to count its hits and misses as cache `name`."""
+    @functools.wraps(cached_func)
+    def probe(*args, **kwargs):
+        trace = _local.trace
+        if trace is None:
+            return cached_func(*args, **kwargs)
+        trace.cache_probes.append(False)
+        try:
+            return cached_func(*args, **kwargs)
+        finally:
+            missed = trace.cache_probes.pop()
+            record_cache(name, hits=int(not missed), misses=int(missed))
+    probe.clear = cached_func.clear
+    return probe
+
+def panel_requested():
+    """True if this session asked for the developer panel (?perf=1)."""
+    try:
+        return st.query_params.get(QUERY_PARAM, "").lower() in ("1", "true", "on", "yes")
+    except Exception: # No script run context (bare mode)
+        return False
+
+def start_run(name, enabled=False):
+    """Starts tracing the current script run if enabled (or APP_PERF_TRACE is set). Replaces any trace a previous
+    run on this thread left behind (e.g. one interrupted by st.rerun())."""
+    _local.trace = RunTrace(name) if (enabled or TRACE_ALL) else None
+    return _local.trace
+
+def annotate(**info):
+    """Adds context (e.g. page=...) to the current rerun's trace."""
+    trace = _local.trace
+    if trace is not None:
+        trace.info.update(info)
+
+def finish_run():
+    """Stops tracing and returns the rerun's report (a dict, also appended to the JSON lines log), or None."""
+    trace = _local.trace
+    _local.trace = None
+    if trace is None:
+        return None
+    total = time.perf_counter() - trace.started
+    report = {
+        "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        "run": trace.name,
+        "total_ms": round(total * 1000, 3),
+        **trace.info,
+        "spans": [{"name": name, "depth": depth, "start_ms": round(start * 1000, 3),
+                   "ms": round(duration * 1000, 3) if duration is not None else None}
+                  for name, depth, start, duration in trace.spans],
+        "caches": {name: {"hits": hits, "misses": misses} for name, (hits, misses) in trace.caches.items()},
+    }
+    _write_log(report)
+    return report
+
+def _write_log(report):
+    if not LOG_PATH:
+        return
+    try:
+        line = json.dumps(report, default=str) + "\n"
+        with _log_lock, open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning("Could not write the performance log '%s': %s", LOG_PATH, e)
+
+def _span_totals(spans):
+    """Per span name: number of calls and total ms, slowest first."""
+    totals = {}
+    for span_report in spans:
+        entry = totals.setdefault(span_report["name"], {"Span": span_report["name"], "Calls": 0, "Total ms": 0.0})
+        entry["Calls"] += 1
+        entry["Total ms"] += span_report["ms"] or 0.0
+    return sorted(totals.values(), key=lambda entry: -entry["Total ms"])
+
+def show_panel(report):
+    """The developer panel: this rerun's spans and cache outcomes, plus process-wide cache/storage/queue stats."""
+    import pandas as pd
+    from utils import data_manager, charts, style_utils, write_queue, import_profiler # Late: they import this module
+
+    with st.expander(f"⏱️ Performance: this rerun took {report['total_ms']:.0f} ms", expanded=True):
+        st.caption(f"Traced because of ?{QUERY_PARAM}=1. Also logged as JSON lines to '{LOG_PATH or '(disabled)'}'.")
+        span_col, cache_col = st.columns([3, 2])
+        with span_col:
+            st.markdown("**Spans (in order)**")
+            spans = pd.DataFrame([
+                {"Span": "· " * s["depth"] + s["name"], "Start ms": s["start_ms"], "Duration ms": s["ms"]}
+                for s in report["spans"][:PANEL_MAX_SPANS]
+            ], columns=["Span", "Start ms", "Duration ms"])
+            st.dataframe(spans, use_container_width=True, hide_index=True)
+            st.markdown("**Totals by span**")
+            st.dataframe(pd.DataFrame(_span_totals(report["spans"]), columns=["Span", "Calls", "Total ms"]),
+                         use_container_width=True, hide_index=True)
+        with cache_col:
+            st.markdown("**Caches (this rerun)**")
+            caches = pd.DataFrame([{"Cache": name, "Hits": c["hits"], "Misses": c["misses"]} for name, c in report["caches"].items()],
+                                  columns=["Cache", "Hits", "Misses"])
+            st.dataframe(caches, use_container_width=True, hide_index=True)
+            st.markdown("**Process**")
+            st.json({
+                "storage": data_manager.get_storage_stats(),
+                "figures": charts.get_figure_cache_stats(),
+                "stylesheet": style_utils.get_style_stats(),
+                "write_queue": write_queue.get_queue_stats(),
+            }, expanded=False)
+            if import_profiler.ENABLED:
+                st.markdown("**Slowest imports (cumulative ms)**")
+                slowest = sorted((t for t in import_profiler.get_import_timings() if t[3] == 0), key=lambda t: -t[2])[:10]
+                st.dataframe(pd.DataFrame([{"Module": t[0], "ms": round(t[2] * 1000, 1)} for t in slowest], columns=["Module", "ms"]),
+                             use_container_width=True, hide_index=True)
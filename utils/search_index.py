@@ -0,0 +1,134 @@
+# utils/search_index.py
+# Full-text search for the dashboard: a tokenized inverted index over Name, Category and Purpose with BM25 ranking.
+#
+# Postings are numpy arrays (slot, weighted term frequency) per term, so scoring a query is a few vectorized
+# bincounts instead of a scan over every row. Query terms are matched as prefixes ("copy" finds "copywriting"),
+# and a tool must match every term of a multi-term query. Slots are insertion order; appended tools are added
+# to the existing postings (see indexes.TableIndex), so the index is only built from scratch once per dataset.
+import re
+import bisect
+import numpy as np
+import pandas as pd
+from utils import indexes
+
+TOKEN_RE = re.compile(r"\w+")
+FIELD_WEIGHTS = {"Name": 3.0, "Category": 2.0, "Purpose": 1.0} # A hit in the name counts like three in the purpose
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_WEIGHT = 0.7 # Terms that only start with the query term score a bit lower than exact ones
+MAX_PREFIX_EXPANSIONS = 50 # Most frequent completions used per query term
+
+def tokenize(text):
+    """Lowercased word tokens of a query or field value."""
+    if text is None or (not isinstance(text, str) and pd.isna(text)):
+        return []
+    return TOKEN_RE.findall(str(text).lower())
+
+def _field_tokens(values):
+    """(row positions, tokens) for a column; each distinct value is tokenized once (e.g. a Category)."""
+    codes, uniques = pd.factorize(values.astype("string").fillna(""), use_na_sentinel=False)
+    unique_tokens = pd.Series(uniques, dtype="string").str.lower().str.findall(TOKEN_RE)
+    counts = unique_tokens.str.len().to_numpy(dtype=np.int64)
+    flat = np.array([token for tokens in unique_tokens.tolist() for token in tokens], dtype=object)
+    row_counts = counts[codes]
+    positions = np.repeat(np.arange(len(values), dtype=np.int64), row_counts)
+    # Index of each row's k-th token inside `flat`: start of its unique value's run + k
+    run_starts = np.cumsum(counts) - counts
+    within = np.arange(int(row_counts.sum()), dtype=np.int64) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+    return positions, flat[np.repeat(run_starts[codes], row_counts) + within]
+
+def _weighted_terms(rows):
+    """(terms, term index, row position, weighted tf) per distinct (term, row), sorted by term then position."""
+    positions, tokens, weights = [], [], []
+    for column, weight in FIELD_WEIGHTS.items():
+        field_positions, field_tokens = _field_tokens(rows[column])
+        positions.append(field_positions)
+        tokens.append(field_tokens)
+        weights.append(np.full(len(field_positions), weight))
+    positions, weights = np.concatenate(positions), np.concatenate(weights)
+    term_codes, terms = pd.factorize(np.concatenate(tokens), sort=True)
+    # One key per (term, row): summing weights per key gives the field-weighted term frequency
+    keys, inverse = np.unique(term_codes.astype(np.int64) * max(len(rows), 1) + positions, return_inverse=True)
+    tfs = np.bincount(inverse.ravel(), weights=weights)
+    return np.asarray(terms, dtype=object), keys // max(len(rows), 1), keys % max(len(rows), 1), tfs
+
+
+class SearchIndex(indexes.TableIndex):
+    """BM25 inverted index over the tools frame."""
+
+    def __init__(self):
+        super().__init__()
+        self.postings = {} # term -> (slots int64 array, weighted tf float64 array)
+        self.terms = [] # Sorted vocabulary, for prefix lookups
+        self.row_ids = np.empty(0, dtype=np.int64) # slot -> row id
+        self.doc_lengths = np.empty(0, dtype=np.float64)
+
+    def add_rows(self, rows):
+        if rows.empty:
+            return
+        first_slot = len(self.row_ids)
+        rows = rows.sort_index() # Slots follow insertion order
+        positioned = rows.reset_index(drop=True)
+        terms, term_index, positions, tfs = _weighted_terms(positioned)
+        slots = positions + first_slot
+        doc_lengths = np.bincount(positions, weights=tfs, minlength=len(rows))
+
+        # Entries are sorted by term: split them into one (slots, tfs) run per term
+        starts = np.flatnonzero(np.diff(term_index, prepend=-1)) if len(term_index) else np.empty(0, dtype=np.int64)
+        ends = np.append(starts[1:], len(term_index))
+        new_terms = []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            term = terms[term_index[start]]
+            existing = self.postings.get(term)
+            if existing is None:
+                self.postings[term] = (slots[start:end], tfs[start:end])
+                new_terms.append(term)
+            else: # Appended slots are larger than any existing one, so the arrays stay sorted by slot
+                self.postings[term] = (np.concatenate((existing[0], slots[start:end])), np.concatenate((existing[1], tfs[start:end])))
+        if len(new_terms) > 64 or not self.terms:
+            self.terms = sorted(self.postings)
+        else:
+            for term in new_terms:
+                bisect.insort(self.terms, term)
+
+        self.row_ids = np.concatenate((self.row_ids, rows.index.to_numpy(dtype=np.int64)))
+        self.doc_lengths = np.concatenate((self.doc_lengths, doc_lengths))
+
+    def copy(self):
+        # Postings are replaced (never grown in place) when rows are added; only the containers need copying
+        clone = super().copy()
+        clone.postings, clone.terms = dict(self.postings), list(self.terms)
+        return clone
+
+    def _expansions(self, query_term):
+        """[(term, weight)] for one query term: itself if indexed, plus its most frequent prefix completions."""
+        start = bisect.bisect_left(self.terms, query_term)
+        end = bisect.bisect_left(self.terms, query_term + "\U0010ffff")
+        completions = self.terms[start:end]
+        if len(completions) > MAX_PREFIX_EXPANSIONS:
+            completions = sorted(completions, key=lambda term: -len(self.postings[term][0]))[:MAX_PREFIX_EXPANSIONS]
+        return [(term, 1.0 if term == query_term else PREFIX_WEIGHT) for term in completions]
+
+    def search(self, query, limit=None):
+        """Row ids of the tools matching every term of query, best BM25 score first (newest first on ties)."""
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        doc_count = len(self.row_ids)
+        if not query_terms or doc_count == 0:
+            return np.empty(0, dtype=np.int64)
+        avg_length = max(float(self.doc_lengths.mean()), 1e-9)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths / avg_length)
+        scores = np.zeros(doc_count)
+        matched_all = np.ones(doc_count, dtype=bool)
+        for query_term in query_terms:
+            term_scores = np.zeros(doc_count)
+            for term, weight in self._expansions(query_term):
+                slots, tfs = self.postings[term]
+                idf = np.log1p((doc_count - len(slots) + 0.5) / (len(slots) + 0.5))
+                term_scores += np.bincount(slots, weights=weight * idf * tfs * (BM25_K1 + 1) / (tfs + length_norm[slots]),
+                                           minlength=doc_count)
+            matched_all &= term_scores > 0
+            scores += term_scores
+        hits = np.flatnonzero(matched_all)
+        order = np.lexsort((-hits, -scores[hits])) # Score desc, then later slot (newer tool) first
+        hits = hits[order]
+        return self.row_ids[hits[:limit] if limit else hits]
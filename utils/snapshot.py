@@ -0,0 +1,127 @@
+# utils/snapshot.py
+# Typed, pre-sorted columnar snapshot (Arrow IPC file, memory-mapped on read) kept next to the CSV.
+# data_manager loads this instead of re-parsing the CSV whenever the CSV hasn't changed since the snapshot was built.
+import os
+import io
+import json
+import hashlib
+import logging
+from utils import storage
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError: # pyarrow is optional; without it every cold load parses the CSV
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 2 # Bump when the typed layout changes so old snapshots are rebuilt
+_METADATA_KEY = b"ai_arsenal_snapshot"
+
+def is_available() -> bool:
+    return pa is not None
+
+def snapshot_path_for(data_path: str) -> str:
+    return data_path + ".arrow"
+
+def file_stat(data_path: str) -> dict:
+    """Cheap change check: modification time and size of the source file."""
+    st_result = os.stat(data_path)
+    return {"mtime_ns": st_result.st_mtime_ns, "size": st_result.st_size}
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def read_source(data_path: str):
+    """Reads the source file once and returns (raw bytes, fingerprint) describing exactly those bytes."""
+    stat_before = file_stat(data_path)
+    with open(data_path, "rb") as f:
+        data = f.read()
+    return data, fingerprint_for(data, stat_before)
+
+def fingerprint_for(data: bytes, stat_before: dict) -> dict:
+    """Fingerprint of `data`, read from a file whose stat (taken before reading) was stat_before."""
+    fingerprint = dict(stat_before, sha256=content_hash(data), rows=None)
+    if len(data) != stat_before["size"]: # Appended to while we read: don't trust the mtime we saw
+        fingerprint["mtime_ns"] = None
+    fingerprint["size"] = len(data)
+    return fingerprint
+
+def _read_metadata(snap_path: str):
+    with pa.memory_map(snap_path, "r") as source:
+        metadata = pa_ipc.open_file(source).schema.metadata or {}
+    raw = metadata.get(_METADATA_KEY)
+    return json.loads(raw) if raw else None
+
+def read(data_path: str, extra_key=None):
+    """Returns (DataFrame, fingerprint) from the snapshot without checking it against the source, or (None, None)."""
+    if pa is None:
+        return None, None
+    snap_path = snapshot_path_for(data_path)
+    try:
+        with pa.memory_map(snap_path, "r") as source:
+            reader = pa_ipc.open_file(source)
+            raw_meta = (reader.schema.metadata or {}).get(_METADATA_KEY)
+            meta = json.loads(raw_meta) if raw_meta else None
+            if not meta or meta.get("format") != SNAPSHOT_FORMAT_VERSION or meta.get("extra_key") != extra_key:
+                return None, None
+            table = reader.read_all()
+        return table.to_pandas(), meta["fingerprint"]
+    except FileNotFoundError:
+        return None, None
+    except Exception as e: # A corrupt/foreign snapshot must never break loading; it just gets rebuilt
+        logger.warning("Ignoring unreadable snapshot '%s': %s", snap_path, e)
+        return None, None
+
+def load(data_path: str, extra_key=None):
+    """Returns (DataFrame, fingerprint) from the snapshot if it still matches data_path, else (None, None).
+
+    Matching mtime+size is trusted as-is; otherwise the file is hashed and the snapshot is reused
+    (and re-stamped) only if the content is byte-identical, e.g. after a plain `touch` or a no-op copy.
+    """
+    if pa is None:
+        return None, None
+    snap_path = snapshot_path_for(data_path)
+    try:
+        meta = _read_metadata(snap_path)
+        if not meta or meta.get("format") != SNAPSHOT_FORMAT_VERSION or meta.get("extra_key") != extra_key:
+            return None, None
+        current = file_stat(data_path)
+        fingerprint = meta["fingerprint"]
+        if current["size"] != fingerprint["size"]:
+            return None, None
+        restamp = current["mtime_ns"] != fingerprint["mtime_ns"]
+        if restamp:
+            with open(data_path, "rb") as f:
+                if content_hash(f.read()) != fingerprint["sha256"]:
+                    return None, None
+        df, _ = read(data_path, extra_key=extra_key)
+        if df is not None and restamp:
+            fingerprint = dict(fingerprint, mtime_ns=current["mtime_ns"])
+            write(data_path, df, fingerprint, extra_key=extra_key)
+        return (df, fingerprint) if df is not None else (None, None)
+    except FileNotFoundError:
+        return None, None
+    except Exception as e:
+        logger.warning("Ignoring unreadable snapshot '%s': %s", snap_path, e)
+        return None, None
+
+def write(data_path: str, df, fingerprint: dict, extra_key=None):
+    """Atomically writes df as the snapshot for data_path, stamped with the source fingerprint."""
+    if pa is None:
+        return False
+    meta = {"format": SNAPSHOT_FORMAT_VERSION, "fingerprint": fingerprint, "extra_key": extra_key}
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True) # The index holds the row ids
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[_METADATA_KEY] = json.dumps(meta).encode()
+        table = table.replace_schema_metadata(schema_metadata)
+        sink = io.BytesIO()
+        with pa_ipc.new_file(sink, table.schema) as writer: # Uncompressed so it can be memory-mapped
+            writer.write_table(table)
+        storage.atomic_write(snapshot_path_for(data_path), lambda f: f.write(sink.getvalue()), mode="wb")
+        return True
+    except Exception as e:
+        logger.warning("Could not write snapshot for '%s': %s", data_path, e)
+        return False
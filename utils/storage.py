@@ -0,0 +1,671 @@
+# utils/storage.py
+# Storage layer used by data_manager: advisory locking, atomic replace, a version counter,
+# and the pluggable backends (CSV file or SQLite database) that actually hold the tools table.
+import io
+import os
+import csv
+import time
+import sqlite3
+import datetime
+import tempfile
+import threading
+import contextlib
+import logging
+import json
+import pandas as pd
+
+try:
+    import fcntl # POSIX advisory locks
+except ImportError: # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT_SECONDS = 15.0 # Give up waiting for another writer after this long
+LOCK_POLL_INTERVAL_SECONDS = 0.01
+SLOW_LOCK_WARNING_SECONDS = 1.0 # Waits longer than this are logged as warnings
+
+# Process-wide lock wait statistics (read via get_lock_stats())
+_lock_stats = {"acquisitions": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0, "last_wait_seconds": 0.0}
+_lock_stats_guard = threading.Lock()
+_held_locks = threading.local() # Re-entrancy bookkeeping per thread
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when the data file lock can't be acquired within the timeout."""
+
+
+class VersionConflictError(RuntimeError):
+    """Raised when the data changed on disk since the caller read it (optimistic concurrency)."""
+
+
+def lock_path_for(data_path: str) -> str:
+    return data_path + ".lock"
+
+def version_path_for(data_path: str) -> str:
+    return data_path + ".version"
+
+def sequence_path_for(data_path: str) -> str:
+    return data_path + ".seq"
+
+def summary_path_for(data_path: str) -> str:
+    return data_path + ".summary.json"
+
+
+def _try_lock(fd) -> bool:
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except (BlockingIOError, PermissionError, OSError):
+        return False
+
+def _unlock(fd):
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+
+def _record_lock_wait(path: str, wait_seconds: float):
+    with _lock_stats_guard:
+        _lock_stats["acquisitions"] += 1
+        _lock_stats["total_wait_seconds"] += wait_seconds
+        _lock_stats["last_wait_seconds"] = wait_seconds
+        _lock_stats["max_wait_seconds"] = max(_lock_stats["max_wait_seconds"], wait_seconds)
+    if wait_seconds >= SLOW_LOCK_WARNING_SECONDS:
+        logger.warning("Waited %.3fs for the write lock on '%s'", wait_seconds, path)
+    else:
+        logger.debug("Acquired write lock on '%s' after %.4fs", path, wait_seconds)
+
+def get_lock_stats() -> dict:
+    """Returns a copy of the lock wait statistics for this process."""
+    with _lock_stats_guard:
+        return dict(_lock_stats)
+
+
+@contextlib.contextmanager
+def file_lock(data_path: str, timeout: float = LOCK_TIMEOUT_SECONDS):
+    """Holds an exclusive advisory lock for data_path (via a sidecar .lock file). Yields the seconds waited.
+
+    Re-entrant within a thread, so helpers that lock can be called from code that already holds the lock.
+    """
+    held = getattr(_held_locks, "paths", None)
+    if held is None:
+        held = _held_locks.paths = {}
+    key = os.path.abspath(data_path)
+    if key in held:
+        held[key] += 1
+        try:
+            yield 0.0
+        finally:
+            held[key] -= 1
+        return
+
+    lock_path = lock_path_for(data_path)
+    lock_dir = os.path.dirname(lock_path)
+    if lock_dir:
+        os.makedirs(lock_dir, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    start = time.perf_counter()
+    try:
+        while not _try_lock(fd):
+            if time.perf_counter() - start > timeout:
+                raise LockTimeoutError(f"Timed out after {timeout:.1f}s waiting for lock on '{data_path}'")
+            time.sleep(LOCK_POLL_INTERVAL_SECONDS)
+        wait_seconds = time.perf_counter() - start
+        _record_lock_wait(data_path, wait_seconds)
+        held[key] = 1
+        try:
+            yield wait_seconds
+        finally:
+            del held[key]
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(dir_path: str):
+    """Makes a rename durable on POSIX by syncing the containing directory."""
+    if not fcntl:
+        return
+    try:
+        dir_fd = os.open(dir_path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+def atomic_write(path: str, write_fn, mode: str = "w", encoding: str = "utf-8", newline: str = ""):
+    """Writes a file via a temp file in the same directory + os.replace, so readers never see a partial file.
+
+    write_fn receives the open temp file object.
+    """
+    dir_path = os.path.dirname(path)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_path or ".", prefix="." + os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        open_kwargs = {} if "b" in mode else {"encoding": encoding, "newline": newline}
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            write_fn(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(dir_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def read_version(data_path: str) -> int:
+    """Returns the write counter for data_path (0 if it has never been written through this layer)."""
+    try:
+        with open(version_path_for(data_path), "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def bump_version(data_path: str) -> int:
+    """Increments the write counter. Call while holding file_lock(data_path)."""
+    new_version = read_version(data_path) + 1
+    atomic_write(version_path_for(data_path), lambda f: f.write(str(new_version)))
+    return new_version
+
+# --- Storage Backends ---
+# data_manager talks to one of these; it owns validation, typing and UI error reporting, the backend only moves rows.
+
+def complete_records_length(data: bytes) -> int:
+    """Length of the leading part of CSV bytes made of complete records: up to the last line break that isn't
+    inside a quoted field (an even number of '"' before it). Whatever follows is a record still being written."""
+    quotes_before = data.count(b'"')
+    end = len(data)
+    while end > 0:
+        pos = data.rfind(b'\n', 0, end)
+        if pos < 0:
+            return 0
+        quotes_before -= data.count(b'"', pos, end)
+        if quotes_before % 2 == 0:
+            return pos + 1
+        end = pos
+    return 0
+
+def serial_value(value):
+    """A stored Serial_Number as an int, or None if it is blank or not a whole number (legacy or hand-edited rows;
+    data_manager's typed load reads those as missing too)."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else None
+
+def format_value(value, date_format: str) -> str:
+    """Formats a single value the way DataFrame.to_csv would write it ('' for missing)."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, (datetime.datetime, pd.Timestamp)):
+        return value.strftime(date_format)
+    return str(value)
+
+
+class StorageBackend:
+    """Interface for the tools table. Write methods must be called while holding lock()."""
+    name = "base"
+    supports_queries = False # True if the backend can answer filters/lookups without a full DataFrame scan
+
+    def __init__(self, path: str, columns, date_format: str, csv_read_options=None):
+        self.path = path
+        self.columns = list(columns)
+        self.date_format = date_format
+        self.csv_read_options = csv_read_options or {} # Extra pd.read_csv arguments (usecols/dtype) for CSV files
+
+    def initialize(self):
+        """Creates empty storage if it doesn't exist yet."""
+        raise NotImplementedError
+
+    def lock(self):
+        """Context manager giving exclusive write access. Yields the seconds spent waiting."""
+        raise NotImplementedError
+
+    def version(self) -> int:
+        """Monotonic write counter, bumped by every successful write."""
+        raise NotImplementedError
+
+    def change_token(self) -> str:
+        """Cheap token that changes whenever the stored data may have changed, including edits made outside the app."""
+        raise NotImplementedError
+
+    def check_version(self, expected_version):
+        """Raises VersionConflictError if expected_version is set and no longer current."""
+        if expected_version is None:
+            return
+        current = self.version()
+        if current != expected_version:
+            raise VersionConflictError(
+                f"'{self.path}' changed (version {expected_version} -> {current}) since it was read."
+            )
+
+    def read_frame(self) -> pd.DataFrame:
+        """Returns all stored rows, untyped, in insertion order."""
+        raise NotImplementedError
+
+    def can_append(self) -> bool:
+        """True if append_records can be used (stored schema matches the expected columns)."""
+        return True
+
+    def append_records(self, records) -> int:
+        """Appends records (dicts keyed by column) and returns the new version."""
+        raise NotImplementedError
+
+    def replace_all(self, df: pd.DataFrame) -> int:
+        """Atomically replaces every row with df and returns the new version."""
+        raise NotImplementedError
+
+    def allocate_serials(self, count: int, next_from_rows) -> int:
+        """Reserves `count` consecutive serial numbers and returns the first. Hold lock() while calling.
+
+        next_from_rows() must return the first free number for the current rows. The sequence never hands out
+        less than that, so rows added or renumbered outside the app (or a lost sequence) can't cause repeats.
+        """
+        raise NotImplementedError
+
+    def read_summary(self):
+        """The stored materialized summary (a JSON-able dict, see utils/summary.py) if it was written for the data
+        as it is now, else None."""
+        raise NotImplementedError
+
+    def write_summary(self, summary: dict):
+        """Stores summary as describing the current data. Hold lock() while calling (right after the write it reflects)."""
+        raise NotImplementedError
+
+    # Optional indexed queries (only when supports_queries is True)
+    def distinct_values(self, column: str):
+        raise NotImplementedError
+
+    def find_first(self, column: str, value: str):
+        """Returns the first row (dict) whose column equals value case-insensitively, else None."""
+        raise NotImplementedError
+
+    def query(self, filters=None, limit=None) -> pd.DataFrame:
+        """Rows matching {column: value} equality filters, newest Date_Time first, indexed like read_frame().
+        Values are compared without surrounding whitespace on both sides, like the facet counts (utils/facets)."""
+        raise NotImplementedError
+
+
+class CsvBackend(StorageBackend):
+    """The original single-file CSV store (ai_tools_database.csv)."""
+    name = "csv"
+
+    def initialize(self):
+        data_dir = os.path.dirname(self.path)
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+        if not os.path.exists(self.path):
+            with file_lock(self.path):
+                if not os.path.exists(self.path): # Another session may have created it while we waited
+                    df = pd.DataFrame(columns=self.columns)
+                    atomic_write(self.path, lambda f: df.to_csv(f, index=False))
+
+    def lock(self):
+        return file_lock(self.path)
+
+    def version(self) -> int:
+        return read_version(self.path)
+
+    def change_token(self) -> str:
+        # The counter catches writes through this layer; mtime/size catch hand edits and external tools
+        try:
+            st_result = os.stat(self.path)
+            file_part = f"{st_result.st_mtime_ns}-{st_result.st_size}"
+        except FileNotFoundError:
+            file_part = "missing"
+        return f"csv:{self.version()}:{file_part}"
+
+    def read_complete_bytes(self) -> bytes:
+        """The file's bytes up to the end of its last complete record, read without the lock.
+
+        A read that overlaps an append can end in the middle of the record being written; that part is left for
+        the next read. Only if the file still ends in an unterminated record while we hold the lock (a hand-edited
+        file without a final line break) is that record real, and the whole file is returned.
+        """
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        end = complete_records_length(data)
+        if not data[end:].strip():
+            return data
+        try:
+            with self.lock():
+                with open(self.path, 'rb') as f:
+                    return f.read()
+        except LockTimeoutError: # A long write in progress: the complete records are still a consistent read
+            return data[:end]
+
+    def read_frame(self) -> pd.DataFrame:
+        return pd.read_csv(io.BytesIO(self.read_complete_bytes()), **self.csv_read_options)
+
+    def can_append(self) -> bool:
+        """Appending is only safe if the header on disk is exactly our column list."""
+        try:
+            with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                header = next(csv.reader(f), None)
+        except (FileNotFoundError, UnicodeDecodeError, csv.Error):
+            return False
+        return header == self.columns
+
+    def _ends_with_newline(self) -> bool:
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) in (b'\n', b'\r')
+        except FileNotFoundError:
+            return True
+
+    def append_records(self, records) -> int:
+        # Make sure the previous record is terminated before we add ours (hand-edited files often aren't)
+        needs_newline = not self._ends_with_newline()
+        with open(self.path, 'a', encoding='utf-8', newline='') as f:
+            if needs_newline:
+                f.write(os.linesep)
+            # Same dialect as DataFrame.to_csv: minimal quoting, '"' doubled inside fields, os.linesep line endings
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator=os.linesep)
+            for record in records:
+                writer.writerow([format_value(record.get(col), self.date_format) for col in self.columns])
+            f.flush()
+            os.fsync(f.fileno())
+        return bump_version(self.path)
+
+    def replace_all(self, df: pd.DataFrame) -> int:
+        atomic_write(self.path, lambda f: df.to_csv(f, index=False))
+        # The rows may carry any serial numbers now; re-seed the sequence from them on next allocation
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(sequence_path_for(self.path))
+        return bump_version(self.path)
+
+    def allocate_serials(self, count: int, next_from_rows) -> int:
+        seq_path = sequence_path_for(self.path)
+        try:
+            with open(seq_path, "r", encoding="utf-8") as f:
+                next_serial = int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            next_serial = 1
+        # The CSV can be edited by hand, so the rows (already in memory for the duplicate check) have the last word
+        next_serial = max(next_serial, int(next_from_rows()))
+        atomic_write(seq_path, lambda f: f.write(str(next_serial + count)))
+        return next_serial
+
+    def read_summary(self):
+        # Stamped with change_token(), so hand edits to the CSV (new mtime/size) make it stale as well
+        try:
+            with open(summary_path_for(self.path), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return stored.get("summary") if stored.get("stamp") == self.change_token() else None
+
+    def write_summary(self, summary: dict):
+        stored = {"stamp": self.change_token(), "summary": summary}
+        atomic_write(summary_path_for(self.path), lambda f: json.dump(stored, f))
+
+
+class SqliteBackend(StorageBackend):
+    """SQLite store (stdlib sqlite3) with indexes for lookups, filters and recent additions."""
+    name = "sqlite"
+    supports_queries = True
+    BUSY_TIMEOUT_SECONDS = LOCK_TIMEOUT_SECONDS
+    # Columns compared case-insensitively (duplicate checks), so their indexes use NOCASE
+    NOCASE_COLUMNS = ("Name", "Link")
+    # Index name -> columns
+    INDEXES = {"serial_number": ("Serial_Number",), "name": ("Name",), "link": ("Link",), "date_time": ("Date_Time",)}
+    # Index name -> column that query() filters on. Filters compare stripped values (the keys utils/facets counts), so
+    # these index that expression; Date_Time rides along so filtered "newest first" lists need no sort step.
+    FILTER_INDEXES = {"category": "Category", "pricing_type": "Pricing_Type", "uploaded_by": "Uploaded_By"}
+
+    def __init__(self, path: str, columns, date_format: str, csv_read_options=None):
+        super().__init__(path, columns, date_format, csv_read_options)
+        self._local = threading.local() # sqlite3 connections must stay on the thread that opened them
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            db_dir = os.path.dirname(self.path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL") # Readers don't block the writer (and vice versa)
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def _quoted(self, column: str) -> str:
+        if column not in self.columns:
+            raise ValueError(f"Unknown column '{column}'")
+        return f'"{column}"'
+
+    def _trimmed(self, column: str) -> str:
+        """SQL for column without surrounding whitespace (spaces, tabs, line breaks), as str.strip() would leave it."""
+        return f"TRIM({self._quoted(column)}, char(32, 9, 10, 11, 12, 13))"
+
+    def initialize(self):
+        if self._initialized:
+            return
+        conn = self._connect()
+        column_defs = ", ".join(
+            f'"{col}" INTEGER' if col == "Serial_Number" else
+            f'"{col}" TEXT COLLATE NOCASE' if col in self.NOCASE_COLUMNS else f'"{col}" TEXT'
+            for col in self.columns
+        )
+        conn.execute(f"CREATE TABLE IF NOT EXISTS tools (row_id INTEGER PRIMARY KEY AUTOINCREMENT, {column_defs})")
+        for index_name, index_cols in self.INDEXES.items():
+            if all(col in self.columns for col in index_cols):
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_tools_{index_name}" ON tools ({", ".join(self._quoted(c) for c in index_cols)})')
+        for index_name, column in self.FILTER_INDEXES.items():
+            if column in self.columns and "Date_Time" in self.columns:
+                conn.execute(f'DROP INDEX IF EXISTS "idx_tools_{index_name}"') # Plain-column index of earlier versions
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_tools_{index_name}_trimmed" ON tools ({self._trimmed(column)}, "Date_Time")')
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+        conn.execute("CREATE TABLE IF NOT EXISTS summary (key TEXT PRIMARY KEY, version INTEGER NOT NULL, body TEXT NOT NULL)")
+        self._initialized = True
+
+    @contextlib.contextmanager
+    def lock(self):
+        """BEGIN IMMEDIATE takes SQLite's write lock; everything until exit commits as one transaction."""
+        conn = self._connect()
+        if conn.in_transaction: # Re-entrant use inside an outer lock()
+            yield 0.0
+            return
+        start = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            raise LockTimeoutError(f"Timed out waiting for the write lock on '{self.path}': {e}") from e
+        wait_seconds = time.perf_counter() - start
+        _record_lock_wait(self.path, wait_seconds)
+        try:
+            yield wait_seconds
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def version(self) -> int:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def change_token(self) -> str:
+        # Commits from other tools don't touch our counter, but they do grow the WAL / main file
+        parts = [str(self.version())]
+        for suffix in ("", "-wal"):
+            try:
+                st_result = os.stat(self.path + suffix)
+                parts.append(f"{st_result.st_mtime_ns}-{st_result.st_size}")
+            except FileNotFoundError:
+                parts.append("missing")
+        return "sqlite:" + ":".join(parts)
+
+    def _bump_version(self, conn) -> int:
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+        return int(conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()[0])
+
+    def _select(self, where: str = "", params=(), order_by: str = "row_id", limit=None, with_positions=False) -> pd.DataFrame:
+        """Rows as a frame. with_positions indexes them by their position in storage (what read_frame's index is),
+        which is row_id minus the first row_id: only replace_all deletes rows, and it deletes all of them."""
+        columns = ", ".join(self._quoted(c) for c in self.columns)
+        if with_positions:
+            columns = "row_id - (SELECT MIN(row_id) FROM tools) AS row_position, " + columns
+        sql = f"SELECT {columns} FROM tools"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        df = pd.read_sql_query(sql, self._connect(), params=params)
+        if with_positions:
+            df = df.set_index("row_position").rename_axis(None)
+        return df
+
+    def read_frame(self) -> pd.DataFrame:
+        return self._select()
+
+    def _row_values(self, record):
+        values = []
+        for col in self.columns:
+            value = format_value(record.get(col), self.date_format)
+            if col == "Serial_Number":
+                value = serial_value(value) if value else None
+            values.append(value if value != '' else None)
+        return values
+
+    def append_records(self, records) -> int:
+        conn = self._connect()
+        placeholders = ", ".join("?" for _ in self.columns)
+        with self.lock():
+            conn.executemany(
+                f"INSERT INTO tools ({', '.join(self._quoted(c) for c in self.columns)}) VALUES ({placeholders})",
+                [self._row_values(r) for r in records]
+            )
+            return self._bump_version(conn)
+
+    def replace_all(self, df: pd.DataFrame) -> int:
+        conn = self._connect()
+        with self.lock(): # Single transaction: readers see either all old rows or all new ones
+            conn.execute("DELETE FROM tools")
+            conn.execute("DELETE FROM meta WHERE key = 'next_serial'") # Re-seeded from the new rows on next allocation
+            conn.execute("DELETE FROM summary") # Rebuilt from the new rows on next read
+            placeholders = ", ".join("?" for _ in self.columns)
+            conn.executemany(
+                f"INSERT INTO tools ({', '.join(self._quoted(c) for c in self.columns)}) VALUES ({placeholders})",
+                [self._row_values(r) for r in df.to_dict(orient="records")]
+            )
+            return self._bump_version(conn)
+
+    def allocate_serials(self, count: int, next_from_rows) -> int:
+        conn = self._connect()
+        with self.lock():
+            row = conn.execute("SELECT value FROM meta WHERE key = 'next_serial'").fetchone()
+            # MAX() walks the Serial_Number index, so checking against rows written by other tools is cheap
+            max_row = conn.execute('SELECT MAX("Serial_Number") FROM tools').fetchone()
+            from_rows = int(max_row[0]) + 1 if max_row and max_row[0] is not None else int(next_from_rows())
+            next_serial = max(int(row[0]) if row else 1, from_rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('next_serial', ?)", (next_serial + count,))
+        return next_serial
+
+    def read_summary(self):
+        # Stamped with the write counter, which is bumped in the same transaction as the rows it describes
+        row = self._connect().execute("SELECT version, body FROM summary WHERE key = 'dashboard'").fetchone()
+        if not row or int(row[0]) != self.version():
+            return None
+        try:
+            return json.loads(row[1])
+        except ValueError:
+            return None
+
+    def write_summary(self, summary: dict):
+        conn = self._connect()
+        with self.lock():
+            conn.execute("INSERT OR REPLACE INTO summary (key, version, body) VALUES ('dashboard', ?, ?)",
+                         (self.version(), json.dumps(summary)))
+
+    def find_by_serial(self, serial: int):
+        """Returns the tool (dict) with this Serial_Number via the primary-key index, or None."""
+        row = self._connect().execute(
+            f"SELECT {', '.join(self._quoted(c) for c in self.columns)} FROM tools "
+            'WHERE "Serial_Number" = ? ORDER BY row_id LIMIT 1', (int(serial),)
+        ).fetchone()
+        return dict(zip(self.columns, row)) if row else None
+
+    def distinct_values(self, column: str):
+        col = self._quoted(column)
+        rows = self._connect().execute(
+            f"SELECT DISTINCT TRIM({col}) FROM tools WHERE {col} IS NOT NULL AND TRIM({col}) != ''"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def find_first(self, column: str, value: str):
+        cur = self._connect().execute(
+            f"SELECT {', '.join(self._quoted(c) for c in self.columns)} FROM tools "
+            f"WHERE {self._quoted(column)} = ? COLLATE NOCASE LIMIT 1", (value,)
+        )
+        row = cur.fetchone()
+        return dict(zip(self.columns, row)) if row else None
+
+    def query(self, filters=None, limit=None) -> pd.DataFrame:
+        clauses, params = [], []
+        for column, value in (filters or {}).items():
+            clauses.append(f"{self._trimmed(column)} = ?")
+            params.append(str(value).strip())
+        return self._select(" AND ".join(clauses), params, order_by='"Date_Time" DESC, row_id DESC', limit=limit,
+                            with_positions=True)
+
+
+BACKENDS = {"csv": CsvBackend, "sqlite": SqliteBackend}
+
+def create_backend(kind: str, path: str, columns, date_format: str, csv_read_options=None) -> StorageBackend:
+    try:
+        backend_cls = BACKENDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend '{kind}'. Choose one of: {', '.join(BACKENDS)}") from None
+    return backend_cls(path, columns, date_format, csv_read_options)
+
+def migrate_csv_to_sqlite(csv_path: str, sqlite_path: str, columns, date_format: str, overwrite: bool = False):
+    """One-shot copy of every row in csv_path into a (new) SQLite database.
+
+    Returns (rows copied, [(row number, value)] of Serial_Numbers that aren't whole numbers). Those rows are still
+    copied, with an empty Serial_Number. Row numbers are 1-based and don't count the header.
+    """
+    target = SqliteBackend(sqlite_path, columns, date_format)
+    target.initialize()
+    with target.lock():
+        existing = target._connect().execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+        if existing and not overwrite:
+            raise RuntimeError(f"'{sqlite_path}' already holds {existing} rows; pass overwrite=True to replace them.")
+        try:
+            df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            df = pd.DataFrame(columns=columns)
+        df = df.reindex(columns=columns, fill_value='')
+        invalid_serials = []
+        if "Serial_Number" in df.columns:
+            serials = df["Serial_Number"].str.strip()
+            numeric = pd.to_numeric(serials, errors="coerce")
+            invalid = (serials != "") & ~(numeric % 1 == 0)
+            invalid_serials = [(int(position) + 1, value) for position, value in zip(invalid.to_numpy().nonzero()[0], serials[invalid])]
+            df.loc[invalid, "Serial_Number"] = ""
+        target.replace_all(df)
+    return len(df), invalid_serials
@@ -1,7 +1,11 @@
 # utils/style_utils.py
 import streamlit as st
 import os
-from utils import helpers # For Lottie URLs
+import re
+import hashlib
+import logging
+import functools
+from utils import helpers, storage # helpers for Lottie URLs
 import html # <--- Standard HTML escaping
 
 # --- Configuration ---
@@ -16,6 +20,8 @@ import html
 # --- Configuration ---
 CSS_FILE_PATH = os.path.join("assets", "css", "style.css")
 
+logger = logging.getLogger(__name__)
+
 # --- Color Palette & Gradients (Define your app's theme here) ---
 COLOR_PRIMARY = "#667eea"
 COLOR_SECONDARY = "#764ba2"
@@ -35,13 +41,81 @@ GRADIENT_PRIMARY = f"linear-gradient(135deg, {COLOR_PRIMARY} 0%, {COLOR_SECONDAR
 # ... (rest of your gradient definitions)
 
 # --- Core Style Loading ---
+# style.css is read, minified and content-hashed once per process (again only if the file changes). With
+# server.enableStaticServing (see .streamlit/config.toml) it is written to static/css/style.<hash>.css and every
+# rerun just sends a <link> to it, which the browser caches; otherwise the minified CSS is inlined. The tag has to
+# be sent on every rerun (Streamlit drops elements a rerun doesn't emit), so keeping it small is what counts.
+STATIC_CSS_DIR = os.path.join("static", "css") # Served at app/static/css/ by Streamlit's static file serving
+STATIC_CSS_URL = "app/static/css"
+# Before 1.56 Streamlit served static .css files as text/plain with "X-Content-Type-Options: nosniff", which
+# browsers refuse to apply as a stylesheet; older versions always get the inline <style>
+STATIC_CSS_MIN_STREAMLIT = (1, 56)
+_STATIC_CSS_SUPPORTED = tuple(int(part) for part in re.findall(r"\d+", st.__version__)[:2]) >= STATIC_CSS_MIN_STREAMLIT
+
+_CSS_STRING_OR_COMMENT_RE = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')|/\*.*?\*/', re.S)
+_CSS_STRING_RE = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+
+def minify_css(css: str) -> str:
+    """Drops comments and redundant whitespace/semicolons; quoted strings are left alone."""
+    css = _CSS_STRING_OR_COMMENT_RE.sub(lambda m: m.group(1) or "", css)
+    parts = _CSS_STRING_RE.split(css) # Odd positions are string literals
+    for i in range(0, len(parts), 2):
+        text = re.sub(r"\s+", " ", parts[i])
+        text = re.sub(r" ?([{};,>]) ?", r"\1", text)
+        parts[i] = text.replace(": ", ":").replace(";}", "}")
+    return "".join(parts).strip()
+
+@functools.lru_cache(maxsize=2)
+def _app_stylesheet(css_path: str, mtime_ns: int):
+    """(minified CSS, file name with content hash, original size in bytes) for css_path as of mtime_ns."""
+    with open(css_path, encoding="utf-8") as f:
+        original = f.read()
+    minified = minify_css(original)
+    file_name = f"style.{hashlib.sha256(minified.encode('utf-8')).hexdigest()[:12]}.css"
+    return minified, file_name, len(original.encode("utf-8"))
+
+def _publish_stylesheet(minified: str, file_name: str) -> bool:
+    """Writes the hashed stylesheet into the static folder (once) and removes older versions. False on failure."""
+    target = os.path.join(STATIC_CSS_DIR, file_name)
+    if os.path.exists(target):
+        return True
+    try:
+        storage.atomic_write(target, lambda f: f.write(minified))
+        for old_name in os.listdir(STATIC_CSS_DIR):
+            if old_name.startswith("style.") and old_name.endswith(".css") and old_name != file_name:
+                os.remove(os.path.join(STATIC_CSS_DIR, old_name))
+    except OSError as e:
+        logger.warning("Could not publish '%s' (%s); inlining the CSS instead", target, e)
+        return False
+    return True
+
+_style_stats = {}
+
+def get_style_stats() -> dict:
+    """CSS payload per rerun: mode ('static' link or 'inline'), original/minified/sent bytes and bytes saved."""
+    return dict(_style_stats)
+
 def load_app_style():
     try:
-        with open(CSS_FILE_PATH) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        minified, file_name, original_bytes = _app_stylesheet(CSS_FILE_PATH, os.stat(CSS_FILE_PATH).st_mtime_ns)
     except FileNotFoundError:
         st.error(f"Critical Error: Main CSS file not found at '{CSS_FILE_PATH}'. UI might be affected.")
         st.info(f"Please ensure '{CSS_FILE_PATH}' exists in your project directory.")
+        return
+    if _STATIC_CSS_SUPPORTED and st.get_option("server.enableStaticServing") and _publish_stylesheet(minified, file_name):
+        mode, tag = "static", f'<link rel="stylesheet" href="{STATIC_CSS_URL}/{file_name}">'
+    else:
+        mode, tag = "inline", f"<style>{minified}</style>"
+    st.markdown(tag, unsafe_allow_html=True)
+
+    sent_bytes = len(tag.encode("utf-8"))
+    if _style_stats.get("file_name") != file_name or _style_stats.get("mode") != mode:
+        logger.info("App CSS (%s): %d bytes -> %d minified, %d sent per rerun", mode, original_bytes, len(minified.encode("utf-8")), sent_bytes)
+    _style_stats.update({
+        "mode": mode, "file_name": file_name, "original_bytes": original_bytes,
+        "minified_bytes": len(minified.encode("utf-8")), "sent_bytes_per_rerun": sent_bytes,
+        "saved_bytes_per_rerun": original_bytes + len("<style></style>") - sent_bytes,
+    })
 
 # --- Styled UI Component Generators ---
 
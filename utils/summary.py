@@ -0,0 +1,56 @@
+# utils/summary.py
+# Materialized dashboard summary: total tools, per-category counts and the most recent additions.
+#
+# Kept next to the data (a .summary.json sidecar for the CSV, a `summary` table in SQLite) and updated in the
+# write path: appends adjust it in O(new rows) under the write lock, so the dashboard overview reads a few hundred
+# bytes instead of the whole catalogue. A full rebuild (build()) only happens when it is missing or stale, e.g.
+# after save_data() or a hand edit of the CSV.
+RECENT_LIMIT = 10
+RECENT_COLUMNS = ["Serial_Number", "Name", "Category", "Uploaded_By", "Date_Time"]
+
+def _text(value):
+    """JSON-safe text for a cell ('' for missing)."""
+    if value is None:
+        return ""
+    try:
+        if value != value: # NaN / NaT
+            return ""
+    except (TypeError, ValueError): # pd.NA
+        return ""
+    return str(value).strip()
+
+def _recent_record(record, date_format):
+    date_time = record.get("Date_Time")
+    if hasattr(date_time, "strftime") and _text(date_time):
+        date_time = date_time.strftime(date_format)
+    out = {col: _text(record.get(col)) for col in RECENT_COLUMNS}
+    out["Date_Time"] = _text(date_time)
+    return out
+
+def empty():
+    return {"total": 0, "categories": {}, "recent": []}
+
+def build(df, date_format):
+    """Summary of a full tools frame sorted newest first (as returned by data_manager.load_data)."""
+    if df.empty:
+        return empty()
+    categories = df['Category'].astype("string").fillna("").str.strip()
+    counts = categories[categories != ""].value_counts()
+    return {
+        "total": len(df),
+        "categories": {str(cat): int(count) for cat, count in counts.items()},
+        "recent": [_recent_record(record, date_format) for record in df.head(RECENT_LIMIT).to_dict(orient="records")],
+    }
+
+def apply_appended(summary, records, date_format):
+    """The summary after appending records (dicts keyed by column, in insertion order). Doesn't modify summary."""
+    categories = dict(summary["categories"])
+    for record in records:
+        category = _text(record.get("Category"))
+        if category:
+            categories[category] = categories.get(category, 0) + 1
+    # Same order as the loaded frame: Date_Time descending, later-added first on ties, missing dates last.
+    # Stored dates use the sortable DATE_TIME_FORMAT, so comparing the text compares the times.
+    candidates = [_recent_record(record, date_format) for record in reversed(records)] + summary["recent"]
+    candidates.sort(key=lambda record: record["Date_Time"], reverse=True) # Stable: ties keep later-added first
+    return {"total": summary["total"] + len(records), "categories": categories, "recent": candidates[:RECENT_LIMIT]}
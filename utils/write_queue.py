@@ -0,0 +1,183 @@
+# utils/write_queue.py
+# Write-behind queue for Add Tool submissions. submit() hands the form a Ticket right away; a single writer thread
+# per process collects the submissions that arrive within BATCH_WINDOW_SECONDS of each other and commits them with
+# one data_manager.add_entries() call (one lock, one append, one version bump), so a burst of N submissions costs one
+# write instead of N. Queue depth and commit latency: get_queue_stats().
+#
+# A submission is durable once its ticket is done; the ones still queued when the process exits normally are
+# flushed at exit, but a crash loses them (at most one batch window's worth).
+import time
+import atexit
+import datetime
+import queue
+import logging
+import threading
+import itertools
+from collections import deque
+from utils import data_manager, storage
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW_SECONDS = 0.2 # How long the writer waits for more submissions after the first one of a batch
+MAX_BATCH_SIZE = 200
+LATENCY_SAMPLES = 200 # Recent submit -> commit latencies kept for get_queue_stats()
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_ticket_ids = itertools.count(1)
+_in_flight = 0 # Submissions taken off the queue whose batch isn't committed yet
+_stats = {"submitted": 0, "committed": 0, "rejected": 0, "failed": 0, "batches": 0, "largest_batch": 0,
+          "last_commit_seconds": 0.0}
+_latencies = deque(maxlen=LATENCY_SAMPLES)
+_stats_guard = threading.Lock()
+
+
+class Ticket:
+    """Acknowledgement for a queued submission. status is 'queued', then 'added' (serial_number set),
+    'duplicate' or 'failed' (message says why)."""
+
+    def __init__(self, entry):
+        self.id = next(_ticket_ids)
+        self.entry = entry
+        self.submitted_at = time.monotonic()
+        self.status = "queued"
+        self.serial_number = None
+        self.message = ""
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Blocks until the submission is committed or rejected (or timeout seconds pass). Returns done."""
+        return self._done.wait(timeout)
+
+    def _finish(self, status, serial_number=None, message=""):
+        self.status, self.serial_number, self.message = status, serial_number, message
+        self._done.set()
+
+
+def _ensure_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="tool-write-queue", daemon=True)
+            _writer.start()
+
+def submit(name, link, category, pricing_type, subscription_cost, uploaded_by, purpose):
+    """Queues a tool submission (same arguments as data_manager.add_entry) and returns its Ticket immediately."""
+    ticket = Ticket(dict(name=name, link=link, category=category, pricing_type=pricing_type,
+                         subscription_cost=subscription_cost, uploaded_by=uploaded_by, purpose=purpose,
+                         date_time=datetime.datetime.now())) # Submission time, not commit time
+    with _stats_guard:
+        _stats["submitted"] += 1
+    _ensure_writer()
+    _queue.put(ticket)
+    return ticket
+
+def _next_batch():
+    """Blocks for the first submission, then collects whatever else arrives within the batch window."""
+    global _in_flight
+    batch = [_queue.get()]
+    deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+    while len(batch) < MAX_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    with _stats_guard:
+        _in_flight = len(batch)
+    return batch
+
+def _commit(batch):
+    global _in_flight
+    started = time.monotonic()
+    try:
+        results = data_manager.add_entries([ticket.entry for ticket in batch])
+    except Exception as e: # Nothing of this batch was written
+        logger.error("Could not commit %d queued submission(s): %s", len(batch), e)
+        results = None
+        busy = isinstance(e, storage.LockTimeoutError)
+        message = "The database is busy right now, please try again in a moment." if busy else f"Could not save the tool: {e}"
+    finished = time.monotonic()
+    try:
+        with _stats_guard:
+            _in_flight = 0
+            _stats["batches"] += 1
+            _stats["largest_batch"] = max(_stats["largest_batch"], len(batch))
+            _stats["last_commit_seconds"] = finished - started
+            for position, ticket in enumerate(batch):
+                if results is None:
+                    _stats["failed"] += 1
+                elif results[position][0] is None:
+                    _stats["rejected"] += 1
+                else:
+                    _stats["committed"] += 1
+                    _latencies.append(finished - ticket.submitted_at)
+    except Exception: # The stats are best effort; the outcomes below must still reach the sessions
+        logger.exception("Could not update the write queue stats")
+    # Wake the waiting sessions only after the stats are consistent
+    for position, ticket in enumerate(batch):
+        if results is None:
+            ticket._finish("failed", message=message)
+        elif results[position][0] is None:
+            ticket._finish("duplicate", message=results[position][1])
+        else:
+            ticket._finish("added", serial_number=results[position][0])
+    logger.info("Committed a batch of %d submission(s) in %.1f ms", len(batch), (finished - started) * 1000)
+
+def _fail_unfinished(batch, message):
+    """Fails the tickets of batch that _commit() didn't get to, so no session waits on them forever."""
+    global _in_flight
+    unfinished = [ticket for ticket in batch if not ticket.done]
+    with _stats_guard:
+        _in_flight = 0
+        _stats["failed"] += len(unfinished)
+    for ticket in unfinished:
+        ticket._finish("failed", message=message)
+
+def _writer_loop():
+    # Outcomes (including errors) are only reported through the tickets: this thread has no script run context,
+    # so the submitting session shows them (see pages/add_tool_page.py)
+    while True:
+        batch = _next_batch()
+        try:
+            _commit(batch)
+        except Exception as e: # The writer must survive anything, or every later ticket stays "queued"
+            logger.exception("Write queue batch of %d submission(s) failed", len(batch))
+            _fail_unfinished(batch, f"Could not save the tool: {e}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+def flush(timeout=None):
+    """Waits until every submission queued so far is committed or rejected. Returns False on timeout."""
+    if _writer is None:
+        return True
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        with _queue.all_tasks_done:
+            if not _queue.unfinished_tasks:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            _queue.all_tasks_done.wait(remaining)
+
+atexit.register(flush, 10)
+
+def get_queue_stats():
+    """Queue depth (waiting + being committed), outcome counts, batches and submit -> commit latency."""
+    with _stats_guard:
+        stats = dict(_stats)
+        latencies = sorted(_latencies)
+        stats["depth"] = _queue.qsize() + _in_flight
+    stats["avg_batch_size"] = (stats["committed"] + stats["rejected"] + stats["failed"]) / stats["batches"] if stats["batches"] else 0.0
+    stats["latency_p50_seconds"] = latencies[len(latencies) // 2] if latencies else 0.0
+    stats["latency_p95_seconds"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+    return stats